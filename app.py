@@ -1,20 +1,28 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext, filedialog, simpledialog
+import queue
 import threading
 import webbrowser
-from urllib.parse import urlparse
 import json
 import time
 from datetime import datetime
-import ftplib
 import os
 
+# Scraper, Real-Debrid and FTP modules are imported on first use so the window
+# can paint before cloudscraper/bs4/requests are loaded.
 from src.database import GameCache
-from src.scraper import PSScraper
 from src.config import cfg
-from src.apis import RealDebridAPI
+from src.links import display_rows, host_name, hosters_in
+from src.metrics import metrics, profile
+from src.scheduler import BACKGROUND, INTERACTIVE, NORMAL, JobScheduler
+from src.widgets import VirtualListbox, run_in_batches
 import ttkthemes
 
+ALL_HOSTERS = "All hosters"
+# Link liveness: alive first, unchecked/unknown next, dead last
+LINK_STATE_ORDER = {"alive": 0, "dead": 2}
+LINK_STATE_MARKS = {"alive": "[ok] ", "dead": "[dead] ", "unknown": "[?] "}
+
 class SettingsWindow(tk.Toplevel):
     def __init__(self, parent):
         super().__init__(parent)
@@ -74,15 +82,14 @@ class SettingsWindow(tk.Toplevel):
 
     def save_settings(self):
         settings = cfg.settings
-        settings["apis"] = {
-            "real_debrid_api_key": self.rd_key.get()
-        }
-        settings["ftp"] = {
+        # Keep the tuning keys (rate limit, workers, retries) that have no field here
+        settings.setdefault("apis", {})["real_debrid_api_key"] = self.rd_key.get()
+        settings.setdefault("ftp", {}).update({
             "host": self.ftp_host.get(),
             "port": int(self.ftp_port.get()) if self.ftp_port.get().isdigit() else 21,
             "username": self.ftp_user.get(),
             "password": self.ftp_pass.get()
-        }
+        })
         try:
             with open("settings.json", "w") as f:
                 import json
@@ -119,22 +126,90 @@ class PKGScraperGUI:
         self.style.configure('TFrame', borderwidth=1, relief='solid')
 
         self.db = GameCache()
-        self.scraper = PSScraper()
-        self.db.load()
+        self._scraper = None
+        self._scraper_lock = threading.Lock()
+        self._refresher = None
+        self._ftp_uploader = None
+        self._ftp_key = None
+        self._rd = None
+        self._downloads = None
+        # Every worker task goes through here; callbacks land on the Tk loop
+        self.jobs = JobScheduler(dispatch=lambda func: self.root.after(0, func))
+        self._profile_next = False
 
         self.games = []
+        self._search_queue = queue.Queue()
+        self._search_id = 0
+        self._search_job = None
+        self._search_query = None
+        self._search_after_id = None
         self.selected_game = None
         self.links = []
+        self.link_groups = []
+        self.link_rows = []
+        self.link_status = {}
+        self._checker = None
         self.selected_link = None
         self.history = self.load_history()
 
         # Status bar
         self.status_var = tk.StringVar()
-        self.status_var.set("Ready")
+        self.status_var.set("Loading cache...")
         status_bar = ttk.Label(self.root, textvariable=self.status_var, relief=tk.SUNKEN, anchor=tk.W)
         status_bar.pack(fill=tk.X, side=tk.BOTTOM)
 
         self.create_widgets()
+        self.root.after_idle(self._start_background_init)
+
+    @property
+    def scraper(self):
+        if self._scraper is None:
+            with self._scraper_lock:
+                if self._scraper is None:
+                    from src.scraper import PSScraper
+                    self._scraper = PSScraper()
+        return self._scraper
+
+    @property
+    def refresher(self):
+        if self._refresher is None:
+            from src.refresher import CacheRefresher
+            self._refresher = CacheRefresher(self.db, self.scraper).start()
+        return self._refresher
+
+    @property
+    def downloads(self):
+        if self._downloads is None:
+            from src.downloader import DownloadManager
+            self._downloads = DownloadManager(on_update=lambda job: self.root.after(0, lambda: self._on_download_update(job)))
+        return self._downloads
+
+    def _start_background_init(self):
+        self.jobs.submit(self._background_init, name="startup", lane=BACKGROUND)
+
+    def _background_init(self):
+        try:
+            self.db.load()
+            self.history.load()
+            self.root.after(0, lambda: self.status_var.set("Ready"))
+            if cfg.database.get("background_refresh", True):
+                self.refresher
+        except Exception as e:
+            self.root.after(0, lambda: self.status_var.set(f"Error loading cache: {e}"))
+            print(f"Error in _background_init: {e}")
+        # Download history doubles as a source of still-valid unrestricted links
+        if cfg.apis.get("unrestrict_cache", True):
+            try:
+                from src.apis import shared_cache
+                cache = shared_cache()
+                cache.seed(self.history.since(time.time() - cache.ttl))
+            except Exception as e:
+                print(f"Error seeding unrestrict cache: {e}")
+        # Warm the scraper imports off the Tk thread so the first search does not pay for them
+        try:
+            self.scraper
+        except Exception:
+            pass
 
     def create_widgets(self):
         # Title
@@ -149,15 +224,33 @@ class PKGScraperGUI:
         self.search_entry = ttk.Entry(search_frame, width=50)
         self.search_entry.grid(row=0, column=1, sticky=tk.EW, padx=5)
         self.search_entry.bind('<Return>', lambda e: self.search_games())
+        self.search_entry.bind('<KeyRelease>', self.on_search_key)
+        self._instant_after_id = None
 
         self.search_button = ttk.Button(search_frame, text="Search", command=self.search_games)
         self.search_button.grid(row=0, column=2, padx=5)
 
+        self.instant_var = tk.BooleanVar(value=cfg.database.get("instant_search", False))
+        self.instant_check = ttk.Checkbutton(search_frame, text="Instant (cached)", variable=self.instant_var)
+        self.instant_check.grid(row=0, column=3, padx=5)
+
+        self.prefetch_button = ttk.Button(search_frame, text="Prefetch All", command=self.prefetch_results)
+        self.prefetch_button.grid(row=0, column=4, padx=5)
+
         self.history_button = ttk.Button(search_frame, text="Download History", command=self.show_history)
-        self.history_button.grid(row=0, column=3, padx=5)
+        self.history_button.grid(row=0, column=5, padx=5)
+
+        self.downloads_button = ttk.Button(search_frame, text="Downloads", command=self.show_downloads)
+        self.downloads_button.grid(row=0, column=6, padx=5)
+
+        self.jobs_button = ttk.Button(search_frame, text="Jobs", command=self.show_jobs)
+        self.jobs_button.grid(row=0, column=7, padx=5)
+
+        self.diagnostics_button = ttk.Button(search_frame, text="Diagnostics", command=self.show_diagnostics)
+        self.diagnostics_button.grid(row=0, column=8, padx=5)
 
         self.settings_button = ttk.Button(search_frame, text="Settings", command=self.open_settings)
-        self.settings_button.grid(row=0, column=4, padx=5)
+        self.settings_button.grid(row=0, column=9, padx=5)
 
         search_frame.columnconfigure(1, weight=1)
 
@@ -181,11 +274,9 @@ class PKGScraperGUI:
         results_frame = ttk.Frame(left_frame)
         results_frame.pack(fill=tk.BOTH, expand=True)
 
-        self.results_listbox = tk.Listbox(results_frame, bg='#2b2b2b', fg='white', selectbackground='#4a4a4a', font=self.font, height=20, selectmode=tk.SINGLE)
-        scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.results_listbox.yview)
-        self.results_listbox.configure(yscrollcommand=scrollbar.set)
-        self.results_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Virtualized: only the rows in view exist as Listbox items, so crawled catalogues stay responsive
+        self.results_listbox = VirtualListbox(results_frame, formatter=lambda i, game: f"{i+1}. {game['title']}", bg='#2b2b2b', fg='white', selectbackground='#4a4a4a', font=self.font, height=20)
+        self.results_listbox.pack(fill=tk.BOTH, expand=True)
         self.results_listbox.bind('<<ListboxSelect>>', self.on_game_select)
 
         # Right frame: details
@@ -199,15 +290,24 @@ class PKGScraperGUI:
         self.details_text.pack(fill=tk.X, pady=5)
 
         # Links
-        ttk.Label(right_frame, text="Download Links:").pack(anchor=tk.W)
+        links_header = ttk.Frame(right_frame)
+        links_header.pack(fill=tk.X)
+        ttk.Label(links_header, text="Download Links:").pack(side=tk.LEFT)
+        self.hoster_var = tk.StringVar(value=ALL_HOSTERS)
+        self.hoster_combo = ttk.Combobox(links_header, textvariable=self.hoster_var, values=[ALL_HOSTERS], state="readonly", width=18)
+        self.hoster_combo.pack(side=tk.RIGHT)
+        self.hoster_combo.bind('<<ComboboxSelected>>', lambda e: self.apply_link_filter())
+        ttk.Label(links_header, text="Hoster:").pack(side=tk.RIGHT, padx=5)
+        self.hide_dead_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(links_header, text="Hide dead", variable=self.hide_dead_var, command=self.apply_link_filter).pack(side=tk.RIGHT, padx=5)
+        self.check_links_btn = ttk.Button(links_header, text="Check Links", command=self.check_links, state=tk.DISABLED)
+        self.check_links_btn.pack(side=tk.RIGHT, padx=5)
         links_frame = ttk.Frame(right_frame)
         links_frame.pack(fill=tk.BOTH, expand=True)
 
-        self.links_listbox = tk.Listbox(links_frame, bg='#2b2b2b', fg='white', selectbackground='#4a4a4a', font=self.font, selectmode=tk.SINGLE)
-        links_scrollbar = ttk.Scrollbar(links_frame, orient=tk.VERTICAL, command=self.links_listbox.yview)
-        self.links_listbox.configure(yscrollcommand=links_scrollbar.set)
-        self.links_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        links_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Items are [display, url, group, hoster, part] rows from src.links.display_rows
+        self.links_listbox = VirtualListbox(links_frame, formatter=self._link_row_text, bg='#2b2b2b', fg='white', selectbackground='#4a4a4a', font=self.font)
+        self.links_listbox.pack(fill=tk.BOTH, expand=True)
         self.links_listbox.bind('<<ListboxSelect>>', self.on_link_select)
 
         # Buttons
@@ -220,34 +320,136 @@ class PKGScraperGUI:
         self.rd_btn = tk.Button(button_frame, text="Download with Real-Debrid", command=self.send_to_rd, state=tk.DISABLED, bg='#ff6b6b', fg='white', font=self.font, relief=tk.RAISED, bd=2)
         self.rd_btn.pack(side=tk.LEFT, padx=5)
 
+        self.rd_group_btn = tk.Button(button_frame, text="Unrestrict Group", command=self.send_group_to_rd, state=tk.DISABLED, bg='#ff6b6b', fg='white', font=self.font, relief=tk.RAISED, bd=2)
+        self.rd_group_btn.pack(side=tk.LEFT, padx=5)
+
         self.ftp_btn = tk.Button(button_frame, text="FTP Transfer", command=self.ftp_transfer, state=tk.DISABLED, bg='#6b6bff', fg='white', font=self.font, relief=tk.RAISED, bd=2)
         self.ftp_btn.pack(side=tk.LEFT, padx=5)
 
+        self.console_btn = tk.Button(button_frame, text="Send to Console", command=self.send_to_console, state=tk.DISABLED, bg='#6b6bff', fg='white', font=self.font, relief=tk.RAISED, bd=2)
+        self.console_btn.pack(side=tk.LEFT, padx=5)
+
         self.paned.sashpos(0, 400)  # Set initial sash position
 
     def open_settings(self):
         SettingsWindow(self.root)
 
+    def on_search_key(self, event):
+        if self._search_query is not None and self.search_entry.get().strip() != self._search_query:
+            self.cancel_search()
+        if not self.instant_var.get() or event.keysym == "Return":
+            return
+        if self._instant_after_id:
+            self.root.after_cancel(self._instant_after_id)
+        self._instant_after_id = self.root.after(150, self.instant_search)
+
+    def instant_search(self):
+        self._instant_after_id = None
+        query = self.search_entry.get().strip()
+        if not query:
+            return
+        self.show_local_results(query, self.db.search(query))
+
+    def show_local_results(self, query, results):
+        self.games = results
+        self.results_listbox.set_items(self.games)
+        if results:
+            self.status_var.set(f"{len(results)} cached matches for '{query}' (untick Instant to search online)")
+        else:
+            self.status_var.set(f"No cached matches for '{query}', press Enter to search online")
+
     def search_games(self):
         query = self.search_entry.get().strip()
         if not query:
             self.status_var.set("Please enter a search query")
             return
-        self.results_listbox.delete(0, tk.END)
+        if self.instant_var.get():
+            local = self.db.search(query)
+            if local:
+                self.show_local_results(query, local)
+                return
+        self.cancel_search()
+        self.games = []
+        self.results_listbox.clear()
         self.details_text.delete(1.0, tk.END)
-        self.links_listbox.delete(0, tk.END)
+        self.links_listbox.clear()
         self.status_var.set("Searching...")
-        threading.Thread(target=self._search_games, args=(query,)).start()
-
-    def _search_games(self, query):
-        games = self.scraper.search_games(query)
-        self.games = games
-        self.root.after(0, self.update_results_list)
+        self._search_id += 1
+        self._search_query = query
+        self._search_job = self.jobs.submit(self._search_games, query, self._search_id, name=f"search {query!r}",
+                                            lane=INTERACTIVE, cancellable=True)
+        if self._search_after_id is None:
+            self._search_after_id = self.root.after(50, self._drain_search_queue)
+
+    def cancel_search(self):
+        """Stop the in-flight online search; results it still produces are dropped."""
+        if self._search_job is not None:
+            self.jobs.cancel(self._search_job)
+            self._search_job = None
+            self._search_query = None
+            self.status_var.set(f"Search stopped ({len(self.games)} games)")
+
+    def _search_games(self, query, search_id, cancel):
+        try:
+            for games in self.scraper.iter_search_games(query, cancel=cancel):
+                self._search_queue.put((search_id, "page", games))
+            self._search_queue.put((search_id, "done", None))
+        except Exception as e:
+            self._search_queue.put((search_id, "error", e))
+            print(f"Error in _search_games: {e}")
+
+    def _drain_search_queue(self):
+        # Runs on the Tk loop; pages from a superseded search are discarded
+        self._search_after_id = None
+        while True:
+            try:
+                search_id, kind, payload = self._search_queue.get_nowait()
+            except queue.Empty:
+                break
+            if search_id != self._search_id or self._search_job is None:
+                continue
+            if kind == "page":
+                self.games.extend(payload)
+                self.results_listbox.append_items(payload)
+                self.status_var.set(f"Found {len(self.games)} games, searching more pages...")
+            elif kind == "error":
+                self._search_job = None
+                self._search_query = None
+                self.status_var.set(f"Error searching: {payload}")
+            else:
+                self._search_job = None
+                self._search_query = None
+                self.update_results_list()
+        if self._search_job is not None:
+            self._search_after_id = self.root.after(50, self._drain_search_queue)
 
     def update_results_list(self):
-        for i, game in enumerate(self.games):
-            self.results_listbox.insert(tk.END, f"{i+1}. {game['title']}")
         self.status_var.set(f"Found {len(self.games)} games")
+        if self.games and cfg.scraper.get("prefetch_results", False):
+            self.prefetch_results()
+
+    def prefetch_results(self):
+        if not self.db.loaded.is_set():
+            self.status_var.set("Loading cache...")
+            return
+        pending = [game for game in self.games if not self.db.get(game["url"])]
+        if not pending:
+            self.status_var.set("All results already cached")
+            return
+        self.status_var.set(f"Prefetching {len(pending)} games...")
+        done = [0]
+
+        def on_result(_):
+            done[0] += 1
+            if done[0] < len(pending):
+                self.status_var.set(f"Prefetched {done[0]}/{len(pending)} games")
+            else:
+                self.status_var.set(f"Prefetch complete ({done[0]}/{len(pending)})")
+
+        # Same key as an interactive detail fetch, so selecting a queued row promotes it instead of scraping twice
+        for game in pending:
+            self.jobs.submit(self._fetch_details, game, name=f"prefetch {game['title']}", lane=BACKGROUND,
+                             key=("details", game["url"]), on_done=on_result, on_error=on_result)
 
     def on_game_select(self, event):
         selection = self.results_listbox.curselection()
@@ -268,35 +470,78 @@ class PKGScraperGUI:
             self.details_text.delete(1.0, tk.END)
             self.details_text.insert(tk.END, f"Title: {game['title']}\n\n")
 
-            cached_data = self.db.get(game["url"])
+            if not self.db.loaded.is_set():
+                self.status_var.set("Loading cache...")
+                self.root.after(100, self.display_game_details)
+                return
+
+            cached_data = self.db.get(game["url"], allow_stale=True)
             if cached_data:
                 self.details_text.insert(tk.END, "Loaded from cache\n")
                 links = cached_data["links"]
                 metadata = cached_data.get("metadata", {"size": cached_data.get("size", "N/A")})
-                self.show_metadata_and_links(metadata, links)
+                self.show_metadata_and_links(metadata, links, cached_data.get("display_rows"))
+                if cached_data.get("stale"):
+                    self.refresh_in_background(game)
             else:
                 self.details_text.insert(tk.END, "Scraping live data...\n")
-                self.links_listbox.delete(0, tk.END)
+                self.links_listbox.clear()
                 self.links = []
+                self.link_rows = []
+                self.check_links_btn.config(state=tk.DISABLED)
                 self.status_var.set("Scraping game details...")
-                threading.Thread(target=self._scrape_details, args=(game,), daemon=True).start()
+                self.jobs.submit(self._fetch_details, game, name=f"details {game['title']}", lane=INTERACTIVE,
+                                 key=("details", game["url"]),
+                                 on_done=lambda result: self._on_details(game, *result),
+                                 on_error=lambda e: self._on_details_error(game, e))
         except Exception as e:
             self.status_var.set(f"Error displaying game details: {e}")
             print(f"Error in display_game_details: {e}")
 
-    def _scrape_details(self, game):
-        try:
-            links, metadata = self.scraper.get_game_links(game["url"], game["size"])
-            if links:
-                game["size"] = metadata.get("size", "N/A")
-                self.db.save(game, links, metadata)
-            self.root.after(0, lambda: self.show_metadata_and_links(metadata, links))
-            self.root.after(0, lambda: self.status_var.set("Details loaded"))
-        except Exception as e:
-            self.root.after(0, lambda: self.status_var.set(f"Error scraping details: {e}"))
-            print(f"Error in _scrape_details: {e}")
+    def refresh_in_background(self, game):
+        def on_refreshed(links, metadata):
+            rows = display_rows(links, self.scraper.classifier)
+            self.root.after(0, lambda: self._on_refreshed(game, links, metadata, rows))
+
+        self.refresher.refresh_now(game, on_refreshed)
+        self.status_var.set("Showing cached details, refreshing in background...")
 
-    def show_metadata_and_links(self, metadata, links):
+    def _on_refreshed(self, game, links, metadata, rows=None):
+        if not self.selected_game or self.selected_game["url"] != game["url"]:
+            return
+        if links:
+            self.show_metadata_and_links(metadata, links, rows)
+            self.status_var.set("Details refreshed")
+        else:
+            self.status_var.set("Refresh failed, showing cached details")
+
+    def _fetch_details(self, game):
+        if self._profile_next:
+            # Diagnostics asked for a cProfile capture of the next detail scrape
+            self._profile_next = False
+            (links, metadata), stats = profile(self.scraper.get_game_links, game["url"], game.get("size", "N/A"))
+            self.root.after(0, lambda: self._show_profile(f"Profile - {game['title']}", stats))
+        else:
+            links, metadata = self.scraper.get_game_links(game["url"], game.get("size", "N/A"))
+        rows = display_rows(links, self.scraper.classifier)
+        if links:
+            game["size"] = metadata.get("size", "N/A")
+            self.db.save(game, links, metadata, rows)
+        return links, metadata, rows
+
+    def _on_details(self, game, links, metadata, rows):
+        # The user may have moved on while this was scraping
+        if not self.selected_game or self.selected_game["url"] != game["url"]:
+            return
+        self.show_metadata_and_links(metadata, links, rows)
+        self.status_var.set("Details loaded")
+
+    def _on_details_error(self, game, e):
+        print(f"Error scraping details for {game['url']}: {e}")
+        if self.selected_game and self.selected_game["url"] == game["url"]:
+            self.status_var.set(f"Error scraping details: {e}")
+
+    def show_metadata_and_links(self, metadata, links, rows=None):
         try:
             self.details_text.delete(1.0, tk.END)
             self.details_text.insert(tk.END, f"Size: {metadata.get('size', 'N/A')}\n")
@@ -310,34 +555,86 @@ class PKGScraperGUI:
             if pwd and pwd.lower() != "n/a":
                 self.details_text.insert(tk.END, f"Password: {pwd}\n")
 
-            self.links_listbox.delete(0, tk.END)
-            self.links = []
-            if links:
-                if isinstance(links[0], dict):
-                    from itertools import groupby
-                    links.sort(key=lambda x: x.get("group", "Misc"))
-                    for group_name, group_items in groupby(links, key=lambda x: x.get("group", "Misc")):
-                        for item in group_items:
-                            url = item.get("url", "")
-                            label = item.get("label", "Link")
-                            host = self.get_host_name(url)
-                            display = f"{group_name} - {label} ({host})"
-                            self.links_listbox.insert(tk.END, display)
-                            self.links.append(url)
-                else:
-                    for link in links:
-                        host = self.get_host_name(link)
-                        display = f"{host}: {link}"
-                        self.links_listbox.insert(tk.END, display)
-                        self.links.append(link)
-                self.status_var.set(f"Loaded {len(links)} download links")
+            if rows is None or (rows and len(rows[0]) < 5):
+                # Entries cached before display rows (or their hoster column) were stored
+                rows = display_rows(links, self.scraper.classifier)
+            self.link_rows = rows
+            self.link_status = {}
+            if rows and self.db.loaded.is_set():
+                # Results of earlier checks, possibly made for another game sharing a mirror
+                self.link_status = self.db.link_status([row[1] for row in rows], cfg.liveness.get("ttl", 21600))
+            self.check_links_btn.config(state=tk.NORMAL if rows else tk.DISABLED)
+            hosters = hosters_in(rows)
+            self.hoster_combo.config(values=[ALL_HOSTERS] + hosters)
+            if self.hoster_var.get() not in hosters:
+                self.hoster_var.set(ALL_HOSTERS)
+            self.apply_link_filter()
+            if rows:
+                self.status_var.set(f"Loaded {len(links)} download links from {len(hosters)} hosters")
+                if cfg.liveness.get("auto_check", False):
+                    self.check_links(lane=BACKGROUND)
             else:
-                self.links_listbox.insert(tk.END, "No download links found.")
                 self.status_var.set("No download links found")
         except Exception as e:
             self.status_var.set(f"Error showing metadata: {e}")
             print(f"Error in show_metadata_and_links: {e}")
 
+    def apply_link_filter(self):
+        """Show only the current hoster's rows; self.links/link_groups follow the listbox indices."""
+        hoster = self.hoster_var.get()
+        rows = self.link_rows if hoster == ALL_HOSTERS else [row for row in self.link_rows if row[3] == hoster]
+        if self.link_status:
+            if self.hide_dead_var.get():
+                rows = [row for row in rows if self._link_state(row[1]) != "dead"]
+            # Stable, so group and part order hold within each state
+            rows = sorted(rows, key=lambda row: LINK_STATE_ORDER.get(self._link_state(row[1]), 1))
+        self.links = [row[1] for row in rows]
+        self.link_groups = [row[2] for row in rows]
+        self.selected_link = None
+        if rows:
+            self.links_listbox.set_items(rows)
+        else:
+            self.links_listbox.set_items([["No download links found.", None, None, None, None]])
+        self.on_link_select(None)
+
+    def _link_state(self, url):
+        status = self.link_status.get(url)
+        return status["state"] if status else None
+
+    def _link_row_text(self, i, row):
+        return LINK_STATE_MARKS.get(self._link_state(row[1]), "") + row[0]
+
+    @property
+    def checker(self):
+        if self._checker is None:
+            from src.liveness import LinkChecker
+            rd = None
+            api_key = cfg.apis.get("real_debrid_api_key", "")
+            if api_key and cfg.liveness.get("use_real_debrid", False):
+                rd = self.rd_client(api_key)
+            self._checker = LinkChecker(self.db, rd=rd)
+        return self._checker
+
+    def check_links(self, lane=NORMAL):
+        if not self.link_rows or not self.selected_game:
+            return
+        game = self.selected_game
+        urls = [row[1] for row in self.link_rows if row[1]]
+        self.status_var.set(f"Checking {len(urls)} links...")
+        self.jobs.submit(self.checker.check, urls, name=f"check links {game['title']}", lane=lane,
+                         key=("liveness", game["url"]),
+                         on_done=lambda statuses: self._on_links_checked(game, statuses),
+                         on_error=lambda e: self.status_var.set(f"Link check failed: {e}"))
+
+    def _on_links_checked(self, game, statuses):
+        if not self.selected_game or self.selected_game["url"] != game["url"]:
+            return
+        self.link_status.update(statuses)
+        self.apply_link_filter()
+        states = [status["state"] for status in statuses.values()]
+        self.status_var.set(f"{states.count('alive')} alive, {states.count('dead')} dead, "
+                            f"{states.count('unknown')} unknown of {len(states)} links")
+
     def on_link_select(self, event):
         selection = self.links_listbox.curselection()
         if selection and self.links:
@@ -346,41 +643,297 @@ class PKGScraperGUI:
                 self.selected_link = self.links[idx]
                 self.open_link_btn.config(state=tk.NORMAL)
                 self.rd_btn.config(state=tk.NORMAL)
+                self.rd_group_btn.config(state=tk.NORMAL)
                 self.ftp_btn.config(state=tk.NORMAL)
+                self.console_btn.config(state=tk.NORMAL)
             else:
                 self.selected_link = None
                 self.open_link_btn.config(state=tk.DISABLED)
                 self.rd_btn.config(state=tk.DISABLED)
+                self.rd_group_btn.config(state=tk.DISABLED)
                 self.ftp_btn.config(state=tk.DISABLED)
+                self.console_btn.config(state=tk.DISABLED)
         else:
             self.selected_link = None
             self.open_link_btn.config(state=tk.DISABLED)
             self.rd_btn.config(state=tk.DISABLED)
+            self.rd_group_btn.config(state=tk.DISABLED)
             self.ftp_btn.config(state=tk.DISABLED)
+            self.console_btn.config(state=tk.DISABLED)
 
     def open_selected_link(self):
         if self.selected_link:
             webbrowser.open(self.selected_link)
 
+    def _rd_api(self):
+        api_key = cfg.apis.get("real_debrid_api_key", "")
+        if not api_key:
+            messagebox.showerror("Error", "Real Debrid API key not set. Please configure in settings.")
+            return None
+        return self.rd_client(api_key)
+
+    def rd_client(self, api_key):
+        # One client (and its pooled session) per API key, like ftp_uploader()
+        if self._rd is None or self._rd.api_key != api_key:
+            from src.apis import RealDebridAPI
+            self._rd = RealDebridAPI(api_key)
+        return self._rd
+
     def send_to_rd(self):
         if not self.selected_link:
             return
-        apis = cfg.apis
-        api_key = apis.get("real_debrid_api_key", "")
-        if not api_key:
-            messagebox.showerror("Error", "Real Debrid API key not set. Please configure in settings.")
+        rd = self._rd_api()
+        if rd is None:
             return
-        rd = RealDebridAPI(api_key)
-        try:
-            result = rd.unrestrict_link(self.selected_link)
-            if "download" in result:
-                webbrowser.open(result["download"])
-                # Add to history
-                self.add_to_history(self.selected_game['title'], self.selected_link, result["download"])
+        link, title = self.selected_link, self.selected_game['title']
+        self.status_var.set("Unrestricting link...")
+        self.jobs.submit(rd.unrestrict_link, link, name=f"unrestrict {link}", key=("unrestrict", link),
+                         on_done=lambda result: self._on_unrestricted(link, title, result),
+                         on_error=self._on_unrestrict_error)
+
+    def _on_unrestricted(self, link, title, result):
+        if "download" in result:
+            self.add_to_history(title, link, result["download"])
+            self.start_download(result["download"], title)
+        else:
+            messagebox.showerror("Error", f"Failed to unrestrict link: {result}")
+            self.status_var.set("Unrestrict failed")
+
+    def _on_unrestrict_error(self, e):
+        self.rd_group_btn.config(state=tk.NORMAL if self.selected_link else tk.DISABLED)
+        messagebox.showerror("Error", f"Exception: {e}")
+        self.status_var.set("Unrestrict failed")
+
+    def send_group_to_rd(self):
+        if not self.selected_link or self.selected_link not in self.links:
+            return
+        rd = self._rd_api()
+        if rd is None:
+            return
+        group = self.link_groups[self.links.index(self.selected_link)]
+        if group is None:
+            # Ungrouped (legacy) link lists are treated as one group
+            links = list(self.links)
+        else:
+            links = [url for url, g in zip(self.links, self.link_groups) if g == group]
+        title = self.selected_game['title']
+        self.rd_group_btn.config(state=tk.DISABLED)
+        self.status_var.set(f"Unrestricting {len(links)} links...")
+        self.jobs.submit(self._send_group_to_rd, rd, links, name=f"unrestrict group {group or title}",
+                         key=("unrestrict-group", tuple(links)),
+                         on_done=lambda results: self._show_group_results(title, group, results),
+                         on_error=self._on_unrestrict_error)
+
+    def _send_group_to_rd(self, rd, links):
+        done = [0]
+        lock = threading.Lock()
+
+        def on_result(index, item):
+            with lock:
+                done[0] += 1
+                count = done[0]
+            self.root.after(0, lambda: self.status_var.set(f"Unrestricted {count}/{len(links)} links..."))
+
+        return rd.unrestrict_links(links, callback=on_result)
+
+    def _show_group_results(self, title, group, results):
+        self.rd_group_btn.config(state=tk.NORMAL if self.selected_link else tk.DISABLED)
+        ok = [r for r in results if r["ok"]]
+        if ok:
+            entries = [{"timestamp": time.time(), "game_title": title, "original_link": r["link"], "download_link": r["download"]} for r in ok]
+            self.jobs.submit(self.history.add_many, entries, name="history", lane=BACKGROUND)
+        self.status_var.set(f"Unrestricted {len(ok)}/{len(results)} links")
+
+        window = tk.Toplevel(self.root)
+        window.title(f"Real-Debrid - {group or title}")
+        window.geometry("800x400")
+        text = tk.Text(window, bg='#2b2b2b', fg='white', font=self.font, wrap=tk.NONE)
+        text.pack(fill=tk.BOTH, expand=True)
+        for r in results:
+            if r["ok"]:
+                text.insert(tk.END, f"{r['download']}\n")
             else:
-                messagebox.showerror("Error", f"Failed to unrestrict link: {result}")
-        except Exception as e:
-            messagebox.showerror("Error", f"Exception: {e}")
+                error = r.get("error") or r.get("result", {}).get("error", "unknown error")
+                text.insert(tk.END, f"# FAILED {r['link']}: {error}\n")
+
+        def copy_links():
+            self.root.clipboard_clear()
+            self.root.clipboard_append("\n".join(r["download"] for r in ok))
+
+        def download_all():
+            for r in ok:
+                self.start_download(r["download"], title)
+
+        buttons = ttk.Frame(window)
+        buttons.pack(pady=5)
+        ttk.Button(buttons, text="Copy Links", command=copy_links).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Download All", command=download_all, state=tk.NORMAL if ok else tk.DISABLED).pack(side=tk.LEFT, padx=5)
+
+    def start_download(self, url, title=None):
+        if not cfg.downloads.get("builtin", True):
+            webbrowser.open(url)
+            self.status_var.set("Link unrestricted")
+            return
+        self.downloads.add(url, title=title)
+        self.status_var.set(f"Queued download of {title or url}")
+
+    def _on_download_update(self, job):
+        name = job.to_dict()["name"] or job.url
+        if job.status == "done":
+            self.status_var.set(f"Downloaded {job.path}")
+        elif job.status == "failed":
+            self.status_var.set(f"Download of {name} failed: {job.error}")
+
+    def show_downloads(self):
+        window = tk.Toplevel(self.root)
+        window.title("Downloads")
+        window.geometry("800x400")
+        window.configure(bg='#2b2b2b')
+
+        style = ttkthemes.ThemedStyle(window)
+        style.set_theme("equilux")
+
+        listbox = tk.Listbox(window, bg='#2b2b2b', fg='white', selectbackground='#4a4a4a', font=self.font)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        summary = tk.StringVar()
+        ttk.Label(window, textvariable=summary).pack(fill=tk.X, padx=10)
+        job_ids = []
+
+        def cancel_selected():
+            selection = listbox.curselection()
+            if selection and selection[0] < len(job_ids):
+                self.downloads.cancel(job_ids[selection[0]])
+
+        ttk.Button(window, text="Cancel", command=cancel_selected).pack(pady=5)
+
+        def refresh():
+            if not window.winfo_exists():
+                return
+            selection = listbox.curselection()
+            listbox.delete(0, tk.END)
+            job_ids.clear()
+            for job in self.downloads.jobs:
+                info = job.to_dict()
+                total = info["total"]
+                progress = f"{100.0 * info['done'] / total:.0f}%" if total else f"{info['done'] // (1024 * 1024)} MB"
+                speed = f" {info['mbps']} MB/s" if job.status == "running" else ""
+                listbox.insert(tk.END, f"[{job.status}] {info['name'] or info['url']} {progress}{speed}")
+                job_ids.append(job.id)
+            if selection and selection[0] < listbox.size():
+                listbox.selection_set(selection[0])
+            stats = self.downloads.stats()
+            summary.set(f"{stats['running']} running, {stats['queued']} queued, {stats['done']} done, "
+                        f"{stats['failed']} failed - {stats['mbps']} MB/s total")
+            window.after(1000, refresh)
+
+        refresh()
+
+    def show_jobs(self):
+        window = tk.Toplevel(self.root)
+        window.title("Jobs")
+        window.geometry("800x400")
+        window.configure(bg='#2b2b2b')
+
+        style = ttkthemes.ThemedStyle(window)
+        style.set_theme("equilux")
+
+        summary = tk.StringVar()
+        ttk.Label(window, textvariable=summary).pack(fill=tk.X, padx=10, pady=(10, 0))
+        listbox = tk.Listbox(window, bg='#2b2b2b', fg='white', selectbackground='#4a4a4a', font=self.font)
+        listbox.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        shown = []
+
+        def cancel_selected():
+            selection = listbox.curselection()
+            if selection and selection[0] < len(shown):
+                self.jobs.cancel(shown[selection[0]])
+
+        ttk.Button(window, text="Cancel", command=cancel_selected).pack(pady=5)
+
+        def refresh():
+            if not window.winfo_exists():
+                return
+            selection = listbox.curselection()
+            listbox.delete(0, tk.END)
+            shown.clear()
+            for job in self.jobs.jobs():
+                info = job.to_dict()
+                run = f", ran {info['run_ms']:.0f} ms" if info["run_ms"] is not None else ""
+                listbox.insert(tk.END, f"[{info['state']}] {info['lane']}: {info['name']} (waited {info['wait_ms']:.0f} ms{run})")
+                shown.append(job)
+            if selection and selection[0] < listbox.size():
+                listbox.selection_set(selection[0])
+            stats = self.jobs.stats()
+            lanes = ", ".join(f"{lane} {stats['queued'][lane]} queued/{stats['running'][lane]} running "
+                              f"(avg wait {stats['avg_wait_ms'][lane]:.0f} ms)" for lane in stats["queued"])
+            summary.set(f"{stats['workers']}/{stats['max_workers']} workers - {lanes} - "
+                        f"{stats['done']} done, {stats['failed']} failed, {stats['cancelled']} cancelled")
+            window.after(500, refresh)
+
+        refresh()
+
+    def show_diagnostics(self):
+        window = tk.Toplevel(self.root)
+        window.title("Diagnostics")
+        window.geometry("900x500")
+        window.configure(bg='#2b2b2b')
+
+        style = ttkthemes.ThemedStyle(window)
+        style.set_theme("equilux")
+
+        text = scrolledtext.ScrolledText(window, bg='#2b2b2b', fg='white', font=("Courier", 10), wrap=tk.NONE)
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        def label_text(labels):
+            return ",".join(f"{k}={v}" for k, v in labels.items())
+
+        def refresh():
+            if not window.winfo_exists():
+                return
+            snapshot = metrics.snapshot()
+            position = text.yview()[0]
+            text.config(state=tk.NORMAL)
+            text.delete(1.0, tk.END)
+            text.insert(tk.END, f"Uptime {snapshot['uptime']}s\n\n")
+            text.insert(tk.END, f"{'timer':<32}{'labels':<30}{'count':>8}{'avg ms':>11}{'max ms':>11}\n")
+            for t in snapshot["timers"]:
+                text.insert(tk.END, f"{t['name']:<32}{label_text(t['labels']):<30}{t['count']:>8}"
+                                    f"{t['avg_ms']:>11.1f}{t['max_ms'] or 0:>11.1f}\n")
+            text.insert(tk.END, f"\n{'counter':<32}{'labels':<30}{'value':>8}\n")
+            for c in snapshot["counters"]:
+                text.insert(tk.END, f"{c['name']:<32}{label_text(c['labels']):<30}{c['value']:>8}\n")
+            text.config(state=tk.DISABLED)
+            text.yview_moveto(position)
+            window.after(1000, refresh)
+
+        def export():
+            path = filedialog.asksaveasfilename(parent=window, title="Export metrics", defaultextension=".prom",
+                                                filetypes=[("Prometheus text", "*.prom"), ("JSON", "*.json")])
+            if path:
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(metrics.export("json" if path.endswith(".json") else "prometheus"))
+                self.status_var.set(f"Metrics written to {path}")
+
+        def profile_next():
+            self._profile_next = True
+            self.status_var.set("The next game details scrape will be profiled")
+
+        buttons = ttk.Frame(window)
+        buttons.pack(pady=5)
+        ttk.Button(buttons, text="Export...", command=export).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Reset", command=metrics.reset).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons, text="Profile Next Scrape", command=profile_next).pack(side=tk.LEFT, padx=5)
+
+        refresh()
+
+    def _show_profile(self, title, stats):
+        window = tk.Toplevel(self.root)
+        window.title(title)
+        window.geometry("1000x500")
+        text = scrolledtext.ScrolledText(window, bg='#2b2b2b', fg='white', font=("Courier", 9), wrap=tk.NONE)
+        text.pack(fill=tk.BOTH, expand=True)
+        text.insert(tk.END, stats)
+        text.config(state=tk.DISABLED)
 
     def ftp_transfer(self):
         ftp_config = cfg.ftp
@@ -388,9 +941,9 @@ class PKGScraperGUI:
             messagebox.showerror("Error", "FTP host not configured. Please set it in settings.")
             return
 
-        # Select local file
-        local_file = filedialog.askopenfilename(title="Select file to upload")
-        if not local_file:
+        # Select local files
+        local_files = filedialog.askopenfilenames(title="Select files to upload")
+        if not local_files:
             return
 
         # Ask for remote directory
@@ -398,67 +951,120 @@ class PKGScraperGUI:
         if remote_dir is None:
             return
 
-        # Upload in thread
-        threading.Thread(target=self._ftp_upload, args=(local_file, remote_dir, ftp_config), daemon=True).start()
-
-    def _ftp_upload(self, local_file, remote_dir, ftp_config):
+        # Same-named smaller files on the server may be interrupted earlier uploads
+        local_files = list(local_files)
+        self.status_var.set("Checking FTP server for partial uploads...")
+        self.jobs.submit(self.ftp_uploader(ftp_config).partial_uploads, local_files, remote_dir,
+                         name=f"ftp check {len(local_files)} files", key=("ftp-check", tuple(local_files), remote_dir),
+                         on_done=lambda partial: self._start_ftp_upload(local_files, remote_dir, ftp_config, partial),
+                         on_error=lambda e: messagebox.showerror("FTP Error", f"Upload failed: {e}"))
+
+    def _start_ftp_upload(self, local_files, remote_dir, ftp_config, partial):
+        resume = ()
+        if partial:
+            names = "\n".join(f"{os.path.basename(path)}: {size / (1024 * 1024):.1f} of "
+                               f"{os.path.getsize(path) / (1024 * 1024):.1f} MB"
+                               for path, size in partial.items())
+            if messagebox.askyesno("Resume Upload", "The server already has part of:\n\n"
+                                   f"{names}\n\nResume these uploads? No uploads them again from the start."):
+                resume = set(partial)
+        self.status_var.set(f"Uploading {len(local_files)} files to FTP...")
+        self.jobs.submit(self._ftp_upload, local_files, remote_dir, ftp_config, resume,
+                         name=f"ftp upload {len(local_files)} files", key=("ftp", tuple(local_files), remote_dir),
+                         on_done=self._on_ftp_uploaded,
+                         on_error=lambda e: messagebox.showerror("FTP Error", f"Upload failed: {e}"))
+
+    def send_to_console(self):
+        if not self.selected_link:
+            return
+        ftp_config = cfg.ftp
+        if not ftp_config.get("host"):
+            messagebox.showerror("Error", "FTP host not configured. Please set it in settings.")
+            return
+        rd = self._rd_api()
+        if rd is None:
+            return
+        remote_dir = simpledialog.askstring("FTP Directory", "Enter remote directory path:", initialvalue="/")
+        if remote_dir is None:
+            return
+        link, title = self.selected_link, self.selected_game['title']
+        self.status_var.set("Unrestricting link...")
+        self.jobs.submit(self._send_to_console, rd, link, title, remote_dir, ftp_config, name=f"send {title}",
+                         key=("send", link, remote_dir))
+
+    def _send_to_console(self, rd, link, title, remote_dir, ftp_config):
+        # Download and upload in one pass: nothing is written locally unless ftp.stream_tee_dir is set
+        from src.pipeline import StreamTransfer
         try:
-            with ftplib.FTP() as ftp:
-                ftp.connect(ftp_config["host"], ftp_config["port"])
-                ftp.login(ftp_config["username"], ftp_config["password"])
-
-                # Change to remote directory
-                if remote_dir and remote_dir != "/":
-                    try:
-                        ftp.cwd(remote_dir)
-                    except ftplib.error_perm:
-                        self.root.after(0, lambda: messagebox.showerror("FTP Error", f"Cannot access directory: {remote_dir}"))
-                        return
-
-                # Upload file
-                filename = os.path.basename(local_file)
-                with open(local_file, 'rb') as f:
-                    ftp.storbinary(f'STOR {filename}', f)
-
-                self.root.after(0, lambda: messagebox.showinfo("Success", f"Uploaded {filename} to FTP"))
-
+            unrestricted = rd.unrestrict_link(link)
+            if "download" not in unrestricted:
+                self.root.after(0, lambda: messagebox.showerror("Error", f"Failed to unrestrict link: {unrestricted}"))
+                self.root.after(0, lambda: self.status_var.set("Unrestrict failed"))
+                return
+            download = unrestricted["download"]
+            self.root.after(0, lambda: self.add_to_history(title, link, download))
+
+            def on_progress(progress):
+                text = str(progress)
+                self.root.after(0, lambda: self.status_var.set(f"Streaming {text}"))
+
+            transfer = StreamTransfer(self.ftp_uploader(ftp_config))
+            result = transfer.send(download, remote_dir, tee_dir=ftp_config.get("stream_tee_dir") or None, progress=on_progress)
         except Exception as e:
-            self.root.after(0, lambda: self.root.after(0, lambda: messagebox.showerror("FTP Error", f"Upload failed: {e}")))
+            self.root.after(0, lambda: messagebox.showerror("FTP Error", f"Transfer failed: {e}"))
+            return
+        if result["ok"]:
+            self.root.after(0, lambda: self.status_var.set(f"Sent {result['remote']} ({result['mbps']} MB/s)"))
+            self.root.after(0, lambda: messagebox.showinfo("Success", f"Sent {result['remote']} to FTP"))
+        else:
+            self.root.after(0, lambda: self.status_var.set("Transfer failed"))
+            self.root.after(0, lambda: messagebox.showerror("FTP Error", f"Transfer failed: {result.get('error')}"))
+
+    def ftp_uploader(self, ftp_config):
+        # Keep logged-in connections between transfers until the settings change
+        from src.ftp_transfer import FTPUploader
+        key = (ftp_config["host"], ftp_config.get("port", 21), ftp_config.get("username", ""), ftp_config.get("password", ""))
+        if self._ftp_uploader is None or self._ftp_key != key:
+            if self._ftp_uploader is not None:
+                self._ftp_uploader.close()
+            self._ftp_uploader = FTPUploader.from_config(ftp_config)
+            self._ftp_key = key
+        return self._ftp_uploader
+
+    def _ftp_upload(self, local_files, remote_dir, ftp_config, resume=()):
+        uploader = self.ftp_uploader(ftp_config)
+
+        def on_progress(progress):
+            text = str(progress)
+            self.root.after(0, lambda: self.status_var.set(f"FTP {text}"))
+
+        return uploader.upload_many(local_files, remote_dir, resume=resume, progress=on_progress)
+
+    def _on_ftp_uploaded(self, results):
+        failed = [r for r in results if not r["ok"]]
+        uploaded = len(results) - len(failed)
+        self.status_var.set(f"FTP: uploaded {uploaded}/{len(results)} files")
+        if failed:
+            errors = "\n".join(f"{os.path.basename(r['file'])}: {r.get('error')}" for r in failed)
+            messagebox.showerror("FTP Error", f"Upload failed:\n{errors}")
+        else:
+            names = ", ".join(os.path.basename(r["file"]) for r in results)
+            messagebox.showinfo("Success", f"Uploaded {names} to FTP")
 
     def get_host_name(self, url):
-        try:
-            domain = urlparse(url).netloc
-            parts = domain.replace("www.", "").split(".")
-            return parts[0].capitalize() if parts else "Link"
-        except:
-            return "Link"
+        return host_name(url)
 
     def run(self):
         self.root.mainloop()
 
     def load_history(self):
-        try:
-            with open("download_history.json", "r") as f:
-                return json.load(f)
-        except:
-            return []
-
-    def save_history(self):
-        try:
-            with open("download_history.json", "w") as f:
-                json.dump(self.history, f, indent=4)
-        except:
-            pass
+        # Opened lazily; the legacy JSON import and compaction run in _background_init
+        from src.history import HistoryStore
+        return HistoryStore()
 
     def add_to_history(self, game_title, original_link, download_link):
-        entry = {
-            "timestamp": time.time(),
-            "game_title": game_title,
-            "original_link": original_link,
-            "download_link": download_link
-        }
-        self.history.append(entry)
-        self.save_history()
+        # Off the Tk thread: the first write may wait for the legacy import
+        self.jobs.submit(self.history.add, game_title, original_link, download_link, name="history", lane=BACKGROUND)
 
     def show_history(self):
         history_window = tk.Toplevel(self.root)
@@ -470,17 +1076,92 @@ class PKGScraperGUI:
         style = ttkthemes.ThemedStyle(history_window)
         style.set_theme("equilux")
 
+        # Filters
+        filters = ttk.Frame(history_window, padding=5)
+        filters.pack(fill=tk.X, padx=10)
+        ttk.Label(filters, text="Title:").pack(side=tk.LEFT)
+        title_entry = ttk.Entry(filters, width=25)
+        title_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filters, text="Hoster:").pack(side=tk.LEFT)
+        hoster_box = ttk.Combobox(filters, width=18, values=[""] + [h for h, _ in self.history.hosters()])
+        hoster_box.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filters, text="From:").pack(side=tk.LEFT)
+        from_entry = ttk.Entry(filters, width=11)
+        from_entry.pack(side=tk.LEFT, padx=5)
+        ttk.Label(filters, text="To:").pack(side=tk.LEFT)
+        to_entry = ttk.Entry(filters, width=11)
+        to_entry.pack(side=tk.LEFT, padx=5)
+        count_var = tk.StringVar()
+        ttk.Label(history_window, textvariable=count_var).pack(fill=tk.X, padx=15)
+
         # Scrolled text
         text = scrolledtext.ScrolledText(history_window, bg='#2b2b2b', fg='white', font=self.font, wrap=tk.WORD)
         text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
-        for entry in reversed(self.history[-50:]):  # Show last 50
+        page_size = 100
+        state = {"filters": {}, "before_id": None, "exhausted": False, "loading": False, "cancel": None}
+
+        def parse_date(value):
+            value = value.strip()
+            if not value:
+                return None
+            try:
+                return datetime.strptime(value, "%Y-%m-%d").timestamp()
+            except ValueError:
+                return None
+
+        def insert_entry(entry):
             dt = datetime.fromtimestamp(entry["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
+            text.config(state=tk.NORMAL)
             text.insert(tk.END, f"{dt} - {entry['game_title']}\n")
             text.insert(tk.END, f"Original: {entry['original_link']}\n")
             text.insert(tk.END, f"Download: {entry['download_link']}\n\n")
-
-        text.config(state=tk.DISABLED)
+            text.config(state=tk.DISABLED)
+
+        def page_loaded():
+            state["loading"] = False
+
+        def load_page():
+            if state["exhausted"] or state["loading"]:
+                return
+            entries = self.history.query(limit=page_size, before_id=state["before_id"], **state["filters"])
+            if len(entries) < page_size:
+                state["exhausted"] = True
+            if entries:
+                state["before_id"] = entries[-1]["id"]
+            state["loading"] = True
+            state["cancel"] = run_in_batches(text, entries, insert_entry, on_done=page_loaded)
+
+        def apply_filters(event=None):
+            until = parse_date(to_entry.get())
+            state["filters"] = {
+                "title": title_entry.get().strip() or None,
+                "hoster": hoster_box.get().strip() or None,
+                "since": parse_date(from_entry.get()),
+                "until": until + 86400 if until is not None else None,
+            }
+            if state["cancel"]:
+                state["cancel"]()
+            state["before_id"] = None
+            state["exhausted"] = False
+            state["loading"] = False
+            text.config(state=tk.NORMAL)
+            text.delete(1.0, tk.END)
+            count_var.set(f"{self.history.count(**state['filters'])} entries")
+            load_page()
+
+        def on_scroll(first, last):
+            text.vbar.set(first, last)
+            # Fetch the next page as the view nears the end of what is loaded
+            if float(last) > 0.9:
+                history_window.after_idle(load_page)
+
+        text.configure(yscrollcommand=on_scroll)
+        ttk.Button(filters, text="Filter", command=apply_filters).pack(side=tk.LEFT, padx=5)
+        for widget in (title_entry, from_entry, to_entry):
+            widget.bind('<Return>', apply_filters)
+        hoster_box.bind('<<ComboboxSelected>>', apply_filters)
+        apply_filters()
 
 if __name__ == "__main__":
     app = PKGScraperGUI()
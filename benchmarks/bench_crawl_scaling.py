@@ -0,0 +1,126 @@
+"""Catalogue crawl throughput with thread workers vs worker processes at 1/2/4/8 workers.
+
+Usage: python -m benchmarks.bench_crawl_scaling [--pages 5] [--workers 1,2,4,8] [--json OUT]
+
+A synthetic catalogue of --pages listing pages (20 games each) is served
+from the recorded fixtures by the local replay server. Every run is forced,
+so each game page and download page is fetched and fully parsed; the HTTP
+cache is off. The server runs in its own process so it does not compete
+with the crawler for the GIL. Both modes write through the single-writer
+path into a fresh SQLite cache, and each run's cache is compared with the
+first one.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+
+from benchmarks.server import FIXTURE_DIR, ReplayServer
+from src.crawler import CrawlState, IncrementalCrawler
+from src.database import GameCache, SQLiteCacheBackend
+from src.scraper import PSScraper
+
+LISTING_KEY = "/?s=gran+turismo"
+GAME_KEY = "/gran-turismo-7-ps4/"
+LISTING_RE = re.compile(r"/(?:page/(\d+)/)?")
+GAME_RE = re.compile(r"/gran-turismo-\d+-ps4/")
+SLUG_RE = re.compile(rb"gran-turismo-(\d+)-ps4")
+
+
+class CatalogueServer(ReplayServer):
+    """Replay server whose catalogue has `pages` listing pages of distinct games."""
+
+    def __init__(self, pages, fixture_dir=FIXTURE_DIR):
+        super().__init__(fixture_dir)
+        self.catalogue_pages = pages
+
+    def _body(self, key):
+        match = LISTING_RE.fullmatch(key)
+        if match:
+            page = int(match.group(1) or 1)
+            if page > self.catalogue_pages:
+                return None
+            listing = super()._body(LISTING_KEY)
+            return SLUG_RE.sub(lambda m: b"gran-turismo-%d-ps4" % (page * 1000 + int(m.group(1))), listing)
+        if GAME_RE.fullmatch(key):
+            return super()._body(GAME_KEY)
+        return super()._body(key)
+
+
+def serve(pages, urls):
+    server = CatalogueServer(pages)
+    urls.put(server.base_url)
+    server._httpd.serve_forever()
+
+
+def crawl(base_url, workers, processes, tmp):
+    scraper = PSScraper()
+    scraper.base_url = base_url
+    scraper.http_cache = None
+    scraper.per_host_limit = max(workers, 1)
+    db = GameCache(SQLiteCacheBackend(os.path.join(tmp, f"cache-{processes}-{workers}.db")))
+    db.load()
+    state = CrawlState(os.path.join(tmp, f"state-{processes}-{workers}.db"))
+    crawler = IncrementalCrawler(scraper, db, state, workers=workers, processes=processes)
+    start = time.perf_counter()
+    report = crawler.run(resume=False, force=True)
+    elapsed = time.perf_counter() - start
+    # Listing pages plus a game page and a download page per game
+    pages = report["pages"] + 2 * (report["new"] + report["failed"])
+    entries = {game["url"]: db.get(game["url"])["links"] for game in db.cached_games()}
+    state.close()
+    db.backend.close()
+    return {
+        "mode": "processes" if processes else "threads",
+        "workers": workers,
+        "games": report["new"],
+        "failed": report["failed"],
+        "pages": pages,
+        "seconds": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 1),
+    }, entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=5)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    counts = [int(w) for w in args.workers.split(",")]
+    rows = []
+    reference = None
+    mismatches = 0
+    urls = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(args.pages, urls), daemon=True)
+    server.start()
+    base_url = urls.get(timeout=30)
+    with tempfile.TemporaryDirectory() as tmp:
+        for processes in (False, True):
+            for workers in counts:
+                row, entries = crawl(base_url, workers, workers if processes else 0, tmp)
+                if reference is None:
+                    reference = entries
+                row["same_cache"] = entries == reference
+                mismatches += 0 if row["same_cache"] else 1
+                base = next((r for r in rows if r["mode"] == row["mode"]), row)
+                row["speedup"] = round(row["pages_per_sec"] / base["pages_per_sec"], 2)
+                rows.append(row)
+                print(f"{row['mode']:>9} x {workers}: {row['games']:>4} games, {row['pages']:>4} pages in "
+                      f"{row['seconds']:>7}s = {row['pages_per_sec']:>7} pages/s ({row['speedup']}x)  "
+                      f"same cache: {row['same_cache']}")
+
+    server.terminate()
+    print(f"cpus: {os.cpu_count()}")
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"cpus": os.cpu_count(), "runs": rows}, f, indent=4)
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
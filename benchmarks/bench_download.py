@@ -0,0 +1,112 @@
+"""Segmented download throughput and crash-resume against a local Range server.
+
+Usage: python -m benchmarks.bench_download [--size-mb 64] [--rate-mbps 20] [--json OUT]
+
+Each connection to the stand-in host is capped at --rate-mbps, like a file
+host throttling single streams, so the gain from more segments is visible.
+"""
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+
+from benchmarks.server import RangeFileServer
+from src.downloader import JOURNAL_SUFFIX, PART_SUFFIX, DownloadCancelled, SegmentedDownload
+
+
+def make_file(directory, size_mb):
+    path = os.path.join(directory, "source.pkg")
+    block = os.urandom(1024 * 1024)
+    with open(path, "wb") as f:
+        for _ in range(size_mb):
+            f.write(block)
+    return path
+
+
+def same_content(a, b):
+    with open(a, "rb") as fa, open(b, "rb") as fb:
+        while True:
+            x, y = fa.read(1024 * 1024), fb.read(1024 * 1024)
+            if x != y:
+                return False
+            if not x:
+                return True
+
+
+def bench_segments(source, rate_mbps, counts=(1, 2, 4, 8)):
+    size = os.path.getsize(source)
+    rows = []
+    for count in counts:
+        with tempfile.TemporaryDirectory() as out, RangeFileServer(source, rate_mbps) as server:
+            start = time.perf_counter()
+            path = SegmentedDownload(server.url, out, segments=count).run()
+            elapsed = time.perf_counter() - start
+            rows.append({
+                "segments": count,
+                "seconds": round(elapsed, 3),
+                "mbps": round(size / elapsed / (1024 * 1024), 1),
+                "ok": same_content(source, path),
+            })
+    return rows
+
+
+def bench_resume(source, rate_mbps, segments=4):
+    """Cancel halfway (as a crash would), then resume from the journal."""
+    size = os.path.getsize(source)
+    with tempfile.TemporaryDirectory() as out, RangeFileServer(source, rate_mbps) as server:
+        first = SegmentedDownload(server.url, out, segments=segments)
+        watcher = threading.Thread(target=lambda: (_wait_for(first, size // 2), first.cancel()), daemon=True)
+        watcher.start()
+        try:
+            first.run()
+        except DownloadCancelled:
+            pass
+        watcher.join()
+        partial = os.path.exists(os.path.join(out, first.name + PART_SUFFIX)) and \
+            os.path.exists(os.path.join(out, first.name + JOURNAL_SUFFIX))
+        served_before = server.bytes_served
+
+        second = SegmentedDownload(server.url, out, segments=segments)
+        path = second.run()
+        return {
+            "ok": partial and same_content(source, path),
+            "resumed_from": second.resumed_from,
+            "bytes_refetched": server.bytes_served - served_before - (size - second.resumed_from),
+            "file_bytes": size,
+        }
+
+
+def _wait_for(download, target):
+    while download.done < target:
+        time.sleep(0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--rate-mbps", type=float, default=20.0, help="per-connection cap of the stand-in host")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = make_file(tmp, args.size_mb)
+        results = {"segments": bench_segments(source, args.rate_mbps), "resume": bench_resume(source, args.rate_mbps)}
+
+    print(f"{args.size_mb} MB at {args.rate_mbps} MB/s per connection")
+    for row in results["segments"]:
+        print(f"{row['segments']:>2} segments: {row['seconds']:>8}s {row['mbps']:>8} MB/s ok={row['ok']}")
+    resume = results["resume"]
+    print(f"resume: ok={resume['ok']} from {resume['resumed_from']} of {resume['file_bytes']} bytes, "
+          f"{resume['bytes_refetched']} bytes fetched twice")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    ok = resume["ok"] and all(row["ok"] for row in results["segments"])
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
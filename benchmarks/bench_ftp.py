@@ -0,0 +1,135 @@
+"""FTP upload throughput against the local stand-in server.
+
+Usage: python -m benchmarks.bench_ftp [--size-mb 64] [--files 4] [--json OUT]
+
+Compares the old one-connection-per-file 8 KB storbinary upload with
+FTPUploader at several block and pool sizes, checks that an upload cut
+halfway through resumes with REST instead of starting over, and streams a
+file from a local HTTP server straight into FTP to show memory stays flat.
+"""
+import argparse
+import ftplib
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.ftp_server import PASSWORD, USERNAME, FTPStandIn
+from benchmarks.run import peak_rss_mb
+from benchmarks.server import RangeFileServer
+from src.ftp_transfer import FTPUploader
+from src.pipeline import StreamTransfer
+
+
+def make_files(directory, count, size_mb):
+    block = os.urandom(1024 * 1024)
+    paths = []
+    for i in range(count):
+        path = os.path.join(directory, f"part{i}.pkg")
+        with open(path, "wb") as f:
+            for _ in range(size_mb):
+                f.write(block)
+        paths.append(path)
+    return paths
+
+
+def legacy_upload(port, paths):
+    # What _ftp_upload used to do: a fresh login per file and the default block size
+    for path in paths:
+        with ftplib.FTP() as ftp:
+            ftp.connect("127.0.0.1", port)
+            ftp.login(USERNAME, PASSWORD)
+            with open(path, "rb") as f:
+                ftp.storbinary(f"STOR {os.path.basename(path)}", f)
+
+
+def timed(label, total_bytes, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    return {"label": label, "seconds": round(elapsed, 3), "mbps": round(total_bytes / elapsed / (1024 * 1024), 1)}
+
+
+def bench_throughput(paths, block_sizes=(8192, 65536, 1024 * 1024), pool_sizes=(1, 2, 4)):
+    total = sum(os.path.getsize(p) for p in paths)
+    results = []
+    with FTPStandIn() as server:
+        results.append(timed("legacy 8K, new connection per file", total, lambda: legacy_upload(server.port, paths)))
+        for block_size in block_sizes:
+            for pool_size in pool_sizes:
+                uploader = FTPUploader("127.0.0.1", server.port, USERNAME, PASSWORD,
+                                       pool_size=pool_size, block_size=block_size)
+                row = timed(f"block {block_size // 1024}K, pool {pool_size}", total,
+                            lambda: uploader.upload_many(paths, resume=False))
+                uploader.close()
+                results.append(row)
+    return results
+
+
+def bench_resume(path):
+    total = os.path.getsize(path)
+    with FTPStandIn(fail_after=total // 2) as server:
+        uploader = FTPUploader("127.0.0.1", server.port, USERNAME, PASSWORD, max_retries=1)
+        result = uploader.upload(path)
+        uploader.close()
+        stored = os.path.getsize(server.path(os.path.basename(path)))
+        return {
+            "ok": result["ok"] and stored == total,
+            "interrupted": server.interrupted,
+            "bytes_received": server.bytes_received,
+            "file_bytes": total,
+            "resent_bytes": server.bytes_received - total,
+        }
+
+
+def bench_stream(path, buffer_mb=8):
+    total = os.path.getsize(path)
+    rss_before = peak_rss_mb()
+    with RangeFileServer(path) as http, FTPStandIn() as server:
+        uploader = FTPUploader("127.0.0.1", server.port, USERNAME, PASSWORD)
+        result = StreamTransfer(uploader, buffer_mb=buffer_mb).send(http.url)
+        uploader.close()
+        stored = os.path.getsize(server.path(os.path.basename(path)))
+    rss_after = peak_rss_mb()
+    return {
+        "ok": result["ok"] and stored == total,
+        "seconds": result["seconds"],
+        "mbps": result["mbps"],
+        "buffer_mb": buffer_mb,
+        "peak_rss_growth_mb": round(rss_after - rss_before, 1) if rss_before is not None else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size-mb", type=int, default=64)
+    parser.add_argument("--files", type=int, default=4)
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = make_files(tmp, args.files, args.size_mb)
+        results = {
+            "throughput": bench_throughput(paths),
+            "resume": bench_resume(paths[0]),
+            "stream": bench_stream(paths[-1]),
+        }
+
+    print(f"{args.files} x {args.size_mb} MB")
+    for row in results["throughput"]:
+        print(f"{row['label']:<36} {row['seconds']:>8}s {row['mbps']:>8} MB/s")
+    resume = results["resume"]
+    print(f"resume: ok={resume['ok']} interrupted={resume['interrupted']} "
+          f"received {resume['bytes_received']} of {resume['file_bytes']} bytes")
+    stream = results["stream"]
+    print(f"HTTP -> FTP stream: ok={stream['ok']} {stream['mbps']} MB/s, "
+          f"peak RSS grew {stream['peak_rss_growth_mb']} MB with a {stream['buffer_mb']} MB buffer")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    return 0 if resume["ok"] and stream["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,78 @@
+"""Link filtering per page: the old substring scan over ignore_domains vs LinkClassifier.
+
+Usage: python -m benchmarks.bench_links [--rounds N] [--scale N] [fixture.html ...]
+
+Every href of each fixture page is filtered; the last line also tags the
+kept links with hoster and part number and builds the display rows, which
+is everything the links pane needs. `--scale` repeats each page's hrefs to
+mimic large multi-part link tables.
+"""
+import argparse
+import glob
+import os
+import time
+
+from src.links import LinkClassifier, display_rows
+from src.scraper import DEFAULT_IGNORE_DOMAINS, DETAIL_PAGE_TAGS, make_soup
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def legacy_filter(hrefs, ignore_domains):
+    return [href for href in hrefs
+            if not any(domain in href.lower() for domain in ignore_domains)
+            and href.startswith("http") and len(href) > 15]
+
+
+def classifier_filter(hrefs, classifier):
+    return [href for href in hrefs if classifier.accepts(href)]
+
+
+def classifier_rows(hrefs, classifier):
+    links = [{"group": "All Links", "label": "Link", "url": href} for href in hrefs if classifier.accepts(href)]
+    return display_rows(links, classifier)
+
+
+def time_per_page(func, pages, arg, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for hrefs in pages:
+            func(hrefs, arg)
+    return (time.perf_counter() - start) * 1000 / (rounds * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("fixtures", nargs="*")
+    args = parser.parse_args()
+
+    paths = args.fixtures or sorted(glob.glob(os.path.join(FIXTURE_DIR, "**", "*.html"), recursive=True))
+    if not paths:
+        print(f"No fixtures found in {FIXTURE_DIR}")
+        return 1
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            soup = make_soup(f.read(), parse_only=DETAIL_PAGE_TAGS)
+        pages.append([a["href"] for a in soup.find_all("a", href=True)] * args.scale)
+
+    classifier = LinkClassifier(DEFAULT_IGNORE_DOMAINS)
+    hrefs = sum(len(p) for p in pages) / len(pages)
+    legacy_ms = time_per_page(legacy_filter, pages, DEFAULT_IGNORE_DOMAINS, args.rounds)
+    fast_ms = time_per_page(classifier_filter, pages, classifier, args.rounds)
+    rows_ms = time_per_page(classifier_rows, pages, classifier, args.rounds)
+    for hrefs_ in pages:
+        if legacy_filter(hrefs_, DEFAULT_IGNORE_DOMAINS) != classifier_filter(hrefs_, classifier):
+            print("NOTE: kept links differ (ignore entries now match hostnames, not anywhere in the URL)")
+            break
+    print(f"pages: {len(pages)}  hrefs/page: {hrefs:.0f}  rounds: {args.rounds}")
+    print(f"substring filter:                     {legacy_ms:.3f} ms/page")
+    print(f"compiled hostname filter:             {fast_ms:.3f} ms/page ({legacy_ms / fast_ms:.2f}x)")
+    print(f"filter + hoster/part + display rows:  {rows_ms:.3f} ms/page")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+"""Link liveness checks against a local stand-in hoster: sequential vs parallel, cache hits, Real-Debrid.
+
+Usage: python -m benchmarks.bench_liveness [--links 200] [--latency-ms 50] [--workers 1,4,16,32] [--json OUT]
+
+The link mix is 60% live files, 20% deleted (404), 10% hosts refusing HEAD
+and 10% landing pages of removed files that only Real-Debrid's check
+endpoint recognises as dead.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.server import MirrorServer
+from src.apis import RealDebridAPI
+from src.database import GameCache, SQLiteCacheBackend
+from src.liveness import ALIVE, DEAD, LinkChecker
+
+MIX = (("file", ALIVE), ("file", ALIVE), ("file", ALIVE), ("file", ALIVE), ("file", ALIVE), ("file", ALIVE),
+       ("gone", DEAD), ("gone", DEAD), ("nohead", ALIVE), ("removed", DEAD))
+
+
+def make_links(base_url, count):
+    """[(url, expected state over HTTP, expected state via Real-Debrid, size)]"""
+    links = []
+    for i in range(count):
+        kind, state = MIX[i % len(MIX)]
+        size = 1024 * 1024 * (i + 1)
+        http_state = ALIVE if kind == "removed" else state
+        links.append((f"{base_url}/{kind}/{i:05d}/Game.part{i % 10 + 1}.rar?size={size}", http_state, state, size))
+    return links
+
+
+def wrong(results, links, via_rd=False):
+    """Links whose state or size differs from what the stand-in server should report."""
+    errors = 0
+    for url, http_state, rd_state, size in links:
+        status = results.get(url)
+        expected = rd_state if via_rd else http_state
+        if status is None or status["state"] != expected:
+            errors += 1
+        elif status["state"] == ALIVE and "/removed/" not in url and status["size"] != size:
+            errors += 1
+    return errors
+
+
+def bench_workers(count, latency, counts):
+    rows = []
+    with MirrorServer(latency) as server:
+        links = make_links(server.base_url, count)
+        urls = [link[0] for link in links]
+        for workers in counts:
+            checker = LinkChecker(workers=workers, per_host_limit=workers, timeout=10)
+            start = time.perf_counter()
+            results = checker.check(urls)
+            elapsed = time.perf_counter() - start
+            rows.append({"workers": workers, "seconds": round(elapsed, 3),
+                         "links_per_sec": round(len(urls) / elapsed, 1), "wrong": wrong(results, links)})
+    return rows
+
+
+def bench_cache(count, latency, workers):
+    with tempfile.TemporaryDirectory() as tmp, MirrorServer(latency) as server:
+        db = GameCache(SQLiteCacheBackend(os.path.join(tmp, "cache.db")))
+        db.load()
+        urls = [link[0] for link in make_links(server.base_url, count)]
+        checker = LinkChecker(db, workers=workers, per_host_limit=workers)
+        start = time.perf_counter()
+        checker.check(urls)
+        cold = time.perf_counter() - start
+        served = sum(server.requests.values())
+        start = time.perf_counter()
+        results = checker.check(urls)
+        warm = time.perf_counter() - start
+        db.backend.close()
+        return {"cold_seconds": round(cold, 3), "cached_seconds": round(warm, 4),
+                "requests_when_cached": sum(server.requests.values()) - served, "cached_results": len(results)}
+
+
+def bench_real_debrid(count, latency, workers):
+    with MirrorServer(latency) as server:
+        links = make_links(server.base_url, count)
+        urls = [link[0] for link in links]
+        rd = RealDebridAPI("bench", max_workers=workers, rate_per_minute=60000, cache=False)
+        rd.base_url = server.rd_url
+        results = LinkChecker(rd=rd, workers=workers, per_host_limit=workers).check(urls)
+        http_only = LinkChecker(workers=workers, per_host_limit=workers).check(urls)
+        return {"wrong_via_http": wrong(http_only, links, via_rd=True),
+                "wrong_via_real_debrid": wrong(results, links, via_rd=True),
+                "rd_checks": server.requests["CHECK"]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--links", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--workers", default="1,4,16,32")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    latency = args.latency_ms / 1000
+    counts = [int(w) for w in args.workers.split(",")]
+
+    report = {"links": args.links, "latency_ms": args.latency_ms}
+    report["workers"] = bench_workers(args.links, latency, counts)
+    for row in report["workers"]:
+        print(f"{row['workers']:>3} workers: {row['seconds']:>7}s  {row['links_per_sec']:>7} links/s  "
+              f"wrong: {row['wrong']}")
+    report["cache"] = bench_cache(args.links, latency, max(counts))
+    cache = report["cache"]
+    print(f"cache: cold {cache['cold_seconds']}s, cached {cache['cached_seconds']}s "
+          f"({cache['requests_when_cached']} requests to the hoster)")
+    report["real_debrid"] = bench_real_debrid(args.links, latency, max(counts))
+    rd = report["real_debrid"]
+    print(f"removed-file detection: wrong via HTTP {rd['wrong_via_http']}, "
+          f"via Real-Debrid check {rd['wrong_via_real_debrid']} ({rd['rd_checks']} check calls)")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=4)
+    ok = all(row["wrong"] == 0 for row in report["workers"]) and rd["wrong_via_real_debrid"] == 0 \
+        and cache["requests_when_cached"] == 0
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,103 @@
+"""Resident memory of cached entries and search results: plain dicts vs the compact models.
+
+Usage: python -m benchmarks.bench_memory [--sizes 10000,100000] [--json OUT]
+
+"dicts" is what the JSON cache backend and the result list held before:
+json.load() output and one dict per search result. "compact" is the same
+data as CacheEntry / GameResult records with interned strings.
+"""
+import argparse
+import gc
+import json
+import random
+import time
+import tracemalloc
+
+from src.models import CacheEntry, GameResult
+
+REGIONS = ("USA", "EUR", "JPN", "ASIA", "N/A")
+HOSTS = ("1fichier.com", "mega.nz", "rapidgator.net", "mediafire.com")
+
+
+def sample_entry(i, rng):
+    parts = rng.randint(4, 12)
+    version = f"v1.{rng.randint(0, 30):02d}"
+    groups = (f"{version} Base Game", "Update", "DLC")
+    links = [{"group": groups[p % 3], "label": f"Part {p + 1}",
+              "url": f"https://{HOSTS[p % 4]}/?{i:06d}{p:02d}{rng.getrandbits(24):06x}"} for p in range(parts)]
+    rows = sorted(([f"{l['group']} - {l['label']} ({l['url'].split('/')[2].split('.')[0].capitalize()})",
+                    l["url"], l["group"]] for l in links), key=lambda row: row[2])
+    return {
+        "url": f"https://www.superpsx.com/game-{i}-ps4/",
+        "title": f"Game Title Number {i} PS4",
+        "size": f"{rng.randint(1, 90)} GB",
+        "downloads": "N/A",
+        "links": links,
+        "metadata": {
+            "size": f"{rng.randint(1, 90)} GB", "version": version, "region": rng.choice(REGIONS),
+            "password": "N/A", "firmware": rng.choice(("5.05", "6.72", "9.00", "N/A")), "voice": "N/A",
+            "subtitles": "N/A", "cusa": f"CUSA{i % 100000:05d}",
+        },
+        "timestamp": time.time(),
+        "display_rows": rows,
+    }
+
+
+def measure(build):
+    """Bytes still allocated by whatever build() returns once it is done."""
+    gc.collect()
+    tracemalloc.start()
+    value = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return current, peak
+
+
+def bench_cache(size):
+    rng = random.Random(size)
+    # Serialized outside the measurement so only the loaded form is counted
+    text = json.dumps({e["url"]: e for e in (sample_entry(i, rng) for i in range(size))})
+
+    def compact():
+        return {url: CacheEntry.from_dict(url, entry) for url, entry in json.loads(text).items()}
+
+    return measure(lambda: json.loads(text)), measure(compact)
+
+
+def bench_results(size):
+    text = json.dumps([{"title": f"Game Title Number {i} PS4", "url": f"https://www.superpsx.com/game-{i}-ps4/",
+                        "image": None, "downloads": "N/A", "size": "N/A"} for i in range(size)])
+    return measure(lambda: json.loads(text)), measure(lambda: [GameResult.from_dict(g) for g in json.loads(text)])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="10000,100000")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    args = parser.parse_args()
+
+    mb = 1024 * 1024
+    results = []
+    for size in (int(s) for s in args.sizes.split(",")):
+        for kind, bench in (("cache", bench_cache), ("results", bench_results)):
+            (before, before_peak), (after, after_peak) = bench(size)
+            results.append({
+                "kind": kind, "entries": size,
+                "dicts_mb": round(before / mb, 1), "compact_mb": round(after / mb, 1),
+                "compact_peak_mb": round(after_peak / mb, 1),
+                "ratio": round(before / after, 2) if after else None,
+            })
+            row = results[-1]
+            print(f"{kind:>7} x {size:>7}: dicts {row['dicts_mb']:>8} MB, compact {row['compact_mb']:>8} MB "
+                  f"({row['ratio']}x smaller, peak while loading {row['compact_peak_mb']} MB)")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
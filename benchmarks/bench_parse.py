@@ -0,0 +1,70 @@
+"""Compare the legacy two-pass html.parser path with the single-pass parser.
+
+Usage: python -m benchmarks.bench_parse [--rounds N] [fixture.html ...]
+"""
+import argparse
+import glob
+import os
+import time
+
+from src.scraper import HTML_PARSER, PSScraper, make_soup
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def legacy_parse(scraper, content):
+    # What PSScraper did before: stdlib parser, then one table walk for
+    # metadata and a second one for the grouped links.
+    soup = make_soup(content, "html.parser")
+    metadata = scraper._parse_metadata(soup, scraper.new_metadata())
+    links = scraper._scan_tables(soup) or scraper._raw_link_groups(soup)
+    return links, metadata
+
+
+def single_pass_parse(scraper, content):
+    metadata = scraper.new_metadata()
+    links = scraper.parse_download_page(content, metadata)
+    return links, metadata
+
+
+def time_per_page(func, scraper, pages, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for content in pages:
+            func(scraper, content)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / (rounds * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("fixtures", nargs="*")
+    args = parser.parse_args()
+
+    paths = args.fixtures or sorted(glob.glob(os.path.join(FIXTURE_DIR, "**", "*.html"), recursive=True))
+    if not paths:
+        print(f"No fixtures found in {FIXTURE_DIR}")
+        return 1
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+
+    scraper = PSScraper()
+    for content in pages:
+        if legacy_parse(scraper, content) != single_pass_parse(scraper, content):
+            print("WARNING: single-pass output differs from the legacy parser")
+            break
+
+    legacy_ms = time_per_page(legacy_parse, scraper, pages, args.rounds)
+    fast_ms = time_per_page(single_pass_parse, scraper, pages, args.rounds)
+    print(f"pages: {len(pages)}  rounds: {args.rounds}")
+    print(f"legacy (html.parser, two passes): {legacy_ms:.2f} ms/page")
+    print(f"single pass ({HTML_PARSER}): {fast_ms:.2f} ms/page")
+    print(f"speedup: {legacy_ms / fast_ms:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,75 @@
+"""Measure import cost and time-to-first-frame of app.py.
+
+Usage: python -m benchmarks.bench_startup [--target 1.0] [--top 15]
+
+Imports are measured with `python -X importtime` in a fresh interpreter. The
+first-frame time is taken in another fresh interpreter that builds the GUI and
+returns once Tk has painted the window (needs a display). Exits non-zero when
+time-to-first-frame exceeds the target.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_TARGET = 1.0
+
+FIRST_FRAME_SCRIPT = """
+import time
+start = time.perf_counter()
+import app
+gui = app.PKGScraperGUI()
+gui.root.update()
+print(time.perf_counter() - start)
+gui.root.destroy()
+"""
+
+
+def import_times():
+    """Return (total seconds, [(cumulative seconds, module)]) for `import app`."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app"],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        rows.append((int(parts[1]) / 1e6, parts[2].rstrip()))
+    # Top-level imports have a single space of indentation after the bar
+    total = sum(t for t, name in rows if not name.startswith("  "))
+    return total, rows
+
+
+def first_frame_time():
+    proc = subprocess.run([sys.executable, "-c", FIRST_FRAME_SCRIPT], cwd=REPO_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        return None, proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "unknown error"
+    return float(proc.stdout.strip().splitlines()[-1]), None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET, help="seconds to first frame")
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to list")
+    args = parser.parse_args()
+
+    total, rows = import_times()
+    print(f"import app: {total * 1000:.1f} ms")
+    for seconds, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {seconds * 1000:8.1f} ms  {name.strip()}")
+
+    frame, error = first_frame_time()
+    if frame is None:
+        print(f"time to first frame: unavailable ({error})")
+        return 0
+    print(f"time to first frame: {frame * 1000:.1f} ms (target {args.target * 1000:.0f} ms)")
+    return 0 if frame <= args.target else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
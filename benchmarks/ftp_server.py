@@ -0,0 +1,210 @@
+"""Minimal local FTP stand-in for upload benchmarks (passive mode, binary only).
+
+Usage: python -m benchmarks.ftp_server [--port 2121] [root_dir]
+"""
+import argparse
+import os
+import socket
+import socketserver
+import tempfile
+import threading
+
+USERNAME = "bench"
+PASSWORD = "bench"
+
+
+class FTPStandIn:
+    """Accepts any login and stores uploads under `root`.
+
+    `fail_after` bytes, when set, cuts the first data connection that reaches
+    it, so interrupted uploads and REST resume can be exercised.
+    """
+
+    def __init__(self, root=None, port=0, fail_after=None):
+        self._tmp = None
+        if root is None:
+            self._tmp = tempfile.TemporaryDirectory()
+            root = self._tmp.name
+        self.root = os.path.abspath(root)
+        self.fail_after = fail_after
+        self.bytes_received = 0
+        self.connections = 0
+        self.interrupted = 0
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(("127.0.0.1", port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def path(self, name):
+        return os.path.join(self.root, name.lstrip("/"))
+
+    def _take_failure(self):
+        with self._lock:
+            limit, self.fail_after = self.fail_after, None
+            if limit is not None:
+                self.interrupted += 1
+            return limit
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def reply(self, line):
+                self.wfile.write((line + "\r\n").encode())
+                self.wfile.flush()
+
+            def resolve(self, name):
+                target = name if name.startswith("/") else os.path.join(self.cwd, name)
+                return os.path.normpath("/" + target).replace("\\", "/")
+
+            def handle(self):
+                with server._lock:
+                    server.connections += 1
+                self.cwd = "/"
+                self.rest = 0
+                self.pasv = None
+                self.reply("220 benchmark stand-in ready")
+                try:
+                    for raw in self.rfile:
+                        line = raw.decode("utf-8", "replace").rstrip("\r\n")
+                        cmd, _, arg = line.partition(" ")
+                        handler = getattr(self, "ftp_" + cmd.upper(), None)
+                        if handler is None:
+                            self.reply("502 not implemented")
+                            continue
+                        if handler(arg) is False:
+                            break
+                except ConnectionError:
+                    # Clients drop connections after an interrupted transfer
+                    pass
+                if self.pasv:
+                    self.pasv.close()
+
+            def ftp_USER(self, arg):
+                self.reply("331 password required")
+
+            def ftp_PASS(self, arg):
+                self.reply("230 logged in")
+
+            def ftp_TYPE(self, arg):
+                self.reply("200 type set")
+
+            def ftp_NOOP(self, arg):
+                self.reply("200 ok")
+
+            def ftp_PWD(self, arg):
+                self.reply(f'257 "{self.cwd}"')
+
+            def ftp_CWD(self, arg):
+                target = self.resolve(arg)
+                if not os.path.isdir(server.path(target)):
+                    self.reply("550 no such directory")
+                    return
+                self.cwd = target
+                self.reply("250 ok")
+
+            def ftp_MKD(self, arg):
+                target = self.resolve(arg)
+                os.makedirs(server.path(target), exist_ok=True)
+                self.reply(f'257 "{target}" created')
+
+            def ftp_SIZE(self, arg):
+                path = server.path(self.resolve(arg))
+                if not os.path.isfile(path):
+                    self.reply("550 no such file")
+                    return
+                self.reply(f"213 {os.path.getsize(path)}")
+
+            def ftp_REST(self, arg):
+                self.rest = int(arg)
+                self.reply(f"350 restarting at {self.rest}")
+
+            def ftp_PASV(self, arg):
+                if self.pasv:
+                    self.pasv.close()
+                self.pasv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self.pasv.bind(("127.0.0.1", 0))
+                self.pasv.listen(1)
+                port = self.pasv.getsockname()[1]
+                self.reply(f"227 Entering Passive Mode (127,0,0,1,{port >> 8},{port & 0xFF})")
+
+            def ftp_STOR(self, arg):
+                if not self.pasv:
+                    self.reply("425 use PASV first")
+                    return
+                path = server.path(self.resolve(arg))
+                offset, self.rest = self.rest, 0
+                mode = "r+b" if offset and os.path.exists(path) else "wb"
+                self.reply("150 ok to send data")
+                conn, _ = self.pasv.accept()
+                self.pasv.close()
+                self.pasv = None
+                limit = server._take_failure() if server.fail_after is not None else None
+                received = 0
+                with conn, open(path, mode) as f:
+                    f.seek(offset)
+                    f.truncate()
+                    while True:
+                        chunk = conn.recv(1024 * 1024)
+                        if not chunk:
+                            break
+                        if limit is not None and received + len(chunk) >= limit:
+                            chunk = chunk[:limit - received]
+                            f.write(chunk)
+                            received += len(chunk)
+                            break
+                        f.write(chunk)
+                        received += len(chunk)
+                with server._lock:
+                    server.bytes_received += received
+                if limit is not None and received >= limit:
+                    self.reply("426 connection closed; transfer aborted")
+                    return
+                self.reply("226 transfer complete")
+
+            def ftp_QUIT(self, arg):
+                self.reply("221 bye")
+                return False
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=2121)
+    parser.add_argument("root", nargs="?", default=".")
+    args = parser.parse_args()
+
+    server = FTPStandIn(args.root, args.port)
+    print(f"Serving FTP uploads into {server.root} at 127.0.0.1:{server.port} (user {USERNAME}/{PASSWORD})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+
+
+if __name__ == "__main__":
+    main()
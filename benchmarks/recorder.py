@@ -0,0 +1,75 @@
+"""Record live search, game and download pages into a fixture corpus.
+
+Usage: python -m benchmarks.recorder [--out DIR] [--limit N] QUERY [QUERY ...]
+"""
+import argparse
+import hashlib
+import json
+import os
+
+from benchmarks.server import FIXTURE_DIR, MANIFEST_NAME, request_key
+from src.scraper import PSScraper
+
+
+class Recorder:
+    def __init__(self, out_dir=FIXTURE_DIR, scraper=None):
+        self.out_dir = out_dir
+        self.scraper = scraper or PSScraper()
+        self.manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+        self.pages = {}
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                self.pages = json.load(f).get("pages", {})
+
+    def record(self, url):
+        key = request_key(url)
+        if key in self.pages:
+            with open(os.path.join(self.out_dir, self.pages[key]), "rb") as f:
+                return f.read()
+        response = self.scraper._fetch(url)
+        response.raise_for_status()
+        name = os.path.join("pages", hashlib.sha1(key.encode()).hexdigest()[:16] + ".html")
+        os.makedirs(os.path.join(self.out_dir, "pages"), exist_ok=True)
+        with open(os.path.join(self.out_dir, name), "wb") as f:
+            f.write(response.content)
+        self.pages[key] = name
+        return response.content
+
+    def record_query(self, query, limit=None):
+        content = self.record(self.scraper.search_url(query))
+        games = self.scraper.parse_search_results(content)[:limit]
+        for game in games:
+            try:
+                page = self.record(game["url"])
+                _, _, dl_url = self.scraper.parse_game_page(page, self.scraper.new_metadata())
+                if dl_url:
+                    self.record(dl_url)
+            except Exception as e:
+                print(f"[WARNING] Skipping {game['url']}: {e}")
+        return len(games)
+
+    def save(self):
+        os.makedirs(self.out_dir, exist_ok=True)
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"base_url": self.scraper.base_url, "pages": self.pages}, f, indent=4, sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--out", default=FIXTURE_DIR)
+    parser.add_argument("--limit", type=int, default=None, help="games to record per query")
+    parser.add_argument("queries", nargs="+")
+    args = parser.parse_args()
+
+    recorder = Recorder(args.out)
+    try:
+        for query in args.queries:
+            count = recorder.record_query(query, args.limit)
+            print(f"{query}: {count} games")
+    finally:
+        recorder.save()
+    print(f"{len(recorder.pages)} pages in {recorder.manifest_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""Offline benchmark suite for the scraper and cache hot paths.
+
+Usage: python -m benchmarks.run [--sizes 1000,10000,100000] [--json OUT] [--baseline FILE]
+
+Everything runs against benchmarks/fixtures through the local replay server;
+nothing touches the live site.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.server import FIXTURE_DIR, ReplayServer
+from src.database import GameCache, JsonCacheBackend, SQLiteCacheBackend
+from src.http_cache import HTTPCache
+from src.scraper import PSScraper
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SEARCH_QUERY = "gran turismo"
+REGRESSION_TOLERANCE = 1.25
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def bench_crawl(fixture_dir, query):
+    """Crawl once cold, then again revalidating everything through the HTTP cache."""
+    results = {}
+    with ReplayServer(fixture_dir) as server, tempfile.TemporaryDirectory() as tmp:
+        http_cache = HTTPCache(os.path.join(tmp, "http_cache.db"))
+        for label in ("cold", "revalidated"):
+            scraper = PSScraper()
+            scraper.base_url = server.base_url
+            scraper.http_cache = http_cache
+            served = server.requests_served
+            start = time.perf_counter()
+            games = scraper.search_games(query)
+            scraper.get_many_game_links(games)
+            elapsed = time.perf_counter() - start
+            pages = server.requests_served - served
+            results[label] = {
+                "games": len(games),
+                "pages": pages,
+                "seconds": round(elapsed, 4),
+                "pages_per_sec": round(pages / elapsed, 2) if elapsed else 0.0,
+            }
+        results["http_cache"] = http_cache.stats()
+        http_cache.close()
+    return results
+
+
+def bench_parse(fixture_dir, rounds=10):
+    scraper = PSScraper()
+    pages = []
+    for path in sorted(glob.glob(os.path.join(fixture_dir, "**", "*.html"), recursive=True)):
+        with open(path, "rb") as f:
+            pages.append(f.read())
+    if not pages:
+        return {}
+
+    def per_page(func):
+        start = time.perf_counter()
+        for _ in range(rounds):
+            for content in pages:
+                func(content)
+        return round((time.perf_counter() - start) * 1000 / (rounds * len(pages)), 3)
+
+    return {
+        "search_ms": per_page(scraper.parse_search_results),
+        "game_page_ms": per_page(lambda c: scraper.parse_game_page(c, scraper.new_metadata())),
+        "download_page_ms": per_page(lambda c: scraper.parse_download_page(c, scraper.new_metadata())),
+    }
+
+
+def sample_entry(i, links):
+    return {
+        "url": f"https://www.superpsx.com/game-{i}/",
+        "title": f"Game {i}",
+        "size": "42 GB",
+        "downloads": "N/A",
+        "links": links,
+        "metadata": {
+            "size": "42 GB", "version": f"v1.{i % 100:02d}", "region": "USA",
+            "password": "N/A", "firmware": "N/A", "voice": "N/A",
+            "subtitles": "N/A", "cusa": f"CUSA{i % 100000:05d}",
+        },
+        "timestamp": time.time(),
+    }
+
+
+def bench_cache(sizes, save_samples=20):
+    links = [{"group": "v1.00", "label": f"Part {p}", "url": f"https://1fichier.com/?{p:08x}"} for p in range(12)]
+    results = []
+    for size in sizes:
+        for name, backend_class, suffix in (("json", JsonCacheBackend, ".json"), ("sqlite", SQLiteCacheBackend, ".db")):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "cache" + suffix)
+                seed = backend_class(path)
+                seed.load()
+                seed.upsert_many([(e["url"], e) for e in (sample_entry(i, links) for i in range(size))])
+                seed.close()
+
+                cache = GameCache(backend_class(path))
+                start = time.perf_counter()
+                cache.load()
+                cache.get(sample_entry(size // 2, links)["url"])
+                load_ms = (time.perf_counter() - start) * 1000
+
+                samples = save_samples if name == "sqlite" else max(1, save_samples // 10)
+                start = time.perf_counter()
+                for i in range(samples):
+                    entry = sample_entry(size + i, links)
+                    cache.save({"url": entry["url"], "title": entry["title"]}, links, entry["metadata"])
+                save_ms = (time.perf_counter() - start) * 1000 / samples
+                cache.backend.close()
+
+            results.append({"backend": name, "entries": size, "load_ms": round(load_ms, 2), "save_ms": round(save_ms, 3)})
+    return results
+
+
+def compare(current, baseline):
+    """Return the timings that got slower than the baseline by more than the tolerance."""
+    regressions = []
+    checks = [("parse", k) for k in current.get("parse", {})]
+    for section, key in checks:
+        old = baseline.get(section, {}).get(key)
+        new = current[section][key]
+        if old and new > old * REGRESSION_TOLERANCE:
+            regressions.append(f"{section}.{key}: {old} -> {new}")
+    for label in ("cold", "revalidated"):
+        old_rate = baseline.get("crawl", {}).get(label, {}).get("pages_per_sec")
+        new_rate = current["crawl"][label]["pages_per_sec"]
+        if old_rate and new_rate * REGRESSION_TOLERANCE < old_rate:
+            regressions.append(f"crawl.{label}.pages_per_sec: {old_rate} -> {new_rate}")
+    old_cache = {(r["backend"], r["entries"]): r for r in baseline.get("cache", [])}
+    for row in current["cache"]:
+        old = old_cache.get((row["backend"], row["entries"]))
+        if not old:
+            continue
+        for key in ("load_ms", "save_ms"):
+            if old[key] and row[key] > old[key] * REGRESSION_TOLERANCE:
+                regressions.append(f"cache.{row['backend']}.{row['entries']}.{key}: {old[key]} -> {row[key]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--query", default=SEARCH_QUERY)
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--json", dest="json_out", help="write results to this file")
+    parser.add_argument("--baseline", help="fail if slower than this earlier --json output")
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    results = {
+        "crawl": bench_crawl(args.fixtures, args.query),
+        "parse": bench_parse(args.fixtures),
+        "cache": bench_cache(sizes),
+    }
+    results["peak_rss_mb"] = peak_rss_mb()
+
+    for label in ("cold", "revalidated"):
+        crawl = results["crawl"][label]
+        print(f"crawl ({label}): {crawl['pages']} pages for {crawl['games']} games in {crawl['seconds']}s ({crawl['pages_per_sec']} pages/sec)")
+    print(f"http cache: {results['crawl']['http_cache']}")
+    for key, value in results["parse"].items():
+        print(f"parse {key}: {value}")
+    print(f"{'backend':<8} {'entries':>8} {'load ms':>10} {'save ms':>10}")
+    for row in results["cache"]:
+        print(f"{row['backend']:<8} {row['entries']:>8} {row['load_ms']:>10} {row['save_ms']:>10}")
+    if results["peak_rss_mb"] is not None:
+        print(f"peak RSS: {results['peak_rss_mb']:.1f} MB")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare(results, json.load(f))
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,314 @@
+"""Local stand-in for the scraped site that replays recorded pages.
+
+Usage: python -m benchmarks.server [--port 8765] [fixture_dir]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURE_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+MANIFEST_NAME = "manifest.json"
+
+
+def load_manifest(fixture_dir):
+    """Return (original base URL, {path?query: fixture file})."""
+    with open(os.path.join(fixture_dir, MANIFEST_NAME), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    return manifest["base_url"], manifest["pages"]
+
+
+def request_key(url):
+    parts = urllib.parse.urlsplit(url)
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query)))
+    return f"{parts.path or '/'}?{query}" if query else (parts.path or "/")
+
+
+class ReplayServer:
+    """Serves fixture pages on localhost, rewriting the recorded site URL to its own."""
+
+    def __init__(self, fixture_dir=FIXTURE_DIR, port=0):
+        self.fixture_dir = fixture_dir
+        self.original_base, self.pages = load_manifest(fixture_dir)
+        self.requests_served = 0
+        self.bytes_served = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+        self._bodies = {}
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/"
+
+    def _body(self, key):
+        body = self._bodies.get(key)
+        if body is None:
+            name = self.pages.get(key)
+            if name is None:
+                return None
+            with open(os.path.join(self.fixture_dir, name), "rb") as f:
+                body = f.read().replace(self.original_base.encode(), self.base_url.encode())
+            self._bodies[key] = body
+        return body
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                body = server._body(request_key(self.path))
+                if body is None:
+                    self.send_error(404)
+                    return
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    with server._lock:
+                        server.requests_served += 1
+                        server.not_modified += 1
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=UTF-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.requests_served += 1
+                    server.bytes_served += len(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class RangeFileServer:
+    """Serves one local file over HTTP with Range support, like a debrid download host.
+
+    `rate_mbps` caps each connection, the way file hosts throttle single streams.
+    """
+
+    def __init__(self, path, rate_mbps=None):
+        self.path = path
+        self.rate_mbps = rate_mbps
+        self.bytes_served = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                size = os.path.getsize(server.path)
+                start, end = 0, size - 1
+                match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                if match:
+                    start = int(match.group(1))
+                    if match.group(2):
+                        end = min(int(match.group(2)), size - 1)
+                    if start >= size:
+                        self.send_response(416)
+                        self.send_header("Content-Range", f"bytes */{size}")
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+                else:
+                    self.send_response(200)
+                self.send_header("Accept-Ranges", "bytes")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.send_header("Content-Disposition", f'attachment; filename="{os.path.basename(server.path)}"')
+                self.end_headers()
+                with server._lock:
+                    server.connections += 1
+                block_size = 64 * 1024
+                delay = block_size / (server.rate_mbps * 1024 * 1024) if server.rate_mbps else 0
+                remaining = end - start + 1
+                with open(server.path, "rb") as f:
+                    f.seek(start)
+                    try:
+                        while remaining > 0:
+                            block = f.read(min(block_size, remaining))
+                            if not block:
+                                break
+                            self.wfile.write(block)
+                            remaining -= len(block)
+                            with server._lock:
+                                server.bytes_served += len(block)
+                            if delay:
+                                time.sleep(delay)
+                    except ConnectionError:
+                        self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/download"
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+class MirrorServer:
+    """Stand-in file hoster plus Real-Debrid's /unrestrict/check, for link liveness checks.
+
+    The first path segment decides the answer: /file/... is a live file
+    (size from ?size=), /gone/... is 404, /nohead/... refuses HEAD but
+    serves ranged GETs, /removed/... is a 200 HTML landing page for a file
+    that no longer exists (only Real-Debrid can tell), /busy/... is 503.
+    `latency` seconds are added to every request, like a remote hoster.
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.requests = {"HEAD": 0, "GET": 0, "CHECK": 0}
+        self._lock = threading.Lock()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _count(self, kind):
+                with server._lock:
+                    server.requests[kind] += 1
+                if server.latency:
+                    time.sleep(server.latency)
+
+            def _reply(self, status, headers=(), body=b""):
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if body and self.command != "HEAD":
+                    self.wfile.write(body)
+
+            def _answer(self, path, ranged):
+                kind = path.strip("/").split("/")[0]
+                query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+                size = int(query.get("size", ["1048576"])[0])
+                if kind == "gone":
+                    return self._reply(404, [("Content-Type", "text/html")], b"<h1>File not found</h1>")
+                if kind == "busy":
+                    return self._reply(503, [("Content-Type", "text/html")], b"<h1>Try again later</h1>")
+                if kind == "removed":
+                    return self._reply(200, [("Content-Type", "text/html")], b"<h1>This file was deleted</h1>")
+                if kind == "nohead" and self.command == "HEAD":
+                    return self._reply(405, [("Allow", "GET")])
+                if kind not in ("file", "nohead"):
+                    return self._reply(404)
+                if ranged:
+                    return self._reply(206, [("Content-Type", "application/octet-stream"),
+                                             ("Content-Range", f"bytes 0-0/{size}")], b"\0")
+                # HEAD only: a GET without Range would stream the whole file
+                self.send_response(200)
+                self.send_header("Content-Type", "application/octet-stream")
+                self.send_header("Content-Length", str(size))
+                self.end_headers()
+
+            def do_HEAD(self):
+                self._count("HEAD")
+                self._answer(urllib.parse.urlsplit(self.path).path, False)
+
+            def do_GET(self):
+                self._count("GET")
+                self._answer(urllib.parse.urlsplit(self.path).path, bool(self.headers.get("Range")))
+
+            def do_POST(self):
+                if urllib.parse.urlsplit(self.path).path != "/rest/1.0/unrestrict/check":
+                    return self._reply(404)
+                self._count("CHECK")
+                length = int(self.headers.get("Content-Length", 0))
+                link = urllib.parse.parse_qs(self.rfile.read(length).decode()).get("link", [""])[0]
+                parts = urllib.parse.urlsplit(link)
+                kind = parts.path.strip("/").split("/")[0]
+                if kind in ("gone", "removed"):
+                    body = json.dumps({"error": "file_unavailable", "error_code": 19}).encode()
+                    return self._reply(503, [("Content-Type", "application/json")], body)
+                size = int(urllib.parse.parse_qs(parts.query).get("size", ["1048576"])[0])
+                body = json.dumps({"host": parts.netloc, "link": link, "filename": parts.path.rsplit("/", 1)[-1],
+                                   "filesize": size, "supported": 1}).encode()
+                self._reply(200, [("Content-Type", "application/json")], body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    @property
+    def rd_url(self):
+        """Value for RealDebridAPI.base_url."""
+        return self.base_url + "/rest/1.0"
+
+    def __enter__(self):
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("fixture_dir", nargs="?", default=FIXTURE_DIR)
+    args = parser.parse_args()
+
+    server = ReplayServer(args.fixture_dir, args.port)
+    print(f"Replaying {len(server.pages)} pages from {args.fixture_dir} at {server.base_url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
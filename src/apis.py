@@ -1,13 +1,178 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from src.metrics import metrics
+from src.unrestrict_cache import UnrestrictCache
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_WORKERS = 4
+# Real-Debrid allows 250 requests per minute per token
+DEFAULT_RATE_PER_MINUTE = 250
+DEFAULT_MAX_RETRIES = 4
+RETRY_STATUSES = (429, 502, 503, 504)
+# Longest pause between retries, including server-requested Retry-After delays
+MAX_RETRY_DELAY = 30.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a request may be sent."""
+
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst or max(1, int(rate_per_minute / 10))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def shared_limiter(api_key, rate_per_minute):
+    # Every RealDebridAPI for the same token draws from one bucket
+    with _limiters_lock:
+        limiter = _limiters.get(api_key)
+        if limiter is None:
+            limiter = _limiters[api_key] = TokenBucket(rate_per_minute)
+        return limiter
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def shared_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = UnrestrictCache()
+        return _cache
+
 
 class RealDebridAPI:
-    def __init__(self, api_key):
+    def __init__(self, api_key, timeout=None, max_workers=None, rate_per_minute=None, max_retries=None, cache=None):
+        apis_cfg = getattr(cfg, "apis", {}) if cfg else {}
         self.api_key = api_key
         self.base_url = "https://api.real-debrid.com/rest/1.0"
+        self.timeout = timeout or apis_cfg.get("timeout", DEFAULT_TIMEOUT)
+        self.max_workers = max_workers or apis_cfg.get("rd_max_workers", DEFAULT_MAX_WORKERS)
+        self.max_retries = max_retries if max_retries is not None else apis_cfg.get("max_retries", DEFAULT_MAX_RETRIES)
+        self.limiter = shared_limiter(api_key, rate_per_minute or apis_cfg.get("rd_rate_per_minute", DEFAULT_RATE_PER_MINUTE))
+        if cache is None and apis_cfg.get("unrestrict_cache", True):
+            cache = shared_cache()
+        self.cache = cache or None
+
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {api_key}"
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(self.max_workers, 1))
+        self.session.mount("https://", adapter)
+
+    def _retry_delay(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after:
+            try:
+                return min(MAX_RETRY_DELAY, max(0.0, float(retry_after)))
+            except ValueError:
+                pass
+        return min(MAX_RETRY_DELAY, (2 ** attempt) + random.uniform(0, 1))
+
+    def _post(self, path, data, retry_statuses=RETRY_STATUSES):
+        url = f"{self.base_url}{path}"
+        attempt = 0
+        while True:
+            self.limiter.acquire()
+            try:
+                response = self.session.post(url, data=data, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+                metrics.inc("rd_retries_total", reason="connection")
+                time.sleep(self._retry_delay(attempt))
+                attempt += 1
+                continue
+            if response.status_code in retry_statuses and attempt < self.max_retries:
+                metrics.inc("rd_retries_total", reason=str(response.status_code))
+                time.sleep(self._retry_delay(attempt, response))
+                attempt += 1
+                continue
+            return response
+
+    def unrestrict_link(self, link, use_cache=True):
+        if self.cache and use_cache:
+            cached = self.cache.get(link)
+            if cached:
+                cached["cached"] = True
+                metrics.inc("rd_unrestrict_total", result="cached")
+                return cached
+        with metrics.timer("rd_unrestrict_seconds"):
+            result = self._post("/unrestrict/link", {"link": link}).json()
+        metrics.inc("rd_unrestrict_total", result="ok" if "download" in result else "error")
+        if self.cache and "download" in result:
+            self.cache.put(link, result)
+        return result
+
+    def check_link(self, link):
+        """Ask whether a hoster link is downloadable without unrestricting it.
+
+        Returns the check result ({"host", "link", "filename", "filesize", "supported"})
+        or {"error", "status"}; status 503 means the file is gone.
+        """
+        # 503 is the endpoint's "file unavailable" answer here, not a transient error
+        with metrics.timer("rd_check_seconds"):
+            response = self._post("/unrestrict/check", {"link": link}, retry_statuses=(429, 502, 504))
+        if response.status_code == 200:
+            return response.json()
+        try:
+            error = response.json().get("error")
+        except ValueError:
+            error = None
+        return {"error": error or f"HTTP {response.status_code}", "status": response.status_code}
+
+    def unrestrict_links(self, links, max_workers=None, callback=None):
+        """Unrestrict many links concurrently.
+
+        Returns one dict per input link, in order: {"link", "ok", "download", "result"}
+        or {"link", "ok": False, "error"}. `callback(index, item)` runs as each finishes.
+        """
+        def run(index, link):
+            try:
+                result = self.unrestrict_link(link)
+                item = {"link": link, "ok": "download" in result, "download": result.get("download"), "result": result}
+            except Exception as e:
+                item = {"link": link, "ok": False, "error": str(e)}
+            if callback:
+                try:
+                    callback(index, item)
+                except Exception:
+                    pass
+            return item
 
-    def unrestrict_link(self, link):
-        url = f"{self.base_url}/unrestrict/link"
-        headers = {"Authorization": f"Bearer {self.api_key}"}
-        data = {"link": link}
-        response = requests.post(url, headers=headers, data=data)
-        return response.json()
\ No newline at end of file
+        links = list(links)
+        if not links:
+            return []
+        workers = max(1, min(max_workers or self.max_workers, len(links)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(run, range(len(links)), links))
@@ -0,0 +1,144 @@
+import asyncio
+
+import aiohttp
+
+from src.scraper import PSScraper
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_PER_HOST_LIMIT = 4
+DEFAULT_KEEPALIVE = 30
+
+
+class AsyncPSScraper:
+    """Event-loop counterpart of PSScraper with the same search/detail contracts.
+
+    All requests share one keep-alive connection pool. Identical URLs requested
+    while a fetch is already in flight wait on that fetch instead of issuing a
+    second request. Parsing reuses PSScraper and runs in the loop's executor.
+    """
+
+    def __init__(self, max_connections=None, per_host_limit=None):
+        scraper_cfg = getattr(cfg, "scraper", {}) if cfg else {}
+        self.parser = PSScraper()
+        self.base_url = self.parser.base_url
+        self.timeout = self.parser.timeout
+        self.max_connections = max_connections or scraper_cfg.get("max_connections", DEFAULT_MAX_CONNECTIONS)
+        self.per_host_limit = per_host_limit or scraper_cfg.get("per_host_limit", DEFAULT_PER_HOST_LIMIT)
+        self._session = None
+        self._session_lock = None
+        self._inflight = {}
+
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _get_session(self):
+        if self._session is not None:
+            return self._session
+        if self._session_lock is None:
+            self._session_lock = asyncio.Lock()
+        async with self._session_lock:
+            if self._session is None:
+                # Let cloudscraper clear the Cloudflare challenge once, then reuse
+                # its cookies and user agent for every pooled request.
+                loop = asyncio.get_running_loop()
+                cookies, headers = await loop.run_in_executor(None, self._borrow_clearance)
+                connector = aiohttp.TCPConnector(
+                    limit=self.max_connections,
+                    limit_per_host=self.per_host_limit,
+                    keepalive_timeout=DEFAULT_KEEPALIVE,
+                    ttl_dns_cache=300,
+                )
+                self._session = aiohttp.ClientSession(
+                    connector=connector,
+                    cookies=cookies,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                )
+        return self._session
+
+    def _borrow_clearance(self):
+        session = self.parser.scraper
+        try:
+            session.get(self.base_url, timeout=self.timeout)
+        except Exception:
+            pass
+        headers = {"User-Agent": session.headers.get("User-Agent", "")}
+        return session.cookies.get_dict(), headers
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _download(self, url):
+        session = await self._get_session()
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.read()
+
+    async def fetch(self, url):
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._download(url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _t, u=url: self._inflight.pop(u, None))
+        # Shield so one cancelled waiter does not cancel the fetch for the others.
+        return await asyncio.shield(task)
+
+    async def _parse(self, func, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, func, *args)
+
+    async def search_games(self, query):
+        try:
+            content = await self.fetch(self.parser.search_url(query))
+            return await self._parse(self.parser.parse_search_results, content)
+        except Exception:
+            return []
+
+    async def get_game_links(self, game_url, current_size="N/A"):
+        metadata = self.parser.new_metadata(current_size)
+
+        try:
+            content = await self.fetch(game_url)
+            soup, page_links, dl_url = await self._parse(self.parser.parse_game_page, content, metadata)
+
+            if dl_url:
+                try:
+                    dl_content = await self.fetch(dl_url)
+                    final_links = await self._parse(self.parser.parse_download_page, dl_content, metadata)
+
+                    if final_links:
+                        return final_links, metadata
+                except Exception:
+                    pass
+
+            return page_links or await self._parse(self.parser._raw_link_groups, soup), metadata
+        except Exception:
+            return [], metadata
+
+    async def get_many_game_links(self, games, callback=None):
+        """Async counterpart of PSScraper.get_many_game_links; concurrency is bounded by the pool."""
+        items = [{"url": g, "size": "N/A"} if isinstance(g, str) else g for g in games]
+        results = {}
+
+        async def run(game):
+            links, metadata = await self.get_game_links(game["url"], game.get("size", "N/A"))
+            results[game["url"]] = (links, metadata)
+            if callback:
+                try:
+                    callback(game, links, metadata)
+                except Exception:
+                    pass
+
+        await asyncio.gather(*(run(game) for game in items))
+        return results
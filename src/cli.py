@@ -0,0 +1,384 @@
+"""Headless entry point: python -m src.cli [--metrics FILE] [--profile FILE] {search,crawl,mirror,refresh,resolve,send,check} ...
+
+Every result is written to stdout as one JSON object per line; progress and
+errors go to stderr. Nothing here imports tkinter.
+"""
+import argparse
+import json
+import os
+import sys
+
+from src.config import cfg
+from src.database import GameCache
+from src.metrics import metrics, profile
+from src.scraper import PSScraper
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_PARTIAL = 4
+
+
+def emit(record):
+    sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.stdout.flush()
+
+
+def log(message):
+    print(message, file=sys.stderr)
+
+
+def write_report(path, text):
+    # stdout carries the JSON records, so "-" means stderr
+    if path == "-":
+        sys.stderr.write(text)
+        return
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+
+
+def game_record(game, links, metadata, source):
+    return {
+        "type": "game",
+        "source": source,
+        "url": game["url"],
+        "title": game.get("title"),
+        "metadata": metadata,
+        "links": links,
+    }
+
+
+class Crawler:
+    """Pages through queries or the catalogue and resolves game details into GameCache."""
+
+    def __init__(self, scraper, db, workers=None, refresh=False):
+        self.scraper = scraper
+        self.db = db
+        self.workers = workers
+        self.refresh = refresh
+        self.resolved = 0
+        self.failed = 0
+
+    def _resolve_page(self, games):
+        pending = []
+        for game in games:
+            cached = None if self.refresh else self.db.get(game["url"])
+            if cached:
+                self.resolved += 1
+                emit(game_record(game, cached["links"], cached["metadata"], "cache"))
+            else:
+                pending.append(game)
+
+        def on_result(game, links, metadata):
+            if links:
+                game["size"] = metadata.get("size", "N/A")
+                self.db.save(game, links, metadata)
+                self.resolved += 1
+            else:
+                self.failed += 1
+            emit(game_record(game, links, metadata, "live"))
+
+        self.scraper.get_many_game_links(pending, max_workers=self.workers, callback=on_result)
+
+    def crawl(self, fetch_page, start_page=1, max_pages=None, details=True):
+        page = start_page
+        seen = 0
+        while max_pages is None or page < start_page + max_pages:
+            games = fetch_page(page)
+            if not games:
+                break
+            seen += len(games)
+            log(f"page {page}: {len(games)} games")
+            if details:
+                self._resolve_page(games)
+            else:
+                for game in games:
+                    emit(dict(game, type="result"))
+            page += 1
+        return seen
+
+
+def cmd_search(args, scraper, db):
+    crawler = Crawler(scraper, db, workers=args.workers, refresh=args.refresh)
+    seen = crawler.crawl(lambda page: scraper.search_games(args.query, page),
+                         max_pages=args.pages, details=args.details)
+    if not seen:
+        return EXIT_ERROR
+    return EXIT_PARTIAL if crawler.failed else EXIT_OK
+
+
+def cmd_crawl(args, scraper, db):
+    queries = list(args.query or [])
+    if args.queries_file:
+        with open(args.queries_file, "r", encoding="utf-8") as f:
+            queries.extend(line.strip() for line in f if line.strip())
+    if not queries and not args.catalogue:
+        log("Nothing to crawl: pass --query, --queries-file or --catalogue")
+        return EXIT_ERROR
+
+    crawler = Crawler(scraper, db, workers=args.workers, refresh=args.refresh)
+    seen = 0
+    for query in queries:
+        log(f"crawling query {query!r}")
+        seen += crawler.crawl(lambda page, q=query: scraper.search_games(q, page),
+                              start_page=args.start_page, max_pages=args.max_pages)
+    if args.catalogue:
+        log("crawling catalogue")
+        seen += crawler.crawl(scraper.list_games, start_page=args.start_page, max_pages=args.max_pages)
+
+    log(f"done: {seen} games listed, {crawler.resolved} resolved, {crawler.failed} without links")
+    if scraper.http_cache is not None:
+        log(f"http cache: {scraper.http_cache.stats()}")
+    if not seen:
+        return EXIT_ERROR
+    return EXIT_PARTIAL if crawler.failed else EXIT_OK
+
+
+def rd_api_key(args):
+    api_key = args.api_key or os.environ.get("RD_API_KEY") or cfg.apis.get("real_debrid_api_key", "")
+    if not api_key:
+        log("Real Debrid API key not set (use --api-key, RD_API_KEY or settings.json)")
+    return api_key
+
+
+def read_links(args):
+    links = list(args.links)
+    if not links or links == ["-"]:
+        links = [line.strip() for line in sys.stdin if line.strip()]
+    return links
+
+
+def cmd_mirror(args, scraper, db):
+    from src.crawler import CHANGED, NEW, CrawlState, IncrementalCrawler
+
+    state = CrawlState()
+    try:
+        if args.runs:
+            for run in state.runs(args.runs):
+                emit(dict(run, type="run"))
+            return EXIT_OK
+
+        def on_game(game, status, links, metadata):
+            if status in (NEW, CHANGED):
+                emit(dict(game_record(game, links, metadata, "live"), change=status))
+
+        crawler = IncrementalCrawler(scraper, db, state, workers=args.workers, max_pages=args.max_pages,
+                                     processes=args.processes)
+        report = crawler.run(resume=not args.restart, force=args.force or args.refresh, on_game=on_game, log=log)
+    finally:
+        state.close()
+    emit(dict(report, type="mirror"))
+    log(f"run {report['run']}{' (resumed)' if report['resumed'] else ''}: {report['pages']} pages, "
+        f"{report['new']} new, {report['changed']} changed, {report['unchanged']} unchanged, "
+        f"{report['failed']} failed in {report['seconds']}s")
+    if not report["pages"]:
+        return EXIT_ERROR
+    return EXIT_PARTIAL if report["failed"] or report.get("error") else EXIT_OK
+
+
+def cmd_resolve(args, scraper, db):
+    from src.apis import RealDebridAPI
+
+    api_key = rd_api_key(args)
+    if not api_key:
+        return EXIT_ERROR
+
+    links = read_links(args)
+
+    rd = RealDebridAPI(api_key, max_workers=args.workers)
+    results = rd.unrestrict_links(links)
+    failed = 0
+    for item in results:
+        result = item.get("result", {"error": item.get("error")})
+        failed += 0 if item["ok"] else 1
+        emit({"type": "unrestrict", "link": item["link"], "ok": item["ok"], "result": result})
+
+    if failed == len(links):
+        return EXIT_ERROR
+    return EXIT_PARTIAL if failed else EXIT_OK
+
+
+def cmd_send(args, scraper, db):
+    from src.ftp_transfer import FTPUploader
+    from src.pipeline import StreamTransfer
+
+    ftp_config = cfg.ftp
+    if not ftp_config.get("host"):
+        log("FTP host not configured in settings.json")
+        return EXIT_ERROR
+
+    links = read_links(args)
+    if args.unrestrict:
+        from src.apis import RealDebridAPI
+
+        api_key = rd_api_key(args)
+        if not api_key:
+            return EXIT_ERROR
+        urls = [(item["link"], item.get("download")) for item in RealDebridAPI(api_key).unrestrict_links(links)]
+    else:
+        urls = [(link, link) for link in links]
+
+    uploader = FTPUploader.from_config(ftp_config)
+    transfer = StreamTransfer(uploader)
+    failed = 0
+    try:
+        for link, url in urls:
+            if not url:
+                failed += 1
+                emit({"type": "send", "link": link, "ok": False, "error": "unrestrict failed"})
+                continue
+            result = transfer.send(url, args.remote_dir, tee_dir=args.tee_dir, resume=args.resume,
+                                   progress=(lambda p: log(str(p))) if args.progress else None)
+            failed += 0 if result["ok"] else 1
+            emit(dict(result, type="send", link=link))
+    finally:
+        uploader.close()
+
+    if failed == len(urls):
+        return EXIT_ERROR
+    return EXIT_PARTIAL if failed else EXIT_OK
+
+
+def cmd_check(args, scraper, db):
+    from src.liveness import ALIVE, DEAD, UNKNOWN, LinkChecker
+
+    rd = None
+    if args.real_debrid:
+        from src.apis import RealDebridAPI
+
+        api_key = rd_api_key(args)
+        if not api_key:
+            return EXIT_ERROR
+        rd = RealDebridAPI(api_key)
+    checker = LinkChecker(db, rd=rd, workers=args.workers)
+    force = args.force or args.refresh
+
+    def on_game(game, statuses):
+        states = [status["state"] for status in statuses.values()]
+        emit({"type": "liveness", "url": game["url"], "title": game.get("title"),
+              "alive": states.count(ALIVE), "dead": states.count(DEAD), "unknown": states.count(UNKNOWN),
+              "links": list(statuses.values())})
+
+    if args.catalogue:
+        counts = checker.check_catalogue(limit=args.limit, force=force, on_game=on_game)
+    else:
+        counts = {"games": 0, "links": 0, ALIVE: 0, DEAD: 0, UNKNOWN: 0}
+        for url in read_links(args):
+            cached = db.get(url, allow_stale=True)
+            if cached:
+                game, links = {"url": url, "title": cached.get("title")}, cached["links"]
+            else:
+                game = {"url": url, "title": None}
+                links, _ = scraper.get_game_links(url)
+            statuses = checker.check_game(links, force=force)
+            on_game(game, statuses)
+            counts["games"] += 1
+            counts["links"] += len(statuses)
+            for status in statuses.values():
+                counts[status["state"]] += 1
+
+    emit(dict(counts, type="check"))
+    log(f"{counts['games']} games, {counts['links']} links: {counts[ALIVE]} alive, "
+        f"{counts[DEAD]} dead, {counts[UNKNOWN]} unknown")
+    if not counts["games"]:
+        return EXIT_ERROR
+    return EXIT_PARTIAL if counts[UNKNOWN] else EXIT_OK
+
+
+def cmd_refresh(args, scraper, db):
+    from src.refresher import CacheRefresher
+
+    refresher = CacheRefresher(db, scraper, rate_per_minute=args.rate)
+    refreshed = refresher.sweep(limit=args.limit, ignore_window=args.now)
+    log(f"refreshed {refreshed} entries")
+    return EXIT_OK
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Headless PKG scraper.")
+    parser.add_argument("--base-url", help="override scraper.base_url (e.g. the benchmark replay server)")
+    parser.add_argument("--workers", type=int, default=None, help="parallel detail fetches")
+    parser.add_argument("--refresh", action="store_true", help="ignore cached entries")
+    parser.add_argument("--metrics", metavar="FILE", help="write timers and counters here when done (- for stderr)")
+    parser.add_argument("--metrics-format", choices=("prometheus", "json"), default="prometheus")
+    parser.add_argument("--profile", metavar="FILE", help="run the command under cProfile and write the stats here")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    search = sub.add_parser("search", help="search the site and print results")
+    search.add_argument("query")
+    search.add_argument("--pages", type=int, default=1, help="result pages to read")
+    search.add_argument("--details", action="store_true", help="also resolve links and metadata")
+    search.set_defaults(func=cmd_search)
+
+    crawl = sub.add_parser("crawl", help="resolve every game for a list of queries or the catalogue")
+    crawl.add_argument("--query", action="append", help="may be given several times")
+    crawl.add_argument("--queries-file", help="file with one query per line")
+    crawl.add_argument("--catalogue", action="store_true", help="walk the paginated catalogue")
+    crawl.add_argument("--start-page", type=int, default=1)
+    crawl.add_argument("--max-pages", type=int, default=None)
+    crawl.set_defaults(func=cmd_crawl)
+
+    mirror = sub.add_parser("mirror", help="incrementally mirror the whole catalogue into the cache")
+    mirror.add_argument("--max-pages", type=int, default=None, help="listing pages per run")
+    mirror.add_argument("--restart", action="store_true", help="start over instead of resuming an interrupted run")
+    mirror.add_argument("--force", action="store_true", help="re-parse games even when their fingerprint is unchanged")
+    mirror.add_argument("--runs", type=int, metavar="N", help="print the last N runs and exit")
+    mirror.add_argument("--processes", type=int, default=None, metavar="N",
+                        help="fetch and parse in N worker processes instead of threads (0 for threads)")
+    mirror.set_defaults(func=cmd_mirror)
+
+    refresh = sub.add_parser("refresh", help="re-scrape cached games that are stale or close to expiry")
+    refresh.add_argument("--limit", type=int, default=100)
+    refresh.add_argument("--rate", type=float, default=None, help="refreshes per minute")
+    refresh.add_argument("--now", action="store_true", help="run even outside database.refresh_window")
+    refresh.set_defaults(func=cmd_refresh)
+
+    resolve = sub.add_parser("resolve", help="unrestrict hoster links through Real-Debrid")
+    resolve.add_argument("links", nargs="*", help="links to unrestrict, or - to read stdin")
+    resolve.add_argument("--api-key")
+    resolve.set_defaults(func=cmd_resolve)
+
+    send = sub.add_parser("send", help="stream downloads straight to the configured FTP server")
+    send.add_argument("links", nargs="*", help="download URLs, or - to read stdin")
+    send.add_argument("--unrestrict", action="store_true", help="treat links as hoster links and unrestrict them first")
+    send.add_argument("--api-key")
+    send.add_argument("--remote-dir", default="/")
+    send.add_argument("--tee-dir", help="also keep a copy of each download in this directory")
+    send.add_argument("--progress", action="store_true", help="print transfer progress to stderr")
+    send.add_argument("--resume", action="store_true",
+                      help="continue same-named files already on the server instead of overwriting them")
+    send.set_defaults(func=cmd_send)
+
+    check = sub.add_parser("check", help="probe the hoster links of games and cache which are alive")
+    check.add_argument("links", nargs="*", help="game page URLs, or - to read stdin")
+    check.add_argument("--catalogue", action="store_true", help="every cached game instead")
+    check.add_argument("--limit", type=int, default=None, help="games to check with --catalogue")
+    check.add_argument("--force", action="store_true", help="probe again even if a result is cached")
+    check.add_argument("--real-debrid", action="store_true", help="ask Real-Debrid's check endpoint first")
+    check.add_argument("--api-key")
+    check.set_defaults(func=cmd_check)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    scraper = PSScraper()
+    if args.base_url:
+        scraper.base_url = args.base_url
+    db = GameCache()
+    db.load()
+    try:
+        if args.profile:
+            code, stats = profile(args.func, args, scraper, db)
+            write_report(args.profile, stats)
+            return code
+        return args.func(args, scraper, db)
+    except KeyboardInterrupt:
+        return EXIT_ERROR
+    finally:
+        db.backend.close()
+        if args.metrics:
+            write_report(args.metrics, metrics.export(args.metrics_format))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
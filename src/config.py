@@ -6,26 +6,91 @@ DEFAULTS = {
     "scraper": {
         "base_url": "https://www.superpsx.com/",
         "timeout": 15,
-        "ignore_domains": []
+        "ignore_domains": [],
+        "max_workers": 8,
+        "per_host_limit": 4,
+        "max_connections": 100,
+        "http_cache": True,
+        "http_cache_file": "http_cache.db",
+        "prefetch_results": False,
+        "search_max_pages": 10,
+        "hosters": {}
     },
     "database": {
         "cache_file": "games_cache.json",
-        "cache_ttl": 31536000
+        "cache_ttl": 31536000,
+        "backend": "sqlite",
+        "sqlite_file": "games_cache.db",
+        "instant_search": False,
+        "background_refresh": True,
+        "refresh_rate_per_minute": 6,
+        "refresh_window": [2, 6],
+        "refresh_lead_time": 604800
     },
     "apis": {
-        "real_debrid_api_key": ""
+        "real_debrid_api_key": "",
+        "rd_max_workers": 4,
+        "rd_rate_per_minute": 250,
+        "timeout": 30,
+        "max_retries": 4,
+        "unrestrict_cache": True,
+        "unrestrict_cache_file": "unrestrict_cache.db",
+        "unrestrict_cache_ttl": 21600,
+        "unrestrict_cache_max_entries": 5000
     },
     "ftp": {
         "host": "",
         "port": 21,
         "username": "",
-        "password": ""
+        "password": "",
+        "block_size": 1048576,
+        "pool_size": 2,
+        "timeout": 30,
+        "max_retries": 3,
+        "stream_buffer_mb": 16,
+        "stream_tee_dir": ""
+    },
+    "downloads": {
+        "builtin": True,
+        "directory": "downloads",
+        "segments": 4,
+        "max_jobs": 2,
+        "timeout": 30,
+        "max_retries": 5
+    },
+    "history": {
+        "file": "download_history.db",
+        "compact_interval": 604800,
+        "retention_days": 0
+    },
+    "scheduler": {
+        "max_workers": 6
+    },
+    "crawler": {
+        "state_file": "crawl_state.db",
+        "processes": 0
+    },
+    "liveness": {
+        "ttl": 21600,
+        "workers": 16,
+        "per_host_limit": 4,
+        "timeout": 10,
+        "use_real_debrid": False,
+        "auto_check": False
     }
 }
 
 class Config:
     def __init__(self, config_path="settings.json"):
-        self.settings = self._load_settings(config_path)
+        self.config_path = config_path
+        self._settings = None
+
+    @property
+    def settings(self):
+        # Read on first access so importing this module costs nothing
+        if self._settings is None:
+            self._settings = self._load_settings(self.config_path)
+        return self._settings
 
     def _load_settings(self, path):
         if not os.path.exists(path):
@@ -55,5 +120,25 @@ class Config:
     def ftp(self):
         return self.settings.get("ftp", DEFAULTS["ftp"])
 
+    @property
+    def downloads(self):
+        return self.settings.get("downloads", DEFAULTS["downloads"])
+
+    @property
+    def history(self):
+        return self.settings.get("history", DEFAULTS["history"])
+
+    @property
+    def scheduler(self):
+        return self.settings.get("scheduler", DEFAULTS["scheduler"])
+
+    @property
+    def crawler(self):
+        return self.settings.get("crawler", DEFAULTS["crawler"])
+
+    @property
+    def liveness(self):
+        return self.settings.get("liveness", DEFAULTS["liveness"])
+
 # Create a singleton instance to be imported elsewhere
 cfg = Config()
@@ -0,0 +1,396 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.metrics import metrics
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_STATE_FILE = "crawl_state.db"
+
+# Only the metadata/link tables and the download-page link decide what a game
+# page yields; sidebars, comment counts and nonces elsewhere are ignored.
+TABLE_RE = re.compile(rb"<table\b.*?</table>", re.IGNORECASE | re.DOTALL)
+DOWNLOAD_HREF_RE = re.compile(rb"""href=["']([^"']*dll-[^"']*)["']""", re.IGNORECASE)
+WHITESPACE_RE = re.compile(rb"\s+")
+
+NEW = "new"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+FAILED = "failed"
+
+
+def fingerprint(*pages):
+    """Content hash of the link/metadata tables of the given page bodies."""
+    digest = hashlib.blake2b(digest_size=16)
+    for content in pages:
+        if content is None:
+            digest.update(b"\0")
+            continue
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        for table in TABLE_RE.findall(content):
+            digest.update(WHITESPACE_RE.sub(b" ", table))
+        for href in DOWNLOAD_HREF_RE.findall(content):
+            digest.update(href)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def download_page_url(content):
+    match = DOWNLOAD_HREF_RE.search(content) if content else None
+    return match.group(1).decode("utf-8", "replace") if match else None
+
+
+class CrawlState:
+    """Fingerprints per game page plus the frontier and totals of each crawl run."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            url TEXT PRIMARY KEY,
+            fingerprint TEXT,
+            first_seen REAL,
+            last_seen REAL,
+            last_changed REAL
+        );
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            started REAL,
+            finished REAL,
+            pages INTEGER DEFAULT 0,
+            new INTEGER DEFAULT 0,
+            changed INTEGER DEFAULT 0,
+            unchanged INTEGER DEFAULT 0,
+            failed INTEGER DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS frontier (
+            run_id INTEGER,
+            kind TEXT,
+            url TEXT,
+            page INTEGER,
+            title TEXT,
+            size TEXT,
+            status TEXT DEFAULT 'pending',
+            PRIMARY KEY (run_id, url)
+        );
+        CREATE INDEX IF NOT EXISTS idx_frontier_pending ON frontier (run_id, status, kind, page);
+    """
+    COUNTS = ("pages", NEW, CHANGED, UNCHANGED, FAILED)
+
+    def __init__(self, path=None):
+        crawler_cfg = getattr(cfg, "crawler", {}) if cfg else {}
+        self.path = path or crawler_cfg.get("state_file", DEFAULT_STATE_FILE)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def open_run(self, resume=True):
+        """Return (run id, counts, resumed). An unfinished run is continued when `resume` is set."""
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT id, pages, new, changed, unchanged, failed FROM runs "
+                "WHERE finished IS NULL ORDER BY id DESC LIMIT 1").fetchone()
+            if row and resume:
+                return row[0], dict(zip(self.COUNTS, row[1:])), True
+            with conn:
+                if row:
+                    # Abandon the interrupted run instead of resuming it
+                    conn.execute("UPDATE runs SET finished = ? WHERE finished IS NULL", (time.time(),))
+                run_id = conn.execute("INSERT INTO runs (started) VALUES (?)", (time.time(),)).lastrowid
+            return run_id, dict.fromkeys(self.COUNTS, 0), False
+
+    def add(self, run_id, kind, items):
+        """Queue frontier items: (url, page, title, size). Already-known URLs are ignored."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR IGNORE INTO frontier (run_id, kind, url, page, title, size) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(run_id, kind) + tuple(item) for item in items])
+
+    def pending(self, run_id, kind, limit=-1):
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT url, page, title, size FROM frontier WHERE run_id = ? AND kind = ? AND status = 'pending' "
+                "ORDER BY page, rowid LIMIT ?", (run_id, kind, limit)).fetchall()
+        return rows
+
+    def mark(self, run_id, urls, status="done"):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("UPDATE frontier SET status = ? WHERE run_id = ? AND url = ?",
+                                 [(status, run_id, url) for url in urls])
+
+    def save_counts(self, run_id, counts, finished=False):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "UPDATE runs SET pages = ?, new = ?, changed = ?, unchanged = ?, failed = ?, finished = ? "
+                    "WHERE id = ?",
+                    tuple(counts[name] for name in self.COUNTS) + (time.time() if finished else None, run_id))
+                if finished:
+                    conn.execute("DELETE FROM frontier WHERE run_id = ?", (run_id,))
+
+    def fingerprint(self, url):
+        with self._lock:
+            row = self._connect().execute("SELECT fingerprint FROM fingerprints WHERE url = ?", (url,)).fetchone()
+        return row[0] if row else None
+
+    def fingerprints(self, urls):
+        """{url: fingerprint} for the known ones among `urls`."""
+        found = {}
+        with self._lock:
+            conn = self._connect()
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                found.update(conn.execute(
+                    f"SELECT url, fingerprint FROM fingerprints WHERE url IN ({','.join('?' * len(chunk))})",
+                    chunk).fetchall())
+        return found
+
+    def set_fingerprints(self, items):
+        """Store (url, fingerprint, changed) results of one batch."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT INTO fingerprints (url, fingerprint, first_seen, last_seen, last_changed) "
+                    "VALUES (?, ?, ?, ?, ?) ON CONFLICT(url) DO UPDATE SET "
+                    "fingerprint = excluded.fingerprint, last_seen = excluded.last_seen, "
+                    "last_changed = CASE WHEN ? THEN excluded.last_changed ELSE fingerprints.last_changed END",
+                    [(url, fp, now, now, now, 1 if changed else 0) for url, fp, changed in items])
+
+    def runs(self, limit=10):
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id, started, finished, pages, new, changed, unchanged, failed FROM runs "
+                "ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        keys = ("id", "started", "finished") + self.COUNTS
+        return [dict(zip(keys, row)) for row in rows]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def crawl_game(scraper, game, previous=None, cached=False, force=False):
+    """Fetch, fingerprint and, if it changed, parse one game page.
+
+    Returns (status, fingerprint or None, links, metadata). Touches neither
+    the cache nor the crawl state, so it can run in a worker process while
+    the caller does all the writing.
+    """
+    url = game["url"]
+    try:
+        response = scraper._fetch(url, kind="game")
+        response.raise_for_status()
+        content = response.content
+        dl_url = download_page_url(content)
+        dl_content = None
+        if dl_url:
+            dl_response = scraper._fetch(dl_url, kind="download")
+            if dl_response.status_code < 400:
+                dl_content = dl_response.content
+    except Exception as e:
+        metrics.inc("scraper_errors_total", op="crawl", error=type(e).__name__)
+        return FAILED, None, [], {}
+
+    fp = fingerprint(content, dl_content)
+    if not force and previous == fp and cached:
+        return UNCHANGED, fp, None, None
+
+    metadata = scraper.new_metadata(game["size"])
+    with metrics.timer("parse_seconds", phase="game_page"):
+        soup, page_links, parsed_dl_url = scraper.parse_game_page(content, metadata)
+    if dl_content is None and parsed_dl_url:
+        # Download link the href pattern missed (e.g. an image button)
+        try:
+            dl_content = scraper._fetch(parsed_dl_url, kind="download").content
+        except Exception as e:
+            metrics.inc("scraper_errors_total", op="crawl", error=type(e).__name__)
+    links = None
+    if dl_content is not None:
+        with metrics.timer("parse_seconds", phase="download_page"):
+            links = scraper.parse_download_page(dl_content, metadata)
+    links = links or page_links or scraper._raw_link_groups(soup)
+    if not links:
+        # Not fingerprinted, so the next run tries again
+        return FAILED, None, links, metadata
+    if previous is None:
+        return NEW, fp, links, metadata
+    # Forced re-parses of unchanged pages still count as unchanged
+    return (UNCHANGED if previous == fp else CHANGED), fp, links, metadata
+
+
+# The scraper of a crawl worker process, built once by _init_worker
+_worker_scraper = None
+
+
+def _init_worker(base_url, ignore_domains, http_cache_path):
+    global _worker_scraper
+    from src.http_cache import DeferredHTTPCache
+    from src.scraper import PSScraper
+
+    _worker_scraper = PSScraper()
+    _worker_scraper.base_url = base_url
+    _worker_scraper.ignore_domains = ignore_domains
+    # Reads the parent's HTTP cache; new responses go back with the result instead
+    _worker_scraper.http_cache = DeferredHTTPCache(http_cache_path) if http_cache_path else None
+
+
+def _crawl_game_in_worker(task):
+    """crawl_game() in a worker process: (result, responses for the parent to store in the HTTP cache)."""
+    result = crawl_game(_worker_scraper, *task)
+    http_cache = _worker_scraper.http_cache
+    return result, http_cache.take() if http_cache is not None else []
+
+
+class IncrementalCrawler:
+    """Mirrors the site's catalogue into GameCache, re-parsing only pages that changed.
+
+    Each game page (plus its download page) is fingerprinted from the raw
+    HTML of its tables before any parsing. A matching fingerprint only bumps
+    the cache timestamp; a new or different one is parsed and saved. The
+    frontier lives in CrawlState, so an interrupted run picks up where it
+    stopped.
+
+    With `processes`, games are fetched and parsed in that many worker
+    processes instead of threads, so parsing is not held to one core by the
+    GIL. Either way this process is the only one writing to the cache, the
+    crawl state and the HTTP cache, one batch (one transaction) per listing
+    page; workers only read the HTTP cache and send new responses back.
+    """
+
+    def __init__(self, scraper, db, state=None, workers=None, max_pages=None, processes=None):
+        crawler_cfg = getattr(cfg, "crawler", {}) if cfg else {}
+        self.scraper = scraper
+        self.db = db
+        self.state = state or CrawlState()
+        self.workers = workers or scraper.max_workers
+        self.max_pages = max_pages
+        self.processes = processes if processes is not None else crawler_cfg.get("processes", 0)
+
+    def _pool(self):
+        if self.processes:
+            http_cache = None
+            if self.scraper.http_cache is not None:
+                http_cache = self.scraper.http_cache.path
+                # Create the file and schema here so workers only ever read it
+                self.scraper.http_cache.validators(self.scraper.base_url)
+            return ProcessPoolExecutor(max_workers=self.processes, initializer=_init_worker,
+                                       initargs=(self.scraper.base_url, list(self.scraper.ignore_domains), http_cache))
+        return ThreadPoolExecutor(max_workers=max(1, self.workers))
+
+    def run(self, resume=True, force=False, on_game=None, log=None):
+        """Crawl until the catalogue (or `max_pages`) is exhausted and return the run's report.
+
+        A listing page that cannot be fetched stops the walk: the report gets
+        an "error" and the run is left unfinished, to be resumed from that page.
+
+        `force` re-parses every game regardless of its fingerprint.
+        `on_game(game, status, links, metadata)` runs as each game is classified.
+        """
+        started = time.time()
+        run_id, counts, resumed = self.state.open_run(resume)
+        if not resumed:
+            self.state.add(run_id, "listing", [(self.scraper.catalogue_url(1), 1, None, None)])
+
+        error = None
+        with self._pool() as pool:
+            # Games queued before an interruption come first
+            self._crawl_games(pool, run_id, counts, force, on_game)
+            while True:
+                listing = self.state.pending(run_id, "listing", limit=1)
+                if not listing:
+                    break
+                url, page = listing[0][0], listing[0][1]
+                try:
+                    games = self.scraper.list_games(page, strict=True)
+                except Exception as e:
+                    if getattr(getattr(e, "response", None), "status_code", None) != 404:
+                        # Not the end of the catalogue: keep the page pending so the next run resumes here
+                        error = f"listing page {page} failed: {type(e).__name__}: {e}"
+                        if log:
+                            log(error)
+                        break
+                    # The site answers 404 past its last listing page
+                    games = []
+                counts["pages"] += 1
+                if games and (not self.max_pages or counts["pages"] < self.max_pages):
+                    self.state.add(run_id, "listing", [(self.scraper.catalogue_url(page + 1), page + 1, None, None)])
+                self.state.add(run_id, "game", [(g["url"], page, g.get("title"), g.get("size", "N/A")) for g in games])
+                self.state.mark(run_id, [url])
+                self.state.save_counts(run_id, counts)
+                self._crawl_games(pool, run_id, counts, force, on_game)
+                if log:
+                    log(f"page {page}: {len(games)} games ({self._summary(counts)})")
+
+        # A run stopped by a failed listing page stays unfinished, frontier and all
+        self.state.save_counts(run_id, counts, finished=error is None)
+        report = dict(counts, run=run_id, resumed=resumed, seconds=round(time.time() - started, 1))
+        if error:
+            report["error"] = error
+        return report
+
+    def _summary(self, counts):
+        return ", ".join(f"{counts[name]} {name}" for name in (NEW, CHANGED, UNCHANGED, FAILED))
+
+    def _crawl_games(self, pool, run_id, counts, force, on_game):
+        pending = self.state.pending(run_id, "game")
+        if not pending:
+            return
+        games = [{"url": url, "title": title, "size": size or "N/A"} for url, _, title, size in pending]
+        previous = self.state.fingerprints([game["url"] for game in games])
+        # Only games with a fingerprint can be skipped, so only they need the cache lookup
+        tasks = [(game, previous.get(game["url"]), game["url"] in previous and self.db.has(game["url"]), force)
+                 for game in games]
+        if self.processes:
+            chunksize = max(1, len(tasks) // (self.processes * 4))
+            results, responses = [], []
+            for result, fetched in pool.map(_crawl_game_in_worker, tasks, chunksize=chunksize):
+                results.append(result)
+                responses.extend(fetched)
+            if responses:
+                self.scraper.http_cache.store_many(responses)
+        else:
+            results = list(pool.map(lambda task: crawl_game(self.scraper, *task), tasks))
+
+        fingerprints, unchanged, parsed = [], [], []
+        for game, (status, fp, links, metadata) in zip(games, results):
+            counts[status] += 1
+            metrics.inc("crawler_games_total", status=status)
+            if status == UNCHANGED and links is None:
+                unchanged.append(game["url"])
+            elif status != FAILED:
+                game["size"] = metadata.get("size", "N/A")
+                parsed.append((game, links, metadata))
+            if fp is not None:
+                fingerprints.append((game["url"], fp, status != UNCHANGED))
+            if on_game:
+                on_game(game, status, links, metadata)
+        if parsed:
+            self.db.save_many(parsed)
+        if unchanged:
+            self.db.touch(unchanged)
+        self.state.set_fingerprints(fingerprints)
+        self.state.mark(run_id, [game["url"] for game in games])
+        self.state.save_counts(run_id, counts)
@@ -1,7 +1,15 @@
 import json
 import os
+import re
+import sqlite3
+import sys
+import threading
 import time
 
+from src.links import display_rows
+from src.metrics import metrics
+from src.models import CacheEntry, GameResult
+
 try:
     from src.config import cfg  # type: ignore
 except Exception:
@@ -9,34 +17,531 @@ except Exception:
 
 DEFAULT_CACHE_FILE = "games_cache.json"
 DEFAULT_CACHE_TTL = 31536000
+DEFAULT_CACHE_BACKEND = "sqlite"
+DEFAULT_SQLITE_FILE = "games_cache.db"
 
 if cfg and getattr(cfg, "database", None) is not None:
     try:
         CACHE_FILE = cfg.database.get("cache_file", DEFAULT_CACHE_FILE)
         CACHE_TTL = cfg.database.get("cache_ttl", DEFAULT_CACHE_TTL)
+        CACHE_BACKEND = cfg.database.get("backend", DEFAULT_CACHE_BACKEND)
+        SQLITE_FILE = cfg.database.get("sqlite_file", DEFAULT_SQLITE_FILE)
     except Exception:
         CACHE_FILE = DEFAULT_CACHE_FILE
         CACHE_TTL = DEFAULT_CACHE_TTL
+        CACHE_BACKEND = DEFAULT_CACHE_BACKEND
+        SQLITE_FILE = DEFAULT_SQLITE_FILE
 else:
     CACHE_FILE = DEFAULT_CACHE_FILE
     CACHE_TTL = DEFAULT_CACHE_TTL
+    CACHE_BACKEND = DEFAULT_CACHE_BACKEND
+    SQLITE_FILE = DEFAULT_SQLITE_FILE
 
-class GameCache:
-    def __init__(self):
+
+# Columns of a cached link liveness result (see src.liveness)
+LINK_STATUS_FIELDS = ("url", "state", "size", "code", "via", "checked")
+
+
+def search_tokens(query):
+    return [t.lower() for t in re.findall(r"\w+", query or "")]
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def search_result(url, title, size, downloads, cusa, region, version):
+    return GameResult(title, url, None, downloads or "N/A", size or "N/A",
+                      cusa or "N/A", region or "N/A", version or "N/A", cached=True)
+
+
+class JsonCacheBackend:
+    """Legacy backend: the whole cache lives in one JSON document.
+
+    Entries are held as CacheEntry records and only expanded to dicts by get().
+    """
+
+    def __init__(self, path=None):
+        self.path = path or CACHE_FILE
+        # Link liveness lives next to the cache so games_cache.json keeps its format
+        self.status_path = os.path.splitext(self.path)[0] + "_links.json"
         self._cache = {}
+        self._trigrams = {}
+        self._link_status = {}
+        # Prefetch workers, the refresher and the scheduler read and write concurrently
+        self._lock = threading.Lock()
 
     def load(self):
-        if os.path.exists(CACHE_FILE):
+        raw = {}
+        if os.path.exists(self.path):
             try:
-                with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                    self._cache = json.load(f)
+                with open(self.path, "r", encoding="utf-8") as f:
+                    raw = json.load(f)
             except (OSError, json.JSONDecodeError):
-                self._cache = {}
-        else:
+                raw = {}
+        link_status = {}
+        if os.path.exists(self.status_path):
+            try:
+                with open(self.status_path, "r", encoding="utf-8") as f:
+                    link_status = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                link_status = {}
+        with self._lock:
             self._cache = {}
+            self._trigrams = {}
+            for url, entry in raw.items():
+                if isinstance(entry, dict):
+                    self._cache[url] = CacheEntry.from_dict(url, entry)
+                    self._index(url, self._cache[url])
+            self._link_status = link_status
+
+    def get(self, url):
+        with self._lock:
+            entry = self._cache.get(url)
+            return entry.to_dict() if entry is not None else None
+
+    def upsert(self, url, entry):
+        self.upsert_many([(url, entry)])
+
+    def touch(self, urls, timestamp):
+        with self._lock:
+            touched = False
+            for url in urls:
+                entry = self._cache.get(url)
+                if entry is not None:
+                    entry.timestamp = timestamp
+                    touched = True
+            if touched:
+                self._write()
+
+    def upsert_many(self, items):
+        with self._lock:
+            for url, entry in items:
+                self._cache[url] = CacheEntry.from_dict(url, entry)
+                self._index(url, self._cache[url])
+            self._write()
+
+    def _write(self):
+        # Called with the lock held. Written aside and swapped in, so a reader in
+        # another process never sees half a file
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({url: entry.to_dict() for url, entry in self._cache.items()}, f, indent=4)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[ERROR] Could not write the cache to {self.path}: {e}")
+            raise
+
+    def count(self):
+        with self._lock:
+            return len(self._cache)
+
+    def link_status(self, urls, since):
+        found = {}
+        with self._lock:
+            for url in urls:
+                status = self._link_status.get(url)
+                if status is not None and status.get("checked", 0) >= since:
+                    found[url] = dict(status, url=url)
+        return found
+
+    def save_link_status(self, statuses):
+        with self._lock:
+            for status in statuses:
+                self._link_status[status["url"]] = {key: status.get(key) for key in LINK_STATUS_FIELDS if key != "url"}
+            try:
+                with open(self.status_path, "w", encoding="utf-8") as f:
+                    json.dump(self._link_status, f)
+            except OSError as e:
+                print(f"[ERROR] Could not save {len(statuses)} link statuses to {self.status_path}: {e}")
+                raise
+
+    def older_than(self, timestamp, limit=100):
+        with self._lock:
+            rows = [
+                {"url": url, "title": entry.title, "size": entry.size,
+                 "downloads": entry.downloads, "timestamp": entry.timestamp}
+                for url, entry in self._cache.items()
+                if entry.timestamp < timestamp
+            ]
+        rows.sort(key=lambda r: r["timestamp"])
+        return rows[:limit]
+
+    def search(self, query, limit=50):
+        tokens = search_tokens(query)
+        if not tokens:
+            return []
+        results = []
+        with self._lock:
+            candidates = None
+            for token in tokens:
+                for gram in trigrams(token):
+                    urls = self._trigrams.get(gram, set())
+                    candidates = set(urls) if candidates is None else candidates & urls
+            if candidates is None:
+                candidates = self._cache.keys()
+
+            for url in candidates:
+                entry = self._cache.get(url)
+                if entry is None:
+                    continue
+                if all(token in self._haystack(url, entry) for token in tokens):
+                    results.append(search_result(
+                        url, entry.title, entry.size, entry.downloads,
+                        entry.get_meta("cusa", "N/A"), entry.get_meta("region", "N/A"),
+                        entry.get_meta("version", "N/A")))
+        results.sort(key=lambda r: (r["title"] or "").lower())
+        return results[:limit]
+
+    def _haystack(self, url, entry):
+        return " ".join(str(v) for v in (
+            entry.title, entry.get_meta("cusa"), entry.get_meta("region"), entry.get_meta("version")) if v).lower()
+
+    def _index(self, url, entry):
+        # Called with the lock held
+        for gram in trigrams(self._haystack(url, entry)):
+            self._trigrams.setdefault(gram, set()).add(url)
+
+    def close(self):
+        pass
+
+
+class SQLiteCacheBackend:
+    """One row per game keyed by URL, written with per-row upserts in WAL mode."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS games (
+            url TEXT PRIMARY KEY,
+            title TEXT,
+            cusa TEXT,
+            region TEXT,
+            version TEXT,
+            size TEXT,
+            downloads TEXT,
+            timestamp REAL,
+            links TEXT,
+            metadata TEXT,
+            display_rows TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_games_title ON games(title COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS idx_games_cusa ON games(cusa);
+        CREATE INDEX IF NOT EXISTS idx_games_timestamp ON games(timestamp);
+        CREATE TABLE IF NOT EXISTS link_status (
+            url TEXT PRIMARY KEY,
+            state TEXT,
+            size INTEGER,
+            code INTEGER,
+            via TEXT,
+            checked REAL
+        );
+    """
+
+    # Full-text index over title/ID/region/version. games_fts_map ties each FTS row
+    # to its game URL so rows can be replaced without relying on implicit rowids.
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS games_fts USING fts5(title, cusa, region, version, prefix='2 3');
+        CREATE TABLE IF NOT EXISTS games_fts_map (url TEXT PRIMARY KEY, fts_rowid INTEGER);
+        CREATE INDEX IF NOT EXISTS idx_games_fts_map_rowid ON games_fts_map(fts_rowid);
+        CREATE TRIGGER IF NOT EXISTS games_fts_insert AFTER INSERT ON games BEGIN
+            DELETE FROM games_fts_map WHERE url = new.url;
+            INSERT INTO games_fts (title, cusa, region, version) VALUES (new.title, new.cusa, new.region, new.version);
+            INSERT INTO games_fts_map (url, fts_rowid) VALUES (new.url, last_insert_rowid());
+        END;
+        -- Only real edits to indexed columns: the upsert sets them on every save, and
+        -- touch() rewriting timestamps must leave the index alone too
+        CREATE TRIGGER IF NOT EXISTS games_fts_update AFTER UPDATE OF title, cusa, region, version ON games
+        WHEN old.title IS NOT new.title OR old.cusa IS NOT new.cusa
+            OR old.region IS NOT new.region OR old.version IS NOT new.version BEGIN
+            DELETE FROM games_fts WHERE rowid = (SELECT fts_rowid FROM games_fts_map WHERE url = old.url);
+            DELETE FROM games_fts_map WHERE url = old.url;
+            INSERT INTO games_fts (title, cusa, region, version) VALUES (new.title, new.cusa, new.region, new.version);
+            INSERT INTO games_fts_map (url, fts_rowid) VALUES (new.url, last_insert_rowid());
+        END;
+        CREATE TRIGGER IF NOT EXISTS games_fts_delete AFTER DELETE ON games BEGIN
+            DELETE FROM games_fts WHERE rowid = (SELECT fts_rowid FROM games_fts_map WHERE url = old.url);
+            DELETE FROM games_fts_map WHERE url = old.url;
+        END;
+    """
+
+    SEARCH_COLUMNS = "g.url, g.title, g.size, g.downloads, g.cusa, g.region, g.version"
+
+    UPSERT = """
+        INSERT INTO games (url, title, cusa, region, version, size, downloads, timestamp, links, metadata, display_rows)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(url) DO UPDATE SET
+            title = excluded.title,
+            cusa = excluded.cusa,
+            region = excluded.region,
+            version = excluded.version,
+            size = excluded.size,
+            downloads = excluded.downloads,
+            timestamp = excluded.timestamp,
+            links = excluded.links,
+            metadata = excluded.metadata,
+            display_rows = excluded.display_rows
+    """
+
+    def __init__(self, path=None):
+        self.path = path or SQLITE_FILE
+        self._conn = None
+        self._lock = threading.Lock()
+        self.has_fts = False
+
+    def load(self):
+        with self._lock:
+            if self._conn is not None:
+                return
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(games)")}
+            if "display_rows" not in columns:
+                # Databases created before display rows were cached
+                self._conn.execute("ALTER TABLE games ADD COLUMN display_rows TEXT")
+            try:
+                trigger = self._conn.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'games_fts_update'").fetchone()
+                if trigger and "WHEN old.title IS NOT new.title" not in trigger[0]:
+                    # Databases whose trigger reindexed on every save or timestamp update
+                    self._conn.execute("DROP TRIGGER games_fts_update")
+                self._conn.executescript(self.FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:
+                # SQLite built without FTS5; search() falls back to LIKE
+                self.has_fts = False
+            self._conn.commit()
+            if self.has_fts:
+                self._sync_fts()
+
+    def _sync_fts(self):
+        games = self._conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+        indexed = self._conn.execute("SELECT COUNT(*) FROM games_fts_map").fetchone()[0]
+        if games == indexed:
+            return
+        with self._conn:
+            self._conn.execute("DELETE FROM games_fts")
+            self._conn.execute("DELETE FROM games_fts_map")
+            for url, title, cusa, region, version in self._conn.execute(
+                    "SELECT url, title, cusa, region, version FROM games").fetchall():
+                cur = self._conn.execute(
+                    "INSERT INTO games_fts (title, cusa, region, version) VALUES (?, ?, ?, ?)",
+                    (title, cusa, region, version))
+                self._conn.execute("INSERT INTO games_fts_map (url, fts_rowid) VALUES (?, ?)", (url, cur.lastrowid))
+
+    def _row_params(self, url, entry):
+        meta = entry.get("metadata") or {}
+        return (
+            url,
+            entry.get("title"),
+            meta.get("cusa", "N/A"),
+            meta.get("region", "N/A"),
+            meta.get("version", "N/A"),
+            entry.get("size", "N/A"),
+            entry.get("downloads", "N/A"),
+            entry.get("timestamp", 0),
+            json.dumps(entry.get("links") or []),
+            json.dumps(meta),
+            json.dumps(entry["display_rows"]) if entry.get("display_rows") is not None else None,
+        )
 
     def get(self, url):
-        data = self._cache.get(url)
+        if self._conn is None:
+            self.load()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, title, size, downloads, timestamp, links, metadata, display_rows FROM games WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+        try:
+            links = json.loads(row[5]) if row[5] else []
+            metadata = json.loads(row[6]) if row[6] else {}
+            rows = json.loads(row[7]) if row[7] else None
+        except ValueError:
+            return None
+        return {
+            "url": row[0],
+            "title": row[1],
+            "size": row[2],
+            "downloads": row[3],
+            "links": links,
+            "metadata": metadata,
+            "timestamp": row[4] or 0,
+            "display_rows": rows,
+        }
+
+    def upsert(self, url, entry):
+        self.upsert_many([(url, entry)])
+
+    def upsert_many(self, items):
+        if self._conn is None:
+            self.load()
+        params = [self._row_params(url, entry) for url, entry in items]
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(self.UPSERT, params)
+            except sqlite3.Error as e:
+                print(f"[ERROR] Could not save {len(params)} cache entries to {self.path}: {e}")
+                raise
+
+    def touch(self, urls, timestamp):
+        if self._conn is None:
+            self.load()
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany("UPDATE games SET timestamp = ? WHERE url = ?",
+                                           [(timestamp, url) for url in urls])
+            except sqlite3.Error as e:
+                print(f"[ERROR] Could not refresh {len(urls)} cache timestamps in {self.path}: {e}")
+                raise
+
+    def count(self):
+        if self._conn is None:
+            self.load()
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM games").fetchone()[0]
+
+    def older_than(self, timestamp, limit=100):
+        if self._conn is None:
+            self.load()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, title, size, downloads, timestamp FROM games "
+                "WHERE timestamp < ? ORDER BY timestamp LIMIT ?",
+                (timestamp, limit),
+            ).fetchall()
+        return [
+            {"url": url, "title": title, "size": size, "downloads": downloads, "timestamp": ts}
+            for url, title, size, downloads, ts in rows
+        ]
+
+    def link_status(self, urls, since):
+        if self._conn is None:
+            self.load()
+        found = {}
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for i in range(0, len(urls), 500):
+                chunk = urls[i:i + 500]
+                rows = self._conn.execute(
+                    f"SELECT url, state, size, code, via, checked FROM link_status "
+                    f"WHERE checked >= ? AND url IN ({','.join('?' * len(chunk))})", [since] + chunk).fetchall()
+                for row in rows:
+                    found[row[0]] = dict(zip(LINK_STATUS_FIELDS, row))
+        return found
+
+    def save_link_status(self, statuses):
+        if self._conn is None:
+            self.load()
+        with self._lock:
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO link_status (url, state, size, code, via, checked) VALUES (?, ?, ?, ?, ?, ?)",
+                        [tuple(status.get(key) for key in LINK_STATUS_FIELDS) for status in statuses])
+            except sqlite3.Error as e:
+                print(f"[ERROR] Could not save {len(statuses)} link statuses to {self.path}: {e}")
+                raise
+
+    def search(self, query, limit=50):
+        tokens = search_tokens(query)
+        if not tokens:
+            return []
+        if self._conn is None:
+            self.load()
+        if self.has_fts:
+            sql = (f"SELECT {self.SEARCH_COLUMNS} FROM games_fts f "
+                   "JOIN games_fts_map m ON m.fts_rowid = f.rowid "
+                   "JOIN games g ON g.url = m.url "
+                   "WHERE games_fts MATCH ? ORDER BY f.rank LIMIT ?")
+            params = (" ".join(f'"{t}"*' for t in tokens), limit)
+        else:
+            clause = " AND ".join("(g.title LIKE ? OR g.cusa LIKE ? OR g.region LIKE ? OR g.version LIKE ?)" for _ in tokens)
+            sql = f"SELECT {self.SEARCH_COLUMNS} FROM games g WHERE {clause} ORDER BY g.title LIMIT ?"
+            params = tuple(p for t in tokens for p in [f"%{t}%"] * 4) + (limit,)
+        with self._lock:
+            try:
+                rows = self._conn.execute(sql, params).fetchall()
+            except sqlite3.Error:
+                return []
+        return [search_result(*row) for row in rows]
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+def create_backend(name=None):
+    name = (name or CACHE_BACKEND or DEFAULT_CACHE_BACKEND).lower()
+    if name == "json":
+        return JsonCacheBackend()
+    return SQLiteCacheBackend()
+
+
+def import_json_cache(json_path, backend, batch_size=1000):
+    """Copy every entry of a legacy games_cache.json into `backend`. Returns the count."""
+    try:
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return 0
+    if not isinstance(data, dict):
+        return 0
+
+    backend.load()
+    batch = []
+    imported = 0
+    for url, entry in data.items():
+        if not isinstance(entry, dict):
+            continue
+        batch.append((url, entry))
+        if len(batch) >= batch_size:
+            backend.upsert_many(batch)
+            imported += len(batch)
+            batch = []
+    if batch:
+        backend.upsert_many(batch)
+        imported += len(batch)
+    return imported
+
+
+class GameCache:
+    def __init__(self, backend=None):
+        self.backend = backend or create_backend()
+        self.loaded = threading.Event()
+
+    def load(self):
+        try:
+            self.backend.load()
+            # First run on the SQLite store: pull in whatever the old JSON cache held.
+            if isinstance(self.backend, SQLiteCacheBackend) and self.backend.count() == 0:
+                if os.path.exists(CACHE_FILE):
+                    try:
+                        import_json_cache(CACHE_FILE, self.backend)
+                    except sqlite3.Error as e:
+                        # Partly imported at most; the JSON file is left in place to retry with src.database
+                        print(f"[WARNING] Could not import {CACHE_FILE}: {e}")
+        finally:
+            self.loaded.set()
+
+    def get(self, url, allow_stale=False):
+        with metrics.timer("cache_get_seconds"):
+            data = self._get(url, allow_stale)
+        if data is None:
+            metrics.inc("cache_lookups_total", result="miss")
+        else:
+            metrics.inc("cache_lookups_total", result="stale" if data.get("stale") else "hit")
+        return data
+
+    def _get(self, url, allow_stale):
+        data = self.backend.get(url)
         if not data:
             return None
 
@@ -46,18 +551,66 @@ class GameCache:
         meta = data["metadata"]
         if meta.get("version", "N/A") == "N/A" and meta.get("cusa", "N/A") == "N/A":
             return None
-            
+
         if not data.get("links"):
             return None
 
-        timestamp = data.get("timestamp", 0)
-        if (time.time() - timestamp) > CACHE_TTL:
-            return None
+        if self.is_stale(data):
+            # Stale-while-revalidate: callers that can refresh in the background
+            # still get the old entry, flagged so they know to do so.
+            return dict(data, stale=True) if allow_stale else None
 
         return data
 
-    def save(self, game_data, links, metadata):
-        self._cache[game_data["url"]] = {
+    def has(self, url):
+        return self.backend.get(url) is not None
+
+    def touch(self, urls):
+        """Mark entries as freshly verified without rewriting them."""
+        self.backend.touch(list(urls), time.time())
+
+    def is_stale(self, data, lead_time=0):
+        return (time.time() - data.get("timestamp", 0)) > CACHE_TTL - lead_time
+
+    def expiring(self, lead_time=0, limit=100):
+        """Cached games (oldest first) that are stale or will be within `lead_time` seconds."""
+        cutoff = time.time() - CACHE_TTL + lead_time
+        return self.backend.older_than(cutoff, limit)
+
+    def search(self, query, limit=50):
+        """Match cached titles, CUSA/PPSA IDs, regions and versions without touching the network."""
+        if not self.loaded.is_set():
+            return []
+        return self.backend.search(query, limit)
+
+    def cached_games(self, limit=None):
+        """Every cached game (url, title, size, downloads, timestamp), oldest first."""
+        return self.backend.older_than(float("inf"), limit or self.backend.count())
+
+    def link_status(self, urls, max_age):
+        """Liveness results for `urls` checked within the last `max_age` seconds, by URL."""
+        return self.backend.link_status(list(urls), time.time() - max_age)
+
+    def save_link_status(self, statuses):
+        statuses = list(statuses)
+        if statuses:
+            self.backend.save_link_status(statuses)
+
+    def save(self, game_data, links, metadata, rows=None):
+        with metrics.timer("cache_save_seconds"):
+            self._save(game_data, links, metadata, rows)
+
+    def save_many(self, items):
+        """save() for a batch of (game, links, metadata) in one backend write: one transaction, or one JSON flush."""
+        with metrics.timer("cache_save_seconds"):
+            self.backend.upsert_many([(game["url"], self._entry(game, links, metadata, None))
+                                      for game, links, metadata in items])
+
+    def _save(self, game_data, links, metadata, rows):
+        self.backend.upsert(game_data["url"], self._entry(game_data, links, metadata, rows))
+
+    def _entry(self, game_data, links, metadata, rows):
+        return {
             "url": game_data["url"],
             "title": game_data["title"],
             "size": metadata.get("size", "N/A"),
@@ -65,10 +618,16 @@ class GameCache:
             "links": links,
             "metadata": metadata,
             "timestamp": time.time(),
+            # Precomputed links-list rows so showing a cached game does no sorting or URL parsing
+            "display_rows": rows if rows is not None else display_rows(links),
         }
 
-        try:
-            with open(CACHE_FILE, "w", encoding="utf-8") as f:
-                json.dump(self._cache, f, indent=4)
-        except OSError:
-            pass
\ No newline at end of file
+
+if __name__ == "__main__":
+    # One-shot migration: python -m src.database [games_cache.json] [games_cache.db]
+    src_path = sys.argv[1] if len(sys.argv) > 1 else CACHE_FILE
+    dst_path = sys.argv[2] if len(sys.argv) > 2 else SQLITE_FILE
+    store = SQLiteCacheBackend(dst_path)
+    count = import_json_cache(src_path, store)
+    store.close()
+    print(f"Imported {count} entries from {src_path} into {dst_path}")
@@ -0,0 +1,374 @@
+import json
+import os
+import queue
+import threading
+import time
+
+import requests
+
+from src.pipeline import filename_from_response
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_SEGMENTS = 4
+DEFAULT_MAX_JOBS = 2
+DEFAULT_DIRECTORY = "downloads"
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 5
+CHUNK_SIZE = 1024 * 1024
+# Segments smaller than this are not worth another connection
+MIN_SEGMENT_SIZE = 4 * 1024 * 1024
+JOURNAL_INTERVAL = 1.0
+
+PART_SUFFIX = ".part"
+JOURNAL_SUFFIX = ".part.json"
+
+
+class DownloadCancelled(Exception):
+    pass
+
+
+def plan_segments(size, segments):
+    """Split [0, size) into at most `segments` contiguous [start, end] byte ranges (inclusive)."""
+    if size <= 0:
+        return []
+    count = max(1, min(segments, size // MIN_SEGMENT_SIZE or 1))
+    step = size // count
+    ranges = []
+    for i in range(count):
+        start = i * step
+        end = size - 1 if i == count - 1 else start + step - 1
+        ranges.append([start, end, 0])
+    return ranges
+
+
+class SegmentedDownload:
+    """Fetches one URL over several Range connections into a preallocated `.part` file.
+
+    Progress of each segment is journalled next to the file, so a crashed or
+    cancelled download continues where every segment stopped. The file is only
+    renamed into place after its size has been verified.
+    """
+
+    def __init__(self, url, directory, name=None, segments=None, session=None, timeout=None, max_retries=None):
+        dl_cfg = getattr(cfg, "downloads", {}) if cfg else {}
+        self.url = url
+        self.directory = directory
+        self.name = name
+        self.segments = segments or dl_cfg.get("segments", DEFAULT_SEGMENTS)
+        self.session = session or requests.Session()
+        self.timeout = timeout or dl_cfg.get("timeout", DEFAULT_TIMEOUT)
+        self.max_retries = max_retries if max_retries is not None else dl_cfg.get("max_retries", DEFAULT_MAX_RETRIES)
+        self.size = None
+        self.ranges = []
+        self.resumed_from = 0
+        self.started = None
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._journal_saved = 0.0
+        self._journal_lock = threading.Lock()
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, self.name) if self.name else None
+
+    @property
+    def done(self):
+        with self._lock:
+            return sum(r[2] for r in self.ranges)
+
+    @property
+    def mbps(self):
+        if not self.started:
+            return 0.0
+        elapsed = time.monotonic() - self.started
+        return (self.done - self.resumed_from) / elapsed / (1024 * 1024) if elapsed > 0 else 0.0
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _probe(self):
+        """Learn size, name and range support from a one-byte ranged GET."""
+        response = self.session.get(self.url, headers={"Range": "bytes=0-0"}, stream=True, timeout=self.timeout)
+        try:
+            response.raise_for_status()
+            self.name = self.name or filename_from_response(response, self.url)
+            if response.status_code == 206:
+                content_range = response.headers.get("Content-Range", "")
+                total = content_range.rpartition("/")[2]
+                if total.isdigit():
+                    return int(total), True
+            length = response.headers.get("Content-Length")
+            return (int(length) if length and length.isdigit() else None), False
+        finally:
+            response.close()
+
+    def _load_journal(self):
+        try:
+            with open(self.path + JOURNAL_SUFFIX, "r", encoding="utf-8") as f:
+                journal = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Unrestricted URLs change between sessions; the file size identifies the download
+        if journal.get("size") != self.size or not os.path.exists(self.path + PART_SUFFIX):
+            return None
+        return journal.get("segments")
+
+    def _save_journal(self, force=False):
+        if not force and time.monotonic() - self._journal_saved < JOURNAL_INTERVAL:
+            return
+        # Segment threads all report progress; one of them writing is enough
+        if not self._journal_lock.acquire(blocking=force):
+            return
+        try:
+            self._journal_saved = time.monotonic()
+            with self._lock:
+                journal = {"url": self.url, "size": self.size, "segments": [list(r) for r in self.ranges]}
+            tmp = self.path + JOURNAL_SUFFIX + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(journal, f)
+            os.replace(tmp, self.path + JOURNAL_SUFFIX)
+        finally:
+            self._journal_lock.release()
+
+    def _fetch_segment(self, index, on_progress):
+        start, end, _ = self.ranges[index]
+        attempt = 0
+        while True:
+            with self._lock:
+                done = self.ranges[index][2]
+            if start + done > end:
+                return
+            if self._cancel.is_set():
+                raise DownloadCancelled()
+            try:
+                headers = {"Range": f"bytes={start + done}-{end}"}
+                with self.session.get(self.url, headers=headers, stream=True, timeout=self.timeout) as response:
+                    if response.status_code != 206:
+                        raise requests.HTTPError(f"expected 206 for segment {index}, got {response.status_code}")
+                    with open(self.path + PART_SUFFIX, "r+b") as f:
+                        f.seek(start + done)
+                        for chunk in response.iter_content(CHUNK_SIZE):
+                            if self._cancel.is_set():
+                                raise DownloadCancelled()
+                            chunk = chunk[:end + 1 - (start + done)]
+                            f.write(chunk)
+                            done += len(chunk)
+                            with self._lock:
+                                self.ranges[index][2] = done
+                            if on_progress:
+                                on_progress(len(chunk))
+                            if start + done > end:
+                                break
+                if start + done > end:
+                    return
+                raise requests.ConnectionError(f"segment {index} ended early")
+            except (requests.RequestException, OSError):
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise
+                time.sleep(min(2 ** attempt, 30))
+
+    def _fetch_whole(self, on_progress):
+        # No Range support: one stream, no resume
+        with self.session.get(self.url, stream=True, timeout=self.timeout) as response:
+            response.raise_for_status()
+            with open(self.path + PART_SUFFIX, "wb") as f:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    if self._cancel.is_set():
+                        raise DownloadCancelled()
+                    f.write(chunk)
+                    with self._lock:
+                        self.ranges[0][2] += len(chunk)
+                    if on_progress:
+                        on_progress(len(chunk))
+        if self.size is None:
+            self.size = self.ranges[0][2]
+
+    def run(self, on_progress=None):
+        """Download to `directory`; returns the final path. Raises DownloadCancelled or the last error."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.size, ranged = self._probe()
+        if not ranged or not self.size:
+            self.ranges = [[0, (self.size or 0) - 1, 0]]
+            self.started = time.monotonic()
+            self._fetch_whole(on_progress)
+        else:
+            self.ranges = self._load_journal() or plan_segments(self.size, self.segments)
+            self.resumed_from = sum(r[2] for r in self.ranges)
+            if not self.resumed_from:
+                # Preallocate; on most filesystems this is sparse until written
+                with open(self.path + PART_SUFFIX, "wb") as f:
+                    f.truncate(self.size)
+            self._save_journal(force=True)
+            self.started = time.monotonic()
+
+            def progress(size):
+                self._save_journal()
+                if on_progress:
+                    on_progress(size)
+
+            errors = []
+            threads = [threading.Thread(target=self._segment_worker, args=(i, progress, errors), daemon=True)
+                       for i in range(len(self.ranges))]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            self._save_journal(force=True)
+            if errors:
+                raise errors[0]
+
+        actual = os.path.getsize(self.path + PART_SUFFIX)
+        if self.size is not None and (actual != self.size or self.done != self.size):
+            raise IOError(f"size mismatch for {self.name}: expected {self.size}, have {actual} ({self.done} written)")
+        os.replace(self.path + PART_SUFFIX, self.path)
+        try:
+            os.remove(self.path + JOURNAL_SUFFIX)
+        except OSError:
+            pass
+        return self.path
+
+    def _segment_worker(self, index, on_progress, errors):
+        try:
+            self._fetch_segment(index, on_progress)
+        except Exception as e:
+            errors.append(e)
+            # One failed segment fails the job; stop the others so the journal is written promptly
+            self._cancel.set()
+
+
+class DownloadJob:
+    def __init__(self, job_id, url, directory, name=None, title=None):
+        self.id = job_id
+        self.url = url
+        self.directory = directory
+        self.name = name
+        self.title = title
+        self.status = "queued"
+        self.error = None
+        self.path = None
+        self.download = None
+        self.finished_at = None
+
+    @property
+    def done(self):
+        return self.download.done if self.download else 0
+
+    @property
+    def total(self):
+        return self.download.size if self.download else None
+
+    @property
+    def mbps(self):
+        return self.download.mbps if self.download and self.status == "running" else 0.0
+
+    def to_dict(self):
+        name = self.download.name if self.download else self.name
+        return {"id": self.id, "url": self.url, "name": name, "title": self.title, "status": self.status,
+                "done": self.done, "total": self.total, "mbps": round(self.mbps, 2),
+                "path": self.path, "error": self.error}
+
+
+class DownloadManager:
+    """Queue of SegmentedDownloads run `max_jobs` at a time.
+
+    `on_update(job)` is called from worker threads whenever a job changes state.
+    """
+
+    def __init__(self, directory=None, max_jobs=None, segments=None, on_update=None):
+        dl_cfg = getattr(cfg, "downloads", {}) if cfg else {}
+        self.directory = directory or dl_cfg.get("directory", DEFAULT_DIRECTORY)
+        self.max_jobs = max_jobs or dl_cfg.get("max_jobs", DEFAULT_MAX_JOBS)
+        self.segments = segments
+        self.on_update = on_update
+        self.jobs = []
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._workers = []
+
+    def _start_workers(self):
+        if self._workers:
+            return
+        for _ in range(self.max_jobs):
+            t = threading.Thread(target=self._worker, daemon=True)
+            t.start()
+            self._workers.append(t)
+
+    def add(self, url, name=None, title=None, directory=None):
+        with self._lock:
+            job = DownloadJob(self._next_id, url, directory or self.directory, name, title)
+            self._next_id += 1
+            self.jobs.append(job)
+            self._start_workers()
+        self._queue.put(job)
+        self._notify(job)
+        return job
+
+    def cancel(self, job_id):
+        with self._lock:
+            # Under the lock a worker either has not picked the job up yet or has set job.download
+            job = next((j for j in self.jobs if j.id == job_id and j.status in ("queued", "running")), None)
+            if job is None:
+                return False
+            if job.download:
+                job.download.cancel()
+            job.status = "cancelled"
+        self._notify(job)
+        return True
+
+    def stats(self):
+        running = [j for j in self.jobs if j.status == "running"]
+        return {
+            "queued": sum(1 for j in self.jobs if j.status == "queued"),
+            "running": len(running),
+            "done": sum(1 for j in self.jobs if j.status == "done"),
+            "failed": sum(1 for j in self.jobs if j.status == "failed"),
+            "mbps": round(sum(j.mbps for j in running), 2),
+        }
+
+    def _notify(self, job):
+        if self.on_update:
+            try:
+                self.on_update(job)
+            except Exception:
+                pass
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            with self._lock:
+                if job.status == "cancelled":
+                    continue
+                job.download = SegmentedDownload(job.url, job.directory, job.name, segments=self.segments)
+                job.status = "running"
+            self._notify(job)
+            try:
+                path = job.download.run()
+                status, error = "done", None
+            except DownloadCancelled:
+                path, status, error = None, "cancelled", None
+            except Exception as e:
+                path, status, error = None, "failed", str(e)
+            with self._lock:
+                if path:
+                    job.path = path
+                    job.name = job.download.name
+                if error:
+                    job.error = error
+                job.status = status
+                job.finished_at = time.time()
+            self._notify(job)
+
+    def shutdown(self):
+        for job in self.jobs:
+            if job.download and job.status == "running":
+                job.download.cancel()
+        for _ in self._workers:
+            self._queue.put(None)
@@ -0,0 +1,289 @@
+import ftplib
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from src.metrics import metrics
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DEFAULT_POOL_SIZE = 2
+DEFAULT_TIMEOUT = 30
+DEFAULT_MAX_RETRIES = 3
+PROGRESS_INTERVAL = 0.25
+
+# Errors after which a connection is dropped and the upload resumed on a fresh one
+CONNECTION_ERRORS = (OSError, EOFError, ftplib.error_temp, ftplib.error_reply)
+
+
+def record_transfer(kind, result):
+    """Count a finished upload/stream result dict in the metrics registry."""
+    metrics.observe("ftp_transfer_seconds", result["seconds"], kind=kind)
+    metrics.inc("ftp_transfers_total", kind=kind, result="ok" if result["ok"] else "error")
+    metrics.inc("ftp_bytes_total", result["bytes"], kind=kind)
+
+
+class TransferProgress:
+    """Byte counter for one upload with MB/s and ETA over the bytes sent in this session."""
+
+    def __init__(self, name, total, offset=0):
+        self.name = name
+        self.total = total
+        self.offset = offset
+        self.done = offset
+        self.started = time.monotonic()
+        self._reported = 0.0
+
+    def add(self, size):
+        self.done += size
+
+    @property
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def mbps(self):
+        elapsed = self.elapsed
+        return (self.done - self.offset) / elapsed / (1024 * 1024) if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        rate = self.mbps * 1024 * 1024
+        if self.total is None or rate <= 0:
+            return None
+        return (self.total - self.done) / rate
+
+    @property
+    def percent(self):
+        # `total` is None for streams of unknown length
+        if self.total is None:
+            return None
+        return 100.0 * self.done / self.total if self.total else 100.0
+
+    def due(self):
+        # Rate-limit progress callbacks; a 1 MB block size would otherwise fire hundreds per second
+        now = time.monotonic()
+        if now - self._reported >= PROGRESS_INTERVAL or (self.total is not None and self.done >= self.total):
+            self._reported = now
+            return True
+        return False
+
+    def __str__(self):
+        eta = self.eta
+        eta_text = f"{int(eta // 60)}m{int(eta % 60):02d}s" if eta is not None else "--"
+        if self.percent is None:
+            return f"{self.name}: {self.done / (1024 * 1024):.0f} MB {self.mbps:.1f} MB/s"
+        return f"{self.name}: {self.percent:.0f}% {self.mbps:.1f} MB/s ETA {eta_text}"
+
+
+class FTPPool:
+    """A few logged-in FTP connections kept open and handed out one at a time."""
+
+    def __init__(self, host, port=21, username="", password="", size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._homes = {}
+
+    def _open(self):
+        ftp = ftplib.FTP()
+        ftp.connect(self.host, self.port, timeout=self.timeout)
+        ftp.login(self.username, self.password)
+        ftp.voidcmd("TYPE I")
+        self._homes[id(ftp)] = ftp.pwd()
+        return ftp
+
+    def _alive(self, ftp):
+        try:
+            ftp.voidcmd("NOOP")
+            return True
+        except Exception:
+            return False
+
+    def discard(self, ftp):
+        self._homes.pop(id(ftp), None)
+        try:
+            ftp.close()
+        except Exception:
+            pass
+
+    @contextmanager
+    def connection(self):
+        """Yield a logged-in connection in its login directory; broken ones are not returned to the pool."""
+        self._slots.acquire()
+        ftp = None
+        try:
+            while ftp is None:
+                try:
+                    ftp = self._idle.get_nowait()
+                except queue.Empty:
+                    ftp = self._open()
+                    break
+                if not self._alive(ftp):
+                    self.discard(ftp)
+                    ftp = None
+            ftp.cwd(self._homes[id(ftp)])
+            yield ftp
+        except CONNECTION_ERRORS:
+            if ftp is not None:
+                self.discard(ftp)
+                ftp = None
+            raise
+        finally:
+            if ftp is not None:
+                self._idle.put(ftp)
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                ftp = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                ftp.quit()
+            except Exception:
+                pass
+            self.discard(ftp)
+
+
+def remote_size(ftp, name):
+    try:
+        size = ftp.size(name)
+    except ftplib.error_perm:
+        return None
+    return size
+
+
+class FTPUploader:
+    """Queued uploads over an FTPPool with resume and progress reporting.
+
+    upload() returns {"file", "remote", "ok", "bytes", "resumed_from", "seconds", "mbps"}
+    plus "error" on failure. A connection lost mid-upload is retried, resuming
+    with REST from the size the server already has. A file that is already on
+    the server is overwritten unless the caller passes resume=True; a remote
+    file of the same name may be unrelated to this one.
+    """
+
+    def __init__(self, host, port=21, username="", password="", pool_size=None, block_size=None,
+                 timeout=None, max_retries=None):
+        ftp_cfg = getattr(cfg, "ftp", {}) if cfg else {}
+        self.block_size = block_size or ftp_cfg.get("block_size", DEFAULT_BLOCK_SIZE)
+        self.max_retries = max_retries if max_retries is not None else ftp_cfg.get("max_retries", DEFAULT_MAX_RETRIES)
+        self.pool = FTPPool(host, port, username, password,
+                            size=pool_size or ftp_cfg.get("pool_size", DEFAULT_POOL_SIZE),
+                            timeout=timeout or ftp_cfg.get("timeout", DEFAULT_TIMEOUT))
+
+    @classmethod
+    def from_config(cls, ftp_config):
+        return cls(ftp_config["host"], int(ftp_config.get("port", 21)),
+                   ftp_config.get("username", ""), ftp_config.get("password", ""))
+
+    def _cwd(self, ftp, remote_dir):
+        if remote_dir and remote_dir != "/":
+            ftp.cwd(remote_dir)
+
+    def _store(self, local_path, remote_dir, name, total, resume, progress, offsets):
+        with self.pool.connection() as ftp:
+            self._cwd(ftp, remote_dir)
+            offset = 0
+            if resume:
+                existing = remote_size(ftp, name)
+                if existing is not None and existing <= total:
+                    offset = existing
+            offsets.append(offset)
+            state = TransferProgress(name, total, offset)
+            if offset < total or total == 0:
+                def on_block(block):
+                    state.add(len(block))
+                    if progress and state.due():
+                        progress(state)
+
+                with open(local_path, "rb") as f:
+                    f.seek(offset)
+                    ftp.storbinary(f"STOR {name}", f, self.block_size, on_block, rest=offset or None)
+            final = remote_size(ftp, name)
+            if final is not None and final != total:
+                raise ftplib.error_temp(f"451 remote size {final} != local size {total}")
+            if progress:
+                progress(state)
+
+    def upload(self, local_path, remote_dir="/", remote_name=None, resume=False, progress=None):
+        name = remote_name or os.path.basename(local_path)
+        total = os.path.getsize(local_path)
+        result = {"file": local_path, "remote": f"{(remote_dir or '/').rstrip('/')}/{name}", "ok": False,
+                  "bytes": 0, "resumed_from": 0, "seconds": 0.0, "mbps": 0.0}
+        started = time.monotonic()
+        offsets = []
+        for attempt in range(self.max_retries + 1):
+            try:
+                # Retries resume from what this call already sent; the first attempt only on request
+                self._store(local_path, remote_dir, name, total, resume or attempt > 0, progress, offsets)
+                result.update(ok=True, bytes=total - offsets[0], resumed_from=offsets[0])
+                break
+            except ftplib.error_perm as e:
+                result["error"] = str(e)
+                break
+            except CONNECTION_ERRORS as e:
+                result["error"] = str(e)
+                if attempt < self.max_retries:
+                    metrics.inc("ftp_retries_total", kind="upload")
+                    time.sleep(min(2 ** attempt, 10))
+        if result["ok"]:
+            result.pop("error", None)
+        result["seconds"] = round(time.monotonic() - started, 3)
+        if result["seconds"] > 0:
+            result["mbps"] = round(result["bytes"] / result["seconds"] / (1024 * 1024), 2)
+        record_transfer("upload", result)
+        return result
+
+    def partial_uploads(self, files, remote_dir="/"):
+        """{path: remote size} for files the server already holds part of, e.g. from an interrupted run.
+
+        Only same-named remote files that are smaller than the local one count;
+        whether they really are earlier attempts is for the user to decide.
+        """
+        partial = {}
+        with self.pool.connection() as ftp:
+            self._cwd(ftp, remote_dir)
+            for path in files:
+                existing = remote_size(ftp, os.path.basename(path))
+                if existing and existing < os.path.getsize(path):
+                    partial[path] = existing
+        return partial
+
+    def upload_many(self, files, remote_dir="/", resume=False, progress=None, callback=None):
+        """Upload every path in `files` through the pool; `callback(result)` runs as each finishes.
+
+        `resume` is True/False for all files, or a collection of the paths to resume.
+        """
+        def run(path):
+            resume_path = resume if isinstance(resume, bool) else path in resume
+            result = self.upload(path, remote_dir, resume=resume_path, progress=progress)
+            if callback:
+                try:
+                    callback(result)
+                except Exception:
+                    pass
+            return result
+
+        files = list(files)
+        if not files:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.pool.size, len(files))) as pool:
+            return list(pool.map(run, files))
+
+    def close(self):
+        self.pool.close()
@@ -0,0 +1,178 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_HISTORY_FILE = "download_history.db"
+LEGACY_HISTORY_FILE = "download_history.json"
+DEFAULT_COMPACT_INTERVAL = 7 * 24 * 3600
+DEFAULT_RETENTION_DAYS = 0
+
+
+def hoster_of(url):
+    try:
+        return urlparse(url).netloc.lower().replace("www.", "") or None
+    except ValueError:
+        return None
+
+
+class HistoryStore:
+    """Download history in SQLite: O(1) appends and indexed, paginated queries.
+
+    Entries are the dicts the GUI always used ({"timestamp", "game_title",
+    "original_link", "download_link"}) plus "id" and "hoster". A legacy
+    download_history.json is imported the first time the store is opened.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS history (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            timestamp REAL NOT NULL,
+            game_title TEXT,
+            original_link TEXT,
+            download_link TEXT,
+            hoster TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_history_timestamp ON history (timestamp);
+        CREATE INDEX IF NOT EXISTS idx_history_title ON history (game_title COLLATE NOCASE);
+        CREATE INDEX IF NOT EXISTS idx_history_hoster ON history (hoster);
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+    COLUMNS = "id, timestamp, game_title, original_link, download_link, hoster"
+
+    def __init__(self, path=None, legacy_path=LEGACY_HISTORY_FILE, compact_interval=None, retention_days=None):
+        history_cfg = getattr(cfg, "history", {}) if cfg else {}
+        self.path = path or history_cfg.get("file", DEFAULT_HISTORY_FILE)
+        self.legacy_path = legacy_path
+        self.compact_interval = compact_interval if compact_interval is not None else \
+            history_cfg.get("compact_interval", DEFAULT_COMPACT_INTERVAL)
+        self.retention_days = retention_days if retention_days is not None else \
+            history_cfg.get("retention_days", DEFAULT_RETENTION_DAYS)
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+            if self.legacy_path and os.path.exists(self.legacy_path) and not self._meta("imported"):
+                self._import_legacy()
+        return self._conn
+
+    def _meta(self, key, value=None):
+        if value is None:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+        with self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def _import_legacy(self):
+        try:
+            with open(self.legacy_path, "r", encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[WARNING] Could not import {self.legacy_path}: {e}")
+            entries = []
+        self._insert(entries)
+        self._meta("imported", time.time())
+
+    def _insert(self, entries):
+        rows = [(e.get("timestamp") or time.time(), e.get("game_title"), e.get("original_link"),
+                 e.get("download_link"), hoster_of(e.get("original_link") or ""))
+                for e in entries]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO history (timestamp, game_title, original_link, download_link, hoster) "
+                "VALUES (?, ?, ?, ?, ?)", rows)
+
+    def load(self):
+        """Open the store (importing the legacy file) and compact it if it is due."""
+        with self._lock:
+            self._connect()
+            last = float(self._meta("compacted_at") or 0)
+            if self.compact_interval and time.time() - last >= self.compact_interval:
+                self.compact()
+        return self
+
+    def add(self, game_title, original_link, download_link, timestamp=None):
+        entry = {"timestamp": timestamp or time.time(), "game_title": game_title,
+                 "original_link": original_link, "download_link": download_link}
+        self.add_many([entry])
+        return entry
+
+    def add_many(self, entries):
+        with self._lock:
+            self._connect()
+            self._insert(entries)
+
+    def _where(self, since=None, until=None, title=None, hoster=None, before_id=None):
+        clauses, params = [], []
+        if since is not None:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if title:
+            # Prefix match so the NOCASE title index is used
+            clauses.append("game_title LIKE ?")
+            params.append(title.replace("%", "").replace("_", "") + "%")
+        if hoster:
+            clauses.append("hoster = ?")
+            params.append(hoster.lower())
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, limit=50, before_id=None, since=None, until=None, title=None, hoster=None):
+        """Newest-first page of entries; pass the last entry's "id" as `before_id` for the next page."""
+        where, params = self._where(since, until, title, hoster, before_id)
+        with self._lock:
+            rows = self._connect().execute(
+                f"SELECT {self.COLUMNS} FROM history{where} ORDER BY id DESC LIMIT ?", params + [limit]).fetchall()
+        return [dict(row) for row in rows]
+
+    def count(self, since=None, until=None, title=None, hoster=None):
+        where, params = self._where(since, until, title, hoster)
+        with self._lock:
+            return self._connect().execute(f"SELECT COUNT(*) FROM history{where}", params).fetchone()[0]
+
+    def hosters(self):
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT hoster, COUNT(*) FROM history WHERE hoster IS NOT NULL GROUP BY hoster ORDER BY 2 DESC").fetchall()
+        return [(row[0], row[1]) for row in rows]
+
+    def since(self, timestamp):
+        return self.query(limit=-1, since=timestamp)
+
+    def compact(self):
+        """Drop entries past the retention period; repeat downloads of a link are kept."""
+        with self._lock:
+            conn = self._connect()
+            removed = 0
+            with conn:
+                if self.retention_days:
+                    removed = conn.execute("DELETE FROM history WHERE timestamp < ?",
+                                           (time.time() - self.retention_days * 86400,)).rowcount
+            if removed:
+                conn.execute("VACUUM")
+            self._meta("compacted_at", time.time())
+        return removed
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
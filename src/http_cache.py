@@ -0,0 +1,179 @@
+import json
+import sqlite3
+import threading
+import time
+import zlib
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_HTTP_CACHE_FILE = "http_cache.db"
+
+
+class HTTPCache:
+    """Disk-backed store of response bodies, their validators and what we parsed out of them."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            body BLOB,
+            parsed TEXT,
+            stored_at REAL
+        );
+    """
+
+    def __init__(self, path=None):
+        scraper_cfg = getattr(cfg, "scraper", {}) if cfg else {}
+        self.path = path or scraper_cfg.get("http_cache_file", DEFAULT_HTTP_CACHE_FILE)
+        self._conn = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def validators(self, url):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT etag, last_modified FROM responses WHERE url = ?", (url,)).fetchone()
+        return row or (None, None)
+
+    def body(self, url):
+        with self._lock:
+            row = self._connect().execute("SELECT body FROM responses WHERE url = ?", (url,)).fetchone()
+        return zlib.decompress(row[0]) if row and row[0] is not None else None
+
+    def store(self, url, etag, last_modified, body):
+        self.store_many([(url, etag, last_modified, body)])
+
+    def store_many(self, responses):
+        """store() for a batch of (url, etag, last_modified, body) in one transaction."""
+        # A new body invalidates whatever was parsed from the old one
+        now = time.time()
+        rows = [(url, etag, last_modified, zlib.compress(body), now) for url, etag, last_modified, body in responses]
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO responses (url, etag, last_modified, body, parsed, stored_at) "
+                    "VALUES (?, ?, ?, ?, NULL, ?)", rows)
+
+    def get_parsed(self, url):
+        with self._lock:
+            row = self._connect().execute("SELECT parsed FROM responses WHERE url = ?", (url,)).fetchone()
+        if not row or row[0] is None:
+            return None
+        try:
+            return json.loads(row[0])
+        except ValueError:
+            return None
+
+    def set_parsed(self, url, value):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute("UPDATE responses SET parsed = ? WHERE url = ?", (json.dumps(value), url))
+
+    def record_hit(self, size):
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += size
+
+    def record_miss(self):
+        with self._lock:
+            self.misses += 1
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "bytes_saved": self.bytes_saved}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class DeferredHTTPCache(HTTPCache):
+    """Reads an HTTPCache file but holds new responses back for another process to store.
+
+    Crawl worker processes use it so the parent stays the file's only writer;
+    take() hands over (and forgets) what was fetched since the last call.
+    """
+
+    def __init__(self, path=None):
+        super().__init__(path)
+        self.pending = []
+
+    def store_many(self, responses):
+        with self._lock:
+            self.pending.extend(responses)
+
+    def set_parsed(self, url, value):
+        pass
+
+    def take(self):
+        with self._lock:
+            pending, self.pending = self.pending, []
+        return pending
+
+
+class CachedResponse:
+    """Stand-in for a requests.Response rebuilt from the cache after a 304."""
+
+    status_code = 200
+    not_modified = True
+
+    def __init__(self, url, content):
+        self.url = url
+        self.content = content
+
+    def raise_for_status(self):
+        pass
+
+
+class ConditionalSession:
+    """Wraps a requests-compatible session with If-None-Match / If-Modified-Since revalidation.
+
+    Responses come back with a `not_modified` attribute; when it is True the
+    body is the cached copy and callers may reuse what they parsed from it.
+    """
+
+    def __init__(self, session, cache):
+        self.session = session
+        self.cache = cache
+
+    def get(self, url, **kwargs):
+        etag, last_modified = self.cache.validators(url)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        response = self.session.get(url, headers=headers, **kwargs)
+        if response.status_code == 304:
+            body = self.cache.body(url)
+            if body is not None:
+                self.cache.record_hit(len(body))
+                return CachedResponse(url, body)
+            # Validators without a body should not happen; fetch unconditionally
+            response = self.session.get(url, **kwargs)
+
+        self.cache.record_miss()
+        response.not_modified = False
+        new_etag = response.headers.get("ETag")
+        new_last_modified = response.headers.get("Last-Modified")
+        if response.status_code == 200 and (new_etag or new_last_modified):
+            self.cache.store(url, new_etag, new_last_modified, response.content)
+        return response
@@ -0,0 +1,163 @@
+import re
+from collections import namedtuple
+from itertools import groupby
+from urllib.parse import urlparse
+
+# Hoster domain -> display name, extended by scraper.hosters in settings.json
+KNOWN_HOSTERS = {
+    "1fichier.com": "1fichier",
+    "akirabox.com": "AkiraBox",
+    "buzzheavier.com": "BuzzHeavier",
+    "datanodes.to": "DataNodes",
+    "ddownload.com": "DDownload",
+    "drive.google.com": "Google Drive",
+    "gofile.io": "Gofile",
+    "katfile.com": "Katfile",
+    "krakenfiles.com": "KrakenFiles",
+    "mediafire.com": "MediaFire",
+    "mega.co.nz": "Mega",
+    "mega.nz": "Mega",
+    "nitroflare.com": "Nitroflare",
+    "pixeldrain.com": "Pixeldrain",
+    "qiwi.gg": "Qiwi",
+    "rapidgator.net": "Rapidgator",
+    "rg.to": "Rapidgator",
+    "send.cm": "Send.cm",
+    "turbobit.net": "Turbobit",
+    "uploadhaven.com": "UploadHaven",
+    "uptobox.com": "Uptobox",
+    "usersdrive.com": "UsersDrive",
+}
+
+# "Part 3", "part03", "Game.part2.rar", "Game.pkg.001"
+PART_RE = re.compile(r"part[\s._-]*0*(\d{1,3})(?!\d)|\.0*(\d{1,3})(?:$|[?#])", re.IGNORECASE)
+# Scheme, optional userinfo, then the hostname; cheaper than urlsplit() per link
+HOST_RE = re.compile(r"https?://(?:[^/?#@]*@)?([^/?#:]+)", re.IGNORECASE)
+# The common case, no userinfo or port; anything else falls back to HOST_RE
+PLAIN_HOST_RE = re.compile(r"https?://([^/?#:@]+)(?=[/?#]|$)")
+MIN_LINK_LENGTH = 16
+
+LinkInfo = namedtuple("LinkInfo", "url host hoster part known")
+
+
+def host_name(url):
+    try:
+        domain = urlparse(url).netloc
+        parts = domain.replace("www.", "").split(".")
+        return parts[0].capitalize() if parts else "Link"
+    except Exception:
+        return "Link"
+
+
+def part_number(*texts):
+    for text in texts:
+        if text:
+            match = PART_RE.search(text)
+            if match:
+                return int(match.group(1) or match.group(2))
+    return None
+
+
+class LinkClassifier:
+    """Decides which hrefs are download links and which hoster and part they are.
+
+    `ignore_domains` entries containing a dot ("wp.com") match that domain and
+    its subdomains; bare words ("facebook") match anywhere in the hostname.
+    They are compiled into one regex over the hostname and verdicts are
+    memoized per hostname, so a page of links costs one regex match and one
+    dict lookup per link. Ignore entries always win, known hosters included:
+    "google.com" drops drive.google.com links too.
+    """
+
+    def __init__(self, ignore_domains=(), hosters=None):
+        self.ignore_domains = tuple(d.strip().lower() for d in ignore_domains if d and d.strip())
+        self.hosters = dict(KNOWN_HOSTERS)
+        self.hosters.update({domain.lower(): name for domain, name in (hosters or {}).items()})
+        patterns = [r"(?:^|\.)" + re.escape(d) + "$" if "." in d else re.escape(d) for d in self.ignore_domains]
+        self._ignore = re.compile("|".join(patterns)) if patterns else None
+        self._hosts = {}
+
+    def _host_verdict(self, host):
+        """(keep, hoster name, known) for a lowercase hostname."""
+        verdict = self._hosts.get(host)
+        if verdict is None:
+            if self._ignore is not None and self._ignore.search(host):
+                verdict = (False, None, False)
+            else:
+                labels = host.split(".")
+                domain = next((".".join(labels[i:]) for i in range(len(labels) - 1)
+                               if ".".join(labels[i:]) in self.hosters), None)
+                if domain:
+                    verdict = (True, self.hosters[domain], True)
+                else:
+                    first = labels[1] if labels[0] == "www" and len(labels) > 1 else labels[0]
+                    verdict = (True, first.capitalize(), False)
+            self._hosts[host] = verdict
+        return verdict
+
+    def _host(self, url):
+        """Lowercase hostname of an http(s) URL, or None."""
+        if not url.startswith("http") or len(url) < MIN_LINK_LENGTH:
+            return None
+        match = PLAIN_HOST_RE.match(url) or HOST_RE.match(url)
+        return match.group(1).lower() if match else None
+
+    def classify(self, url, label=None):
+        """LinkInfo for a download link, or None when it is ignored or not a web link."""
+        host = self._host(url)
+        if host is None:
+            return None
+        keep, hoster, known = self._host_verdict(host)
+        if not keep:
+            return None
+        return LinkInfo(url, host, hoster, part_number(label, url), known)
+
+    def accepts(self, url):
+        """classify() without the hoster/part details, for filtering only."""
+        host = self._host(url)
+        return host is not None and (self._hosts.get(host) or self._host_verdict(host))[0]
+
+
+_default = LinkClassifier()
+
+
+def display_rows(links, classifier=None):
+    """Rows for the links list as [display text, url, group, hoster, part], in display order.
+
+    Grouped links ({"group", "label", "url"}) are ordered by group, then part
+    number; plain URL lists keep their order and have no group. Computed once
+    when an entry is saved so redisplaying it does no sorting or URL parsing.
+    """
+    classifier = classifier or _default
+    rows = []
+    if not links:
+        return rows
+    if isinstance(links[0], dict):
+        ordered = sorted(links, key=lambda x: x.get("group", "Misc"))
+        for group_name, group_items in groupby(ordered, key=lambda x: x.get("group", "Misc")):
+            group_rows = []
+            for item in group_items:
+                url = item.get("url", "")
+                label = item.get("label", "Link")
+                info = classifier.classify(url, label)
+                hoster = info.hoster if info else host_name(url)
+                part = info.part if info else None
+                group_rows.append([f"{group_name} - {label} ({hoster})", url, group_name, hoster, part])
+            # Stable, so unnumbered links keep their page order
+            group_rows.sort(key=lambda row: (row[4] is None, row[4] or 0))
+            rows.extend(group_rows)
+    else:
+        for link in links:
+            info = classifier.classify(link)
+            hoster = info.hoster if info else host_name(link)
+            rows.append([f"{hoster}: {link}", link, None, hoster, info.part if info else None])
+    return rows
+
+
+def hosters_in(rows):
+    """Distinct hoster names in display rows, most links first."""
+    counts = {}
+    for row in rows:
+        if len(row) > 3 and row[3]:
+            counts[row[3]] = counts.get(row[3], 0) + 1
+    return sorted(counts, key=lambda name: (-counts[name], name))
@@ -0,0 +1,180 @@
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.metrics import metrics
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_TTL = 21600
+DEFAULT_WORKERS = 16
+DEFAULT_PER_HOST_LIMIT = 4
+DEFAULT_TIMEOUT = 10
+
+ALIVE = "alive"
+DEAD = "dead"
+UNKNOWN = "unknown"
+
+# Answers that mean the file is gone rather than that the probe was refused
+DEAD_STATUSES = (404, 410, 451)
+
+
+def link_status(url, state, size=None, code=None, via="http"):
+    return {"url": url, "state": state, "size": size, "code": code, "via": via, "checked": time.time()}
+
+
+def response_size(response):
+    """File size from a HEAD or one-byte ranged GET, or None for pages and unknown lengths."""
+    if response.status_code == 206:
+        total = response.headers.get("Content-Range", "").rpartition("/")[2]
+        return int(total) if total.isdigit() else None
+    if "text/html" in response.headers.get("Content-Type", ""):
+        # A hoster's landing page, not the file
+        return None
+    length = response.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def game_link_urls(links):
+    """Hoster URLs of a game's links, grouped ({"url": ...}) or plain."""
+    return [link.get("url") if isinstance(link, dict) else link for link in links or []]
+
+
+class LinkChecker:
+    """Probes hoster links in parallel and caches alive/dead/size in GameCache.
+
+    Each link gets a HEAD request; hosts that refuse HEAD get a one-byte
+    ranged GET instead. With a RealDebridAPI, its `/unrestrict/check`
+    endpoint is asked first, which also catches hosters that answer 200 for
+    removed files. Only 404/410/451, or Real-Debrid reporting the file gone,
+    count as dead. Results younger than `ttl` come from the cache; unknown
+    results (network errors, refusals, 5xx, rate limits) are never cached.
+    """
+
+    def __init__(self, db=None, rd=None, workers=None, per_host_limit=None, timeout=None, ttl=None, session=None):
+        liveness_cfg = getattr(cfg, "liveness", {}) if cfg else {}
+        self.db = db
+        self.rd = rd
+        self.workers = max(1, workers or liveness_cfg.get("workers", DEFAULT_WORKERS))
+        self.per_host_limit = per_host_limit or liveness_cfg.get("per_host_limit", DEFAULT_PER_HOST_LIMIT)
+        self.timeout = timeout or liveness_cfg.get("timeout", DEFAULT_TIMEOUT)
+        self.ttl = ttl if ttl is not None else liveness_cfg.get("ttl", DEFAULT_TTL)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(1, self.workers))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+
+    def _host_slot(self, url):
+        host = urllib.parse.urlparse(url).netloc.lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(max(1, self.per_host_limit))
+                self._host_slots[host] = slot
+        return slot
+
+    def probe(self, url):
+        """Status of one link from the hoster itself."""
+        try:
+            with self._host_slot(url), metrics.timer("liveness_probe_seconds"):
+                response = self.session.head(url, allow_redirects=True, timeout=self.timeout)
+                if response.status_code >= 400 and response.status_code not in DEAD_STATUSES:
+                    # HEAD refused (405/501, or 403 on some hosters): ask for one byte instead
+                    response = self.session.get(url, headers={"Range": "bytes=0-0"}, stream=True,
+                                                allow_redirects=True, timeout=self.timeout)
+                    response.close()
+        except requests.RequestException:
+            # Timeouts, refused connections, DNS and SSL failures say nothing about the file
+            return link_status(url, UNKNOWN)
+
+        code = response.status_code
+        if code < 400:
+            return link_status(url, ALIVE, response_size(response), code)
+        if code in DEAD_STATUSES:
+            return link_status(url, DEAD, code=code)
+        # 401/403 and other refusals, rate limits and server errors
+        return link_status(url, UNKNOWN, code=code)
+
+    def rd_check(self, url):
+        """Status from Real-Debrid, or None when it cannot tell (unsupported hoster, errors)."""
+        try:
+            result = self.rd.check_link(url)
+        except Exception:
+            return None
+        if "error" not in result:
+            size = result.get("filesize")
+            return link_status(url, ALIVE, int(size) if size else None, 200, via="real-debrid")
+        if result.get("status") == 503:
+            return link_status(url, DEAD, code=503, via="real-debrid")
+        return None
+
+    def _check_one(self, url):
+        status = self.rd_check(url) if self.rd is not None else None
+        return status or self.probe(url)
+
+    def check(self, urls, force=False, callback=None):
+        """{url: status} for `urls`; cached results younger than the TTL are reused unless `force`.
+
+        `callback(status)` runs as each result arrives, cached ones first.
+        """
+        urls = [url for url in dict.fromkeys(urls) if url]
+        results = {} if force or self.db is None or not urls else self.db.link_status(urls, self.ttl)
+        for status in results.values():
+            metrics.inc("liveness_checks_total", result="cached")
+            if callback:
+                callback(status)
+
+        pending = [url for url in urls if url not in results]
+        fresh = []
+        if pending:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(pending))) as pool:
+                for future in as_completed([pool.submit(self._check_one, url) for url in pending]):
+                    status = future.result()
+                    results[status["url"]] = status
+                    metrics.inc("liveness_checks_total", result=status["state"])
+                    if status["state"] != UNKNOWN:
+                        fresh.append(status)
+                    if callback:
+                        callback(status)
+        if self.db is not None:
+            self.db.save_link_status(fresh)
+        return {url: results[url] for url in urls}
+
+    def check_game(self, links, force=False, callback=None):
+        return self.check(game_link_urls(links), force=force, callback=callback)
+
+    def check_catalogue(self, limit=None, force=False, batch_size=200, on_game=None):
+        """Check the links of every cached game, a batch of games at a time.
+
+        `on_game(game, {url: status})` runs per game. Returns the totals.
+        """
+        counts = {"games": 0, "links": 0, ALIVE: 0, DEAD: 0, UNKNOWN: 0}
+        games = self.db.cached_games(limit)
+        for start in range(0, len(games), batch_size):
+            batch = []
+            for game in games[start:start + batch_size]:
+                entry = self.db.backend.get(game["url"])
+                if entry:
+                    batch.append((game, game_link_urls(entry.get("links"))))
+            results = self.check([url for _, urls in batch for url in urls], force=force)
+            for game, urls in batch:
+                statuses = {url: results[url] for url in urls if url in results}
+                counts["games"] += 1
+                counts["links"] += len(statuses)
+                for status in statuses.values():
+                    counts[status["state"]] += 1
+                if on_game:
+                    on_game(game, statuses)
+        return counts
+
@@ -0,0 +1,168 @@
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+# Upper bounds (seconds) of the latency histogram buckets
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class Histogram:
+    __slots__ = ("count", "sum", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "avg_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "min_ms": round(self.min * 1000, 3) if self.min is not None else None,
+            "max_ms": round(self.max * 1000, 3) if self.max is not None else None,
+        }
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _label_text(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+class Metrics:
+    """Process-wide counters and latency histograms for the hot paths.
+
+    Names follow Prometheus conventions (`*_total` counters, `*_seconds`
+    timers); keyword arguments become labels. Cheap enough to leave on: one
+    lock and a dict lookup per observation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+        self.started = time.time()
+
+    def inc(self, name, value=1, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, seconds, **labels):
+        key = _key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time the block into `name`; an exception also counts `<name>_errors_total`."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.inc(f"{name.replace('_seconds', '')}_errors_total", error=type(e).__name__, **labels)
+            raise
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name, **labels):
+        """Decorator form of timer()."""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+            self.started = time.time()
+
+    def snapshot(self):
+        """{"counters": [...], "timers": [...]} with one entry per name and label set."""
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, h.to_dict()) for key, h in self._histograms.items())
+        return {
+            "uptime": round(time.time() - self.started, 1),
+            "counters": [{"name": name, "labels": dict(labels), "value": value} for (name, labels), value in counters],
+            "timers": [dict(stats, name=name, labels=dict(labels)) for (name, labels), stats in histograms],
+        }
+
+    def to_json(self, indent=4):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix="pkgscraper_"):
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted((key, h.count, h.sum, list(h.buckets)) for key, h in self._histograms.items())
+        lines = []
+        typed = set()
+        for (name, labels), value in counters:
+            full = prefix + name
+            if full not in typed:
+                lines.append(f"# TYPE {full} counter")
+                typed.add(full)
+            lines.append(f"{full}{_label_text(labels)} {value}")
+        for (name, labels), count, total, buckets in histograms:
+            full = prefix + name
+            if full not in typed:
+                lines.append(f"# TYPE {full} histogram")
+                typed.add(full)
+            cumulative = 0
+            for bound, hits in zip(BUCKETS, buckets):
+                cumulative += hits
+                lines.append(f"{full}_bucket{_label_text(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{full}_bucket{_label_text(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{full}_sum{_label_text(labels)} {total:.6f}")
+            lines.append(f"{full}_count{_label_text(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, fmt="prometheus"):
+        return self.to_json() if fmt == "json" else self.to_prometheus()
+
+
+metrics = Metrics()
+
+
+def profile(func, *args, sort="cumulative", limit=40, **kwargs):
+    """Run func(*args, **kwargs) under cProfile. Returns (result, stats text)."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        result = func(*args, **kwargs)
+    finally:
+        profiler.disable()
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats(sort).print_stats(limit)
+    return result, out.getvalue()
@@ -0,0 +1,166 @@
+import json
+import sys
+
+# Fixed metadata fields, in the order CacheEntry stores them
+METADATA_FIELDS = ("size", "version", "region", "password", "firmware", "voice", "subtitles", "cusa")
+MISSING = sys.intern("N/A")
+# Fields drawn from a small vocabulary shared by many games; sizes, versions,
+# languages and IDs are mostly unique and interning them would only pin them
+INTERNED_FIELDS = frozenset(("region", "firmware"))
+
+
+def intern(value):
+    """Share one copy of repeated strings ("N/A", region names, groups, labels)."""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def intern_field(key, value):
+    """intern() for vocabulary fields; other fields only share the "N/A" placeholder."""
+    if key in INTERNED_FIELDS:
+        return intern(value)
+    return MISSING if value == MISSING else value
+
+
+def intern_metadata(metadata):
+    for key, value in metadata.items():
+        metadata[key] = intern_field(key, value)
+    return metadata
+
+
+def intern_links(links):
+    """Intern the group and label of grouped links in place; URLs are unique and left alone."""
+    for link in links:
+        if isinstance(link, dict):
+            for key in ("group", "label"):
+                if key in link:
+                    link[key] = intern(link[key])
+    return links
+
+
+class GameResult:
+    """One search/listing result: a slotted record that still reads like the old dict.
+
+    `game["title"]`, `game.get("size")`, `game["size"] = ...` and `dict(game)`
+    keep working, so callers need not care. The cache-only fields (cusa,
+    region, version, cached) are only present when set.
+    """
+
+    __slots__ = ("title", "url", "image", "downloads", "size", "cusa", "region", "version", "cached")
+    BASE_FIELDS = ("title", "url", "image", "downloads", "size")
+
+    def __init__(self, title, url, image=None, downloads=MISSING, size=MISSING,
+                 cusa=None, region=None, version=None, cached=None):
+        self.title = title
+        self.url = url
+        self.image = image
+        self.downloads = intern_field("downloads", downloads)
+        self.size = intern_field("size", size)
+        self.cusa = cusa
+        self.region = intern_field("region", region)
+        self.version = intern_field("version", version)
+        self.cached = cached
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{key: data[key] for key in cls.__slots__ if key in data})
+
+    def keys(self):
+        return [key for key in self.__slots__ if key in self.BASE_FIELDS or getattr(self, key) is not None]
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, intern_field(key, value) if key in ("downloads", "size", "region", "version") else value)
+
+    def get(self, key, default=None):
+        value = getattr(self, key, None) if key in self.__slots__ else None
+        return default if value is None else value
+
+    def items(self):
+        return [(key, getattr(self, key)) for key in self.keys()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __repr__(self):
+        return f"GameResult({self.title!r}, {self.url!r})"
+
+
+class CacheEntry:
+    """Resident form of a cached game for backends that hold the whole cache in memory.
+
+    Metadata is a tuple in METADATA_FIELDS order with its repeated values interned; links
+    and display rows stay as compact JSON text and are only turned back into
+    lists when the entry is opened (to_dict()).
+    """
+
+    __slots__ = ("url", "title", "size", "downloads", "timestamp", "metadata", "extra", "links_json", "rows_json")
+
+    def __init__(self, url, title, size, downloads, timestamp, metadata, extra, links_json, rows_json):
+        self.url = url
+        self.title = title
+        self.size = size
+        self.downloads = downloads
+        self.timestamp = timestamp
+        self.metadata = metadata
+        self.extra = extra
+        self.links_json = links_json
+        self.rows_json = rows_json
+
+    @classmethod
+    def from_dict(cls, url, data):
+        meta = data.get("metadata") or {}
+        extra = {key: value for key, value in meta.items() if key not in METADATA_FIELDS} or None
+        rows = data.get("display_rows")
+        return cls(
+            url,
+            data.get("title"),
+            intern_field("size", data.get("size", MISSING)),
+            intern_field("downloads", data.get("downloads", MISSING)),
+            data.get("timestamp", 0),
+            tuple(intern_field(key, meta[key]) if key in meta else None for key in METADATA_FIELDS) if meta else None,
+            extra,
+            json.dumps(data.get("links") or [], separators=(",", ":")),
+            json.dumps(rows, separators=(",", ":")) if rows is not None else None,
+        )
+
+    def get_meta(self, key, default=None):
+        if self.metadata is not None and key in METADATA_FIELDS:
+            value = self.metadata[METADATA_FIELDS.index(key)]
+            return default if value is None else value
+        return (self.extra or {}).get(key, default)
+
+    @property
+    def links(self):
+        return json.loads(self.links_json)
+
+    def to_dict(self):
+        data = {
+            "url": self.url,
+            "title": self.title,
+            "size": self.size,
+            "downloads": self.downloads,
+            "links": self.links,
+            "timestamp": self.timestamp,
+        }
+        if self.metadata is not None:
+            meta = {key: value for key, value in zip(METADATA_FIELDS, self.metadata) if value is not None}
+            meta.update(self.extra or {})
+            data["metadata"] = meta
+        if self.rows_json is not None:
+            data["display_rows"] = json.loads(self.rows_json)
+        return data
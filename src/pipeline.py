@@ -0,0 +1,224 @@
+import os
+import queue
+import re
+import threading
+import time
+import urllib.parse
+
+import requests
+
+from src.ftp_transfer import CONNECTION_ERRORS, TransferProgress, record_transfer, remote_size
+from src.metrics import metrics
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+DEFAULT_BUFFER_MB = 16
+DEFAULT_TIMEOUT = 30
+
+_EOF = object()
+
+
+class ChunkQueueReader:
+    """File-like object fed by a producer thread through a bounded queue.
+
+    put() blocks while the queue is full, so a slow FTP upload throttles the
+    HTTP download instead of letting chunks pile up in memory.
+    """
+
+    def __init__(self, max_chunks):
+        self._queue = queue.Queue(max(1, max_chunks))
+        self._pending = b""
+        self._done = False
+        self._closed = threading.Event()
+        self.error = None
+
+    def put(self, chunk):
+        """Queue a chunk; returns False once the reader was closed by the consumer."""
+        while not self._closed.is_set():
+            try:
+                self._queue.put(chunk, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def finish(self, error=None):
+        self.error = error
+        self.put(_EOF)
+
+    def read(self, size=-1):
+        if not self._pending:
+            if self._done:
+                return b""
+            chunk = self._queue.get()
+            if chunk is _EOF:
+                self._done = True
+                if self.error is not None:
+                    # OSError so the FTP side treats it like a dropped connection and resumes
+                    raise OSError(f"download failed: {self.error}")
+                return b""
+            self._pending = chunk
+        if size is None or size < 0 or size >= len(self._pending):
+            data, self._pending = self._pending, b""
+        else:
+            data, self._pending = self._pending[:size], self._pending[size:]
+        return data
+
+    def close(self):
+        self._closed.set()
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+
+
+def filename_from_response(response, url):
+    disposition = response.headers.get("Content-Disposition", "")
+    match = re.search(r'filename\*?=(?:UTF-8\'\')?"?([^";]+)"?', disposition, re.I)
+    if match:
+        return os.path.basename(urllib.parse.unquote(match.group(1)))
+    return os.path.basename(urllib.parse.unquote(urllib.parse.urlsplit(url).path)) or "download.pkg"
+
+
+class StreamTransfer:
+    """Streams an HTTP download straight into an FTP STOR, optionally teeing it into `tee_dir`.
+
+    Memory use is bounded by `buffer_mb`. A transfer interrupted mid-stream is
+    retried with an HTTP Range request from the size its own upload reached on
+    the FTP server. A file already there before the transfer started is
+    overwritten unless send() is asked to resume it.
+    """
+
+    def __init__(self, uploader, session=None, buffer_mb=None, chunk_size=None, timeout=None):
+        ftp_cfg = getattr(cfg, "ftp", {}) if cfg else {}
+        self.uploader = uploader
+        self.session = session or requests.Session()
+        self.chunk_size = chunk_size or DEFAULT_CHUNK_SIZE
+        buffer_mb = buffer_mb or ftp_cfg.get("stream_buffer_mb", DEFAULT_BUFFER_MB)
+        self.max_chunks = max(1, buffer_mb * 1024 * 1024 // self.chunk_size)
+        self.timeout = timeout or ftp_cfg.get("timeout", DEFAULT_TIMEOUT)
+
+    def _open(self, url, offset):
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+        if offset and response.status_code == 416:
+            # Everything already reached the FTP server
+            return response, offset, offset
+        response.raise_for_status()
+        if offset and response.status_code != 206:
+            # Server ignored the range; start both sides over
+            offset = 0
+        length = response.headers.get("Content-Length")
+        total = offset + int(length) if length and length.isdigit() else None
+        return response, offset, total
+
+    def _download(self, response, reader, tee):
+        try:
+            for chunk in response.iter_content(self.chunk_size):
+                if tee is not None:
+                    tee.write(chunk)
+                if not reader.put(chunk):
+                    break
+            reader.finish()
+        except Exception as e:
+            reader.finish(e)
+        finally:
+            response.close()
+
+    def _send(self, url, remote_dir, name, tee_dir, progress, state, resume=False):
+        with self.uploader.pool.connection() as ftp:
+            self.uploader._cwd(ftp, remote_dir)
+            offset = 0
+            response = None
+            if name and state.get("sent"):
+                # Retry: pick up what this transfer's STOR left, never more than it sent
+                offset = min(remote_size(ftp, name) or 0, state["sent"])
+            elif resume and "offset" not in state:
+                # Continue what an earlier run left on the server; without a name, the response has it
+                if not name:
+                    response, offset, total = self._open(url, 0)
+                    name = filename_from_response(response, url)
+                offset = remote_size(ftp, name) or 0
+                state["sent"] = offset
+                if response is not None and offset:
+                    response.close()
+                    response = None
+            if response is None:
+                response, offset, total = self._open(url, offset)
+            name = name or filename_from_response(response, url)
+            state.setdefault("name", name)
+            state.setdefault("offset", offset)
+            if total is not None and offset >= total:
+                response.close()
+                return name, total
+
+            tee = None
+            if tee_dir:
+                tee_path = os.path.join(tee_dir, name)
+                tee = open(tee_path, "r+b" if offset and os.path.exists(tee_path) else "wb")
+                tee.seek(offset)
+                tee.truncate()
+            reader = ChunkQueueReader(self.max_chunks)
+            producer = threading.Thread(target=self._download, args=(response, reader, tee), daemon=True)
+            producer.start()
+            transfer = TransferProgress(name, total, offset)
+
+            def on_block(block):
+                transfer.add(len(block))
+                state["sent"] = transfer.done
+                if progress and transfer.due():
+                    progress(transfer)
+
+            try:
+                ftp.storbinary(f"STOR {name}", reader, self.uploader.block_size, on_block, rest=offset or None)
+            finally:
+                reader.close()
+                producer.join()
+                if tee is not None:
+                    tee.close()
+            if progress:
+                progress(transfer)
+            final = remote_size(ftp, name)
+            if total is not None and final is not None and final != total:
+                raise OSError(f"remote size {final} != download size {total}")
+            return name, final if final is not None else transfer.done
+
+    def send(self, url, remote_dir="/", name=None, tee_dir=None, progress=None, resume=False):
+        """Returns {"url", "remote", "ok", "bytes", "resumed_from", "seconds", "mbps"} plus "error" on failure.
+
+        With `resume`, a same-named file already on the server is taken to be an
+        earlier, interrupted attempt and continued instead of overwritten.
+        """
+        result = {"url": url, "remote": None, "ok": False, "bytes": 0, "resumed_from": 0, "seconds": 0.0, "mbps": 0.0}
+        state = {}
+        started = time.monotonic()
+        for attempt in range(self.uploader.max_retries + 1):
+            try:
+                name, size = self._send(url, remote_dir, name or state.get("name"), tee_dir, progress, state, resume)
+                offset = state.get("offset", 0)
+                result.update(ok=True, bytes=size - offset, resumed_from=offset)
+                result.pop("error", None)
+                break
+            except requests.HTTPError as e:
+                result["error"] = str(e)
+                break
+            except (requests.RequestException,) + CONNECTION_ERRORS as e:
+                result["error"] = str(e)
+                if attempt < self.uploader.max_retries:
+                    metrics.inc("ftp_retries_total", kind="stream")
+                    time.sleep(min(2 ** attempt, 10))
+            except Exception as e:
+                result["error"] = str(e)
+                break
+        if state.get("name"):
+            result["remote"] = f"{(remote_dir or '/').rstrip('/')}/{state['name']}"
+        result["seconds"] = round(time.monotonic() - started, 3)
+        if result["seconds"] > 0:
+            result["mbps"] = round(result["bytes"] / result["seconds"] / (1024 * 1024), 2)
+        record_transfer("stream", result)
+        return result
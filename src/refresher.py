@@ -0,0 +1,144 @@
+import queue
+import threading
+import time
+from datetime import datetime
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_RATE_PER_MINUTE = 6
+DEFAULT_REFRESH_WINDOW = [2, 6]
+DEFAULT_LEAD_TIME = 7 * 24 * 3600
+DEFAULT_CHECK_INTERVAL = 300
+
+
+class CacheRefresher:
+    """Background re-scraping of GameCache entries.
+
+    Two kinds of work share one thread:
+    - refresh_now(): on-demand refreshes of stale entries a user is looking at,
+      handled as soon as possible.
+    - sweep(): a scheduled pass that re-scrapes entries nearing expiry, only
+      inside the low-traffic window and paced to `rate_per_minute`.
+    """
+
+    def __init__(self, db, scraper, rate_per_minute=None, window=None, lead_time=None,
+                 check_interval=DEFAULT_CHECK_INTERVAL):
+        db_cfg = getattr(cfg, "database", {}) if cfg else {}
+        self.db = db
+        self.scraper = scraper
+        self.rate_per_minute = rate_per_minute or db_cfg.get("refresh_rate_per_minute", DEFAULT_RATE_PER_MINUTE)
+        self.window = window if window is not None else db_cfg.get("refresh_window", DEFAULT_REFRESH_WINDOW)
+        self.lead_time = lead_time if lead_time is not None else db_cfg.get("refresh_lead_time", DEFAULT_LEAD_TIME)
+        self.check_interval = check_interval
+        self._queue = queue.Queue()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._stop = threading.Event()
+        # Set whenever the queue gets work, so a paced sweep yields straight away
+        self._wake = threading.Event()
+        self._thread = None
+        self._last_scheduled = 0.0
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._queue.put(None)
+        self._wake.set()
+
+    def refresh_now(self, game, callback=None):
+        """Queue `game` for an immediate refresh; `callback(links, metadata)` runs on the refresher thread."""
+        with self._pending_lock:
+            if game["url"] in self._pending:
+                return False
+            self._pending.add(game["url"])
+        self._queue.put((game, callback))
+        self._wake.set()
+        return True
+
+    def in_window(self, now=None):
+        if not self.window:
+            return True
+        start, end = self.window
+        hour = (now or datetime.now()).hour
+        if start <= end:
+            return start <= hour < end
+        return hour >= start or hour < end
+
+    def refresh(self, game):
+        links, metadata = self.scraper.get_game_links(game["url"], game.get("size", "N/A"))
+        if links:
+            game["size"] = metadata.get("size", "N/A")
+            self.db.save(game, links, metadata)
+        return links, metadata
+
+    def _pace(self):
+        """Wait out the sweep's rate limit. False if an interactive refresh or stop() came in meanwhile."""
+        interval = 60.0 / max(self.rate_per_minute, 0.001)
+        while True:
+            if self._stop.is_set() or not self._queue.empty():
+                return False
+            wait = self._last_scheduled + interval - time.time()
+            if wait <= 0:
+                break
+            self._wake.wait(wait)
+            self._wake.clear()
+        self._last_scheduled = time.time()
+        return True
+
+    def sweep(self, limit=None, ignore_window=False):
+        """Re-scrape entries nearing expiry. Returns how many were refreshed."""
+        if not ignore_window and not self.in_window():
+            return 0
+        batch = max(1, int(self.rate_per_minute * self.check_interval / 60))
+        refreshed = 0
+        for game in self.db.expiring(self.lead_time, limit or batch):
+            if self._stop.is_set() or not self._queue.empty():
+                # Interactive refreshes take priority over the sweep
+                break
+            if not ignore_window and not self.in_window():
+                break
+            if not self._pace():
+                # Interactive refreshes take priority over the sweep
+                break
+            try:
+                if self.refresh(game)[0]:
+                    refreshed += 1
+            except Exception as e:
+                print(f"[WARNING] Background refresh of {game['url']} failed: {e}")
+        return refreshed
+
+    def _run(self):
+        next_sweep = time.time() + self.check_interval
+        while not self._stop.is_set():
+            timeout = max(0.0, next_sweep - time.time())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+            if item is None:
+                break
+            if item:
+                game, callback = item
+                try:
+                    links, metadata = self.refresh(game)
+                    if callback:
+                        callback(links, metadata)
+                except Exception as e:
+                    print(f"[WARNING] Refresh of {game['url']} failed: {e}")
+                finally:
+                    with self._pending_lock:
+                        self._pending.discard(game["url"])
+                continue
+            try:
+                self.sweep()
+            except Exception as e:
+                print(f"[WARNING] Cache sweep failed: {e}")
+            next_sweep = time.time() + self.check_interval
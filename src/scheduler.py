@@ -0,0 +1,261 @@
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+INTERACTIVE = "interactive"
+NORMAL = "normal"
+BACKGROUND = "background"
+LANES = (INTERACTIVE, NORMAL, BACKGROUND)
+
+DEFAULT_MAX_WORKERS = 6
+DEFAULT_HISTORY_SIZE = 200
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class Job:
+    """One unit of work. `token` is a threading.Event set when the job is cancelled."""
+
+    def __init__(self, job_id, fn, args, kwargs, name, lane, key):
+        self.id = job_id
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.name = name or getattr(fn, "__name__", "job")
+        self.lane = lane
+        self.key = key
+        self.token = threading.Event()
+        self.state = QUEUED
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished = None
+        self.callbacks = []
+
+    @property
+    def cancelled(self):
+        return self.token.is_set()
+
+    @property
+    def wait(self):
+        """Seconds spent queued (so far, while still queued)."""
+        return (self.started or time.time()) - self.submitted
+
+    @property
+    def runtime(self):
+        if self.started is None:
+            return None
+        return (self.finished or time.time()) - self.started
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "name": self.name,
+            "lane": self.lane,
+            "state": self.state,
+            "wait_ms": round(self.wait * 1000, 1),
+            "run_ms": round(self.runtime * 1000, 1) if self.runtime is not None else None,
+            "error": str(self.error) if self.error else None,
+        }
+
+
+class JobScheduler:
+    """Bounded worker pool with priority lanes, de-duplication and cancellation.
+
+    - Lanes run in priority order: interactive, normal, background. Background
+      jobs never occupy the last worker, so an interactive job always finds one.
+    - Submitting a `key` that is already queued or running returns that job and
+      adds the callbacks to it (promoting it to the higher lane if still queued).
+    - `dispatch(func)` delivers callbacks, e.g. onto the Tk loop; callbacks of
+      cancelled jobs are dropped, so late results never reach the UI.
+    """
+
+    def __init__(self, max_workers=None, dispatch=None, history_size=DEFAULT_HISTORY_SIZE):
+        sched_cfg = getattr(cfg, "scheduler", {}) if cfg else {}
+        self.max_workers = max(1, max_workers or sched_cfg.get("max_workers", DEFAULT_MAX_WORKERS))
+        self.dispatch = dispatch or (lambda func: func())
+        self._heap = []
+        self._seq = itertools.count()
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._by_key = {}
+        self._queued = {lane: 0 for lane in LANES}
+        self._running = {lane: 0 for lane in LANES}
+        self._active = {}
+        self._finished = deque(maxlen=history_size)
+        self._waits = {lane: deque(maxlen=history_size) for lane in LANES}
+        self._counts = {DONE: 0, FAILED: 0, CANCELLED: 0}
+        self._workers = []
+        self._stopped = False
+
+    def submit(self, fn, *args, name=None, lane=NORMAL, key=None, on_done=None, on_error=None,
+               cancellable=False, **kwargs):
+        """Queue fn(*args, **kwargs); with `cancellable` it also gets `cancel=<token>`.
+
+        `on_done(result)` / `on_error(exc)` are delivered through `dispatch`.
+        """
+        if lane not in LANES:
+            raise ValueError(f"Unknown lane: {lane}")
+        with self._cond:
+            if self._stopped:
+                raise RuntimeError("Scheduler is shut down")
+            job = self._by_key.get(key) if key is not None else None
+            if job is not None and not job.cancelled:
+                if job.state == QUEUED and LANES.index(lane) < LANES.index(job.lane):
+                    self._queued[job.lane] -= 1
+                    self._queued[lane] += 1
+                    job.lane = lane
+                    heapq.heappush(self._heap, (LANES.index(lane), next(self._seq), job))
+                job.callbacks.append((on_done, on_error))
+                return job
+
+            job = Job(next(self._ids), fn, args, kwargs, name, lane, key)
+            if cancellable:
+                job.kwargs = dict(kwargs, cancel=job.token)
+            job.callbacks.append((on_done, on_error))
+            if key is not None:
+                self._by_key[key] = job
+            self._active[job.id] = job
+            self._queued[lane] += 1
+            heapq.heappush(self._heap, (LANES.index(lane), next(self._seq), job))
+            if len(self._workers) < self.max_workers:
+                worker = threading.Thread(target=self._run, name=f"job-worker-{len(self._workers) + 1}", daemon=True)
+                self._workers.append(worker)
+                worker.start()
+            self._cond.notify()
+        return job
+
+    def cancel(self, job):
+        """Cancel a Job (or the in-flight job for a key). Running jobs see their token set."""
+        with self._cond:
+            if not isinstance(job, Job):
+                job = self._by_key.get(job)
+            if job is None or job.state not in (QUEUED, RUNNING):
+                return False
+            job.token.set()
+            if job.state == QUEUED:
+                self._queued[job.lane] -= 1
+                self._finish(job, CANCELLED)
+        return True
+
+    def cancel_lane(self, lane):
+        with self._cond:
+            jobs = [job for job in self._active.values() if job.lane == lane]
+        return sum(1 for job in jobs if self.cancel(job))
+
+    def _next_job(self):
+        # Called with the condition held; lazily drops heap entries that were cancelled or re-queued
+        skipped = []
+        job = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            candidate = entry[2]
+            if candidate.state != QUEUED or LANES.index(candidate.lane) != entry[0]:
+                continue
+            if candidate.lane == BACKGROUND and self.max_workers > 1 and \
+                    self._running[BACKGROUND] >= self.max_workers - 1:
+                skipped.append(entry)
+                continue
+            job = candidate
+            break
+        for entry in skipped:
+            heapq.heappush(self._heap, entry)
+        return job
+
+    def _run(self):
+        while True:
+            with self._cond:
+                job = self._next_job()
+                while job is None:
+                    if self._stopped:
+                        return
+                    self._cond.wait()
+                    job = self._next_job()
+                self._queued[job.lane] -= 1
+                self._running[job.lane] += 1
+                job.state = RUNNING
+                job.started = time.time()
+                self._waits[job.lane].append(job.wait)
+
+            try:
+                result, error = job.fn(*job.args, **job.kwargs), None
+            except Exception as e:
+                result, error = None, e
+
+            with self._cond:
+                self._running[job.lane] -= 1
+                job.result, job.error = result, error
+                if job.cancelled:
+                    state = CANCELLED
+                else:
+                    state = FAILED if error is not None else DONE
+                deliver = self._finish(job, state)
+                # A background slot may have opened up
+                self._cond.notify_all()
+            for callback in deliver:
+                self.dispatch(callback)
+
+    def _finish(self, job, state):
+        # Called with the condition held; returns the callbacks to dispatch once it is released
+        job.state = state
+        job.finished = time.time()
+        self._counts[state] += 1
+        self._active.pop(job.id, None)
+        if job.key is not None and self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+        self._finished.append(job)
+        deliver = []
+        if state == CANCELLED:
+            return deliver
+        if state == FAILED and not any(on_error for _, on_error in job.callbacks):
+            print(f"Error in job {job.name}: {job.error}")
+        for on_done, on_error in job.callbacks:
+            if state == DONE and on_done:
+                deliver.append(lambda cb=on_done: None if job.cancelled else cb(job.result))
+            elif state == FAILED and on_error:
+                deliver.append(lambda cb=on_error: None if job.cancelled else cb(job.error))
+        return deliver
+
+    def stats(self):
+        with self._cond:
+            waits = {lane: list(values) for lane, values in self._waits.items()}
+            stats = {
+                "workers": len(self._workers),
+                "max_workers": self.max_workers,
+                "queued": dict(self._queued),
+                "running": dict(self._running),
+            }
+            stats.update(self._counts)
+        stats["avg_wait_ms"] = {
+            lane: round(sum(values) / len(values) * 1000, 1) if values else 0.0
+            for lane, values in waits.items()
+        }
+        stats["max_wait_ms"] = {lane: round(max(values) * 1000, 1) if values else 0.0 for lane, values in waits.items()}
+        return stats
+
+    def jobs(self):
+        """Queued and running jobs first, then the most recently finished ones."""
+        with self._cond:
+            active = sorted(self._active.values(), key=lambda job: (job.state != RUNNING, LANES.index(job.lane), job.id))
+            finished = list(reversed(self._finished))
+        return active + finished
+
+    def shutdown(self, cancel_pending=True):
+        with self._cond:
+            self._stopped = True
+            jobs = list(self._active.values()) if cancel_pending else []
+            self._cond.notify_all()
+        for job in jobs:
+            self.cancel(job)
@@ -1,7 +1,13 @@
 import re
+import threading
 import urllib.parse
-import cloudscraper
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from bs4 import BeautifulSoup, SoupStrainer
+
+from src.http_cache import ConditionalSession, HTTPCache
+from src.links import LinkClassifier
+from src.metrics import metrics
+from src.models import GameResult, intern_links, intern_metadata
 
 
 try:
@@ -16,184 +22,309 @@ DEFAULT_IGNORE_DOMAINS = [
     "wp.com", "google.com"
 ]
 DEFAULT_TIMEOUT = 15
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_PER_HOST_LIMIT = 4
+DEFAULT_SEARCH_MAX_PAGES = 10
+
+# lxml is several times faster than the stdlib parser; use it when available.
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+# Only these parts of a page are ever read, so skip building the rest of the tree.
+DETAIL_PAGE_TAGS = SoupStrainer(["table", "a"])
+SEARCH_PAGE_TAGS = SoupStrainer("article")
+
+THANKS_RE = re.compile(r'(?i)thanks?.*')
+ZERO_WIDTH_RE = re.compile(r'[\u200b-\u200d\uFEFF]')
+PUNCTUATION_RE = re.compile(r'[^\w\s]')
+TITLE_ID_RE = re.compile(r'((?:CUSA|PPSA)\d{5})', re.IGNORECASE)
+FIRMWARE_RE = re.compile(r'\d+\.(?:xx|\d+)')
+DOWNLOAD_PAGE_RE = re.compile(r"dll-")
+
+
+def make_soup(content, parser=None, parse_only=None):
+    return BeautifulSoup(content, parser or HTML_PARSER, parse_only=parse_only)
 
 class PSScraper:
     def __init__(self):
-        self.scraper = cloudscraper.create_scraper(
-            browser={
-                "browser": "chrome",
-                "platform": "windows",
-                "mobile": False
-            }
-        )
+        self._session = None
+        self._session_lock = threading.Lock()
         scraper_cfg = getattr(cfg, "scraper", {}) if cfg else {}
         self.base_url = scraper_cfg.get("base_url", DEFAULT_BASE_URL)
         self.ignore_domains = scraper_cfg.get("ignore_domains", DEFAULT_IGNORE_DOMAINS)
+        self.hosters = scraper_cfg.get("hosters", {})
+        self._classifier = None
+        self._classifier_key = None
         self.timeout = scraper_cfg.get("timeout", DEFAULT_TIMEOUT)
+        self.max_workers = scraper_cfg.get("max_workers", DEFAULT_MAX_WORKERS)
+        self.per_host_limit = scraper_cfg.get("per_host_limit", DEFAULT_PER_HOST_LIMIT)
+        self.search_max_pages = scraper_cfg.get("search_max_pages", DEFAULT_SEARCH_MAX_PAGES)
+        self._host_slots = {}
+        self._host_slots_lock = threading.Lock()
+        self.http_cache = HTTPCache() if scraper_cfg.get("http_cache", True) else None
+        self._conditional = None
+
+    @property
+    def scraper(self):
+        # The cloudscraper session is built on first request, not at construction
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    import cloudscraper
+                    self._session = cloudscraper.create_scraper(
+                        browser={
+                            "browser": "chrome",
+                            "platform": "windows",
+                            "mobile": False
+                        }
+                    )
+        return self._session
 
-    def search_games(self, query):
+    @property
+    def classifier(self):
+        # Rebuilt if ignore_domains is reassigned after construction
+        key = (tuple(self.ignore_domains), tuple(self.hosters.items()))
+        if self._classifier is None or self._classifier_key != key:
+            self._classifier = LinkClassifier(self.ignore_domains, self.hosters)
+            self._classifier_key = key
+        return self._classifier
+
+    def _host_slot(self, url):
+        host = urllib.parse.urlparse(url).netloc.lower()
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(max(1, self.per_host_limit))
+                self._host_slots[host] = slot
+        return slot
+
+    def _fetch(self, url, kind="page"):
+        with self._host_slot(url), metrics.timer("http_fetch_seconds", kind=kind):
+            if self.http_cache is not None:
+                if self._conditional is None:
+                    self._conditional = ConditionalSession(self.scraper, self.http_cache)
+                response = self._conditional.get(url, timeout=self.timeout)
+            else:
+                response = self.scraper.get(url, timeout=self.timeout)
+        metrics.inc("http_responses_total", kind=kind,
+                    status="304" if self._not_modified(response) else str(getattr(response, "status_code", "")))
+        return response
+
+    def _not_modified(self, response):
+        return getattr(response, "not_modified", False)
+
+    def _remember(self, url, parsed):
+        if self.http_cache is not None:
+            self.http_cache.set_parsed(url, parsed)
+
+    def catalogue_url(self, page=1):
+        if page <= 1:
+            return self.base_url
+        return f"{self.base_url.rstrip('/')}/page/{page}/"
+
+    def search_url(self, query, page=1):
         params = {"s": query}
-        url = f"{self.base_url}?{urllib.parse.urlencode(params)}"
+        return f"{self.catalogue_url(page)}?{urllib.parse.urlencode(params)}"
+
+    def search_games(self, query, page=1):
+        with metrics.timer("scraper_search_seconds"):
+            return self._fetch_results(self.search_url(query, page))
+
+    def iter_search_games(self, query, max_pages=None, cancel=None):
+        """Yield each page of search results as soon as it is parsed.
+
+        Follows the paginated results until a page comes back empty (or only
+        repeats earlier games), `max_pages` is reached (0 means no limit) or
+        `cancel`, a threading.Event, is set.
+        """
+        limit = self.search_max_pages if max_pages is None else max_pages
+        seen = set()
+        page = 1
+        while not limit or page <= limit:
+            if cancel is not None and cancel.is_set():
+                return
+            games = [game for game in self.search_games(query, page) if game["url"] not in seen]
+            if not games or (cancel is not None and cancel.is_set()):
+                return
+            seen.update(game["url"] for game in games)
+            yield games
+            page += 1
 
+    def list_games(self, page=1, strict=False):
+        """One page of the site's newest-first catalogue listing.
+
+        With `strict`, a failed fetch raises instead of returning [], so an
+        empty list always means a page that loaded and listed nothing.
+        """
+        return self._fetch_results(self.catalogue_url(page), strict)
+
+    def _fetch_results(self, url, strict=False):
         try:
-            response = self.scraper.get(url, timeout=self.timeout)
+            response = self._fetch(url, kind="search")
             response.raise_for_status()
-            soup = BeautifulSoup(response.content, "html.parser")
-            
-            results = []
-            items = soup.select("article.item")
-
-            for item in items:
-                title_node = item.select_one(".penci-entry-title a")
-                if not title_node: continue
-
-                img_node = item.select_one(".thumbnail")
-                image = img_node.get("data-bgset") if img_node else None
-
-                results.append({
-                    "title": title_node.get_text(strip=True),
-                    "url": title_node["href"],
-                    "image": image,
-                    "downloads": "N/A",
-                    "size": "N/A",
-                })
-
+            if self._not_modified(response):
+                parsed = self.http_cache.get_parsed(url)
+                if parsed is not None:
+                    metrics.inc("scraper_parse_skipped_total", phase="search")
+                    return [GameResult.from_dict(game) for game in parsed]
+            with metrics.timer("parse_seconds", phase="search"):
+                results = self.parse_search_results(response.content)
+            self._remember(url, [game.to_dict() for game in results])
             return results
-        except Exception:
+        except Exception as e:
+            # Callers treat an empty page as the end of the results; the failure is still counted
+            metrics.inc("scraper_errors_total", op="search", error=type(e).__name__)
+            if strict:
+                raise
             return []
 
+    def parse_search_results(self, content):
+        soup = make_soup(content, parse_only=SEARCH_PAGE_TAGS)
+
+        results = []
+        items = soup.select("article.item")
+
+        for item in items:
+            title_node = item.select_one(".penci-entry-title a")
+            if not title_node: continue
+
+            img_node = item.select_one(".thumbnail")
+            image = img_node.get("data-bgset") if img_node else None
+
+            results.append(GameResult(title_node.get_text(strip=True), title_node["href"], image))
+
+        return results
+
     def _extract_links(self, soup):
         links = []
         try:
-            potential_links = soup.find_all("a", href=True)
-            for link in potential_links:
+            accepts = self.classifier.accepts
+            for link in soup.find_all("a", href=True):
                 href = link["href"]
-                if not any(domain in href.lower() for domain in self.ignore_domains):
-                    if href.startswith("http") and len(href) > 15:
-                        links.append(href)
+                if accepts(href):
+                    links.append(href)
         except Exception:
             pass
         return list(set(links))
 
     def _extract_grouped_links(self, soup):
+        grouped_links = self._scan_tables(soup)
+        if not grouped_links:
+            return self._raw_link_groups(soup)
+        return grouped_links
+
+    def _raw_link_groups(self, soup):
+        raw = self._extract_links(soup)
+        return [{"group": "All Links", "label": "Link", "url": u} for u in raw]
+
+    def _parse_metadata(self, soup, metadata):
+        self._scan_tables(soup, metadata)
+        return metadata
+
+    def _clean_version(self, val):
+        return ZERO_WIDTH_RE.sub('', THANKS_RE.sub('', val).strip())
+
+    def _scan_tables(self, soup, metadata=None):
+        """Walk every table once, filling `metadata` (if given) and returning the grouped links."""
         grouped_links = []
-        tables = soup.find_all("table")
-        found_structured_links = False
         seen_urls = set()
+        accepts = self.classifier.accepts
 
-        for table in tables:
-            block_name = "General / Misc"
-            
-            rows = table.find_all("tr")
-            if not rows: continue
+        for table in soup.find_all("table"):
+            rows = []
+            block_name = None
 
-            for row in rows:
+            for row in table.find_all("tr"):
                 cols = row.find_all("td")
+                if not cols: continue
+
+                label = cols[0].get_text(strip=True)
                 if len(cols) >= 2:
-                    header_text = cols[0].get_text(strip=True).lower()
-                    if "version" in header_text:
-                        val = cols[1].get_text(strip=True, separator=" ")
-                        clean_ver = re.sub(r'(?i)thanks?.*', '', val).strip()
-                        clean_ver = re.sub(r'[\u200b-\u200d\uFEFF]', '', clean_ver)
-                        if len(clean_ver) > 3:
-                            block_name = clean_ver
-                        break
-            
-            for row in rows:
-                cols = row.find_all("td")
-                if len(cols) >= 1:
+                    val = cols[1].get_text(strip=True, separator=" ")
+                    if block_name is None and "version" in label.lower():
+                        clean_ver = self._clean_version(val)
+                        block_name = clean_ver if len(clean_ver) > 3 else "General / Misc"
+                    if metadata is not None:
+                        self._parse_metadata_row(cols[0], val, metadata)
+                rows.append((label, cols))
+
+            block_name = block_name or "General / Misc"
+
+            for label, cols in rows:
+                if len(cols) >= 2:
+                    row_label = label.replace("⇛", "").strip()
+                    content_col = cols[1]
+                else:
                     row_label = "Link"
-                    content_col = None
-                    
-                    if len(cols) >= 2:
-                        row_label = cols[0].get_text(strip=True).replace("⇛", "").strip()
-                        content_col = cols[1]
-                    else:
-                        content_col = cols[0]
-                    
-                    if not content_col: continue
-
-                    links = content_col.find_all("a", href=True)
-                    for link in links:
-                        href = link["href"]
-                        if not any(domain in href.lower() for domain in self.ignore_domains):
-                            if href.startswith("http") and len(href) > 15:
-                                if href not in seen_urls:
-                                    grouped_links.append({
-                                        "group": block_name,
-                                        "label": row_label if row_label else "Download",
-                                        "url": href
-                                    })
-                                    seen_urls.add(href)
-                                    found_structured_links = True
-        
-        if not found_structured_links:
-            raw = self._extract_links(soup)
-            return [{"group": "All Links", "label": "Link", "url": u} for u in raw]
-        
+                    content_col = cols[0]
+
+                for link in content_col.find_all("a", href=True):
+                    href = link["href"]
+                    if href not in seen_urls and accepts(href):
+                        grouped_links.append({
+                            "group": block_name,
+                            "label": row_label if row_label else "Download",
+                            "url": href
+                        })
+                        seen_urls.add(href)
+
         return grouped_links
 
-    def _parse_metadata(self, soup, metadata):
-        tables = soup.find_all("table")
-        for table in tables:
-            rows = table.find_all("tr")
-            for row in rows:
-                cols = row.find_all("td")
-                if len(cols) >= 2:
-                    key_raw = cols[0].get_text(strip=True, separator=" ").lower()
-                    key = re.sub(r'[^\w\s]', '', key_raw).strip()
-                    val = cols[1].get_text(strip=True, separator=" ")
-                    
-                    if "size" in key or "tamanho" in key:
-                        metadata["size"] = val
-                    elif "password" in key or "senha" in key:
-                        metadata["password"] = val
-                    elif "version" in key or "versão" in key:
-                        if val.lower() != "n/a":
-                            clean_ver = re.sub(r'(?i)thanks?.*', '', val).strip()
-                            clean_ver = re.sub(r'[\u200b-\u200d\uFEFF]', '', clean_ver)
-                            
-                            curr_ver = metadata.get("version", "N/A")
-                            if curr_ver == "N/A":
-                                metadata["version"] = clean_ver
-                            elif clean_ver not in curr_ver:
-                                metadata["version"] = f"{curr_ver} | {clean_ver}"
-                        
-                        ids = re.findall(r'((?:CUSA|PPSA)\d{5})', val, re.IGNORECASE)
-                        for mid in ids:
-                            mid = mid.upper()
-                            curr_cusa = metadata.get("cusa", "N/A")
-                            if curr_cusa == "N/A":
-                                metadata["cusa"] = mid
-                            elif mid not in curr_cusa:
-                                metadata["cusa"] = f"{curr_cusa}, {mid}"
-                        
-                        found_region = None
-                        if "USA" in val: found_region = "USA"
-                        elif "EUR" in val: found_region = "EUR"
-                        elif "JPN" in val: found_region = "JPN"
-                        elif "ASIA" in val: found_region = "ASIA"
-                        
-                        if found_region:
-                            curr_reg = metadata.get("region", "N/A")
-                            if curr_reg == "N/A":
-                                metadata["region"] = found_region
-                            elif found_region not in curr_reg:
-                                metadata["region"] = f"{curr_reg}, {found_region}"
-
-                    elif "voice" in key:
-                        if metadata["voice"] == "N/A":
-                            metadata["voice"] = val
-                    elif "subtitles" in key or "screen languages" in key:
-                        if metadata["subtitles"] == "N/A":
-                            metadata["subtitles"] = val
-                    elif "firmware" in key or "working" in key or "note" in key:
-                        if "working" in val.lower() or re.search(r'\d+\.xx', val) or re.search(r'\d+\.\d+', val):
-                            metadata["firmware"] = val
-        return metadata
+    def _parse_metadata_row(self, key_col, val, metadata):
+        key_raw = key_col.get_text(strip=True, separator=" ").lower()
+        key = PUNCTUATION_RE.sub('', key_raw).strip()
 
-    def get_game_links(self, game_url, current_size="N/A"):
-        metadata = {
+        if "size" in key or "tamanho" in key:
+            metadata["size"] = val
+        elif "password" in key or "senha" in key:
+            metadata["password"] = val
+        elif "version" in key or "versão" in key:
+            if val.lower() != "n/a":
+                clean_ver = self._clean_version(val)
+
+                curr_ver = metadata.get("version", "N/A")
+                if curr_ver == "N/A":
+                    metadata["version"] = clean_ver
+                elif clean_ver not in curr_ver:
+                    metadata["version"] = f"{curr_ver} | {clean_ver}"
+
+            ids = TITLE_ID_RE.findall(val)
+            for mid in ids:
+                mid = mid.upper()
+                curr_cusa = metadata.get("cusa", "N/A")
+                if curr_cusa == "N/A":
+                    metadata["cusa"] = mid
+                elif mid not in curr_cusa:
+                    metadata["cusa"] = f"{curr_cusa}, {mid}"
+
+            found_region = None
+            if "USA" in val: found_region = "USA"
+            elif "EUR" in val: found_region = "EUR"
+            elif "JPN" in val: found_region = "JPN"
+            elif "ASIA" in val: found_region = "ASIA"
+
+            if found_region:
+                curr_reg = metadata.get("region", "N/A")
+                if curr_reg == "N/A":
+                    metadata["region"] = found_region
+                elif found_region not in curr_reg:
+                    metadata["region"] = f"{curr_reg}, {found_region}"
+
+        elif "voice" in key:
+            if metadata["voice"] == "N/A":
+                metadata["voice"] = val
+        elif "subtitles" in key or "screen languages" in key:
+            if metadata["subtitles"] == "N/A":
+                metadata["subtitles"] = val
+        elif "firmware" in key or "working" in key or "note" in key:
+            if "working" in val.lower() or FIRMWARE_RE.search(val):
+                metadata["firmware"] = val
+
+    def new_metadata(self, current_size="N/A"):
+        return {
             "size": current_size,
             "version": "N/A",
             "region": "N/A",
@@ -204,30 +335,93 @@ class PSScraper:
             "cusa": "N/A"
         }
 
+    def parse_game_page(self, content, metadata):
+        """Parse a game page into `metadata`.
+
+        Returns (soup, table links, download page URL or None). The table links are
+        only used when the download page yields nothing.
+        """
+        soup = make_soup(content, parse_only=DETAIL_PAGE_TAGS)
+        grouped_links = self._scan_tables(soup, metadata)
+
+        dl_node = soup.find("a", href=DOWNLOAD_PAGE_RE) or \
+                  soup.select_one("a:has(img[alt*='Download'])")
+        return soup, grouped_links, (dl_node.get("href") if dl_node else None)
+
+    def parse_download_page(self, content, metadata):
+        dl_soup = make_soup(content, parse_only=DETAIL_PAGE_TAGS)
+        return self._scan_tables(dl_soup, metadata) or self._raw_link_groups(dl_soup)
+
+    def get_game_links(self, game_url, current_size="N/A"):
+        with metrics.timer("scraper_game_links_seconds"):
+            links, metadata = self._get_game_links(game_url, current_size)
+        # Repeated strings ("N/A", regions, groups, labels) share one object across games
+        return intern_links(links), intern_metadata(metadata)
+
+    def _get_game_links(self, game_url, current_size):
+        metadata = self.new_metadata(current_size)
+
         try:
-            resp = self.scraper.get(game_url, timeout=self.timeout)
-            soup = BeautifulSoup(resp.content, "html.parser")
-            
-            self._parse_metadata(soup, metadata)
+            resp = self._fetch(game_url, kind="game")
+
+            # Both pages unchanged since the last scrape: reuse its result without parsing
+            memo = self.http_cache.get_parsed(game_url) if self._not_modified(resp) else None
+            dl_resp = None
+            if memo:
+                if memo.get("dl_url"):
+                    dl_resp = self._fetch(memo["dl_url"], kind="download")
+                if dl_resp is None or self._not_modified(dl_resp):
+                    metrics.inc("scraper_parse_skipped_total", phase="game")
+                    return memo["links"], memo["metadata"]
 
-            dl_node = soup.find("a", href=re.compile(r"dll-")) or \
-                      soup.select_one("a:has(img[alt*='Download'])")
+            with metrics.timer("parse_seconds", phase="game_page"):
+                soup, page_links, dl_url = self.parse_game_page(resp.content, metadata)
 
-            if dl_node:
+            final_links = None
+            if dl_url:
                 try:
-                    dl_url = dl_node["href"]
-                    dl_resp = self.scraper.get(dl_url, timeout=self.timeout)
-                    dl_soup = BeautifulSoup(dl_resp.content, "html.parser")
-                    
-                    self._parse_metadata(dl_soup, metadata)
-                    final_links = self._extract_grouped_links(dl_soup)
-                    
-                    if final_links:
-                        return final_links, metadata
-                except Exception:
-                    pass
+                    if dl_resp is None or memo.get("dl_url") != dl_url:
+                        dl_resp = self._fetch(dl_url, kind="download")
+                    with metrics.timer("parse_seconds", phase="download_page"):
+                        final_links = self.parse_download_page(dl_resp.content, metadata)
+                except Exception as e:
+                    metrics.inc("scraper_errors_total", op="download_page", error=type(e).__name__)
 
-            final_links = self._extract_grouped_links(soup)
+            if not final_links:
+                final_links = page_links or self._raw_link_groups(soup)
+            self._remember(game_url, {"dl_url": dl_url, "links": final_links, "metadata": metadata})
             return final_links, metadata
-        except Exception:
-            return [], metadata
\ No newline at end of file
+        except Exception as e:
+            metrics.inc("scraper_errors_total", op="game", error=type(e).__name__)
+            return [], metadata
+
+    def get_many_game_links(self, games, max_workers=None, callback=None):
+        """Scrape several game pages in parallel.
+
+        `games` may hold URLs or search result dicts. `callback(game, links, metadata)`
+        runs in the calling thread as each game finishes. Returns {url: (links, metadata)}.
+        """
+        items = [{"url": g, "size": "N/A"} if isinstance(g, str) else g for g in games]
+        results = {}
+        if not items:
+            return results
+
+        workers = max(1, min(max_workers or self.max_workers, len(items)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(self.get_game_links, game["url"], game.get("size", "N/A")): game
+                for game in items
+            }
+            for future in as_completed(futures):
+                game = futures[future]
+                try:
+                    links, metadata = future.result()
+                except Exception:
+                    continue
+                results[game["url"]] = (links, metadata)
+                if callback:
+                    try:
+                        callback(game, links, metadata)
+                    except Exception:
+                        pass
+        return results
@@ -0,0 +1,136 @@
+import json
+import sqlite3
+import threading
+import time
+
+try:
+    from src.config import cfg
+except Exception:
+    cfg = None
+
+DEFAULT_UNRESTRICT_CACHE_FILE = "unrestrict_cache.db"
+# Real-Debrid does not return an expiry with unrestricted links; keep them well inside their lifetime
+DEFAULT_UNRESTRICT_TTL = 6 * 3600
+DEFAULT_UNRESTRICT_MAX_ENTRIES = 5000
+
+
+class UnrestrictCache:
+    """Generated download links keyed by the original hoster URL.
+
+    Stored in SQLite (WAL) so the GUI and headless runs share it. Entries expire
+    `ttl` seconds after they were generated, and the least recently used ones are
+    evicted once there are more than `max_entries`.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS unrestricted (
+            link TEXT PRIMARY KEY,
+            download TEXT NOT NULL,
+            result TEXT,
+            created_at REAL NOT NULL,
+            expires_at REAL NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_unrestricted_expires ON unrestricted (expires_at);
+        CREATE INDEX IF NOT EXISTS idx_unrestricted_last_used ON unrestricted (last_used);
+    """
+
+    def __init__(self, path=None, ttl=None, max_entries=None):
+        apis_cfg = getattr(cfg, "apis", {}) if cfg else {}
+        self.path = path or apis_cfg.get("unrestrict_cache_file", DEFAULT_UNRESTRICT_CACHE_FILE)
+        self.ttl = ttl or apis_cfg.get("unrestrict_cache_ttl", DEFAULT_UNRESTRICT_TTL)
+        self.max_entries = max_entries or apis_cfg.get("unrestrict_cache_max_entries", DEFAULT_UNRESTRICT_MAX_ENTRIES)
+        self._conn = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _connect(self):
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self.SCHEMA)
+        return self._conn
+
+    def get(self, link):
+        """Return the stored unrestrict result for `link`, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT download, result, expires_at FROM unrestricted WHERE link = ?", (link,)).fetchone()
+            if row is None or row[2] <= now:
+                self.misses += 1
+                if row is not None:
+                    with conn:
+                        conn.execute("DELETE FROM unrestricted WHERE link = ?", (link,))
+                return None
+            with conn:
+                conn.execute("UPDATE unrestricted SET last_used = ? WHERE link = ?", (now, link))
+            self.hits += 1
+        try:
+            result = json.loads(row[1]) if row[1] else {}
+        except ValueError:
+            result = {}
+        result["download"] = row[0]
+        return result
+
+    def put(self, link, result, created_at=None):
+        download = result.get("download")
+        if not download:
+            return
+        created_at = created_at or time.time()
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT INTO unrestricted (link, download, result, created_at, expires_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(link) DO UPDATE SET download = excluded.download, result = excluded.result, "
+                    "created_at = excluded.created_at, expires_at = excluded.expires_at, last_used = excluded.last_used",
+                    (link, download, json.dumps(result), created_at, created_at + self.ttl, time.time()))
+                self._evict(conn)
+
+    def seed(self, history):
+        """Load still-valid links from download history entries; returns how many were added."""
+        cutoff = time.time() - self.ttl
+        added = 0
+        for entry in history:
+            link = entry.get("original_link")
+            download = entry.get("download_link")
+            created_at = entry.get("timestamp") or 0
+            if not link or not download or created_at <= cutoff:
+                continue
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    cur = conn.execute(
+                        "INSERT INTO unrestricted (link, download, result, created_at, expires_at, last_used) "
+                        "VALUES (?, ?, NULL, ?, ?, ?) "
+                        "ON CONFLICT(link) DO UPDATE SET download = excluded.download, "
+                        "created_at = excluded.created_at, expires_at = excluded.expires_at "
+                        "WHERE excluded.created_at > unrestricted.created_at",
+                        (link, download, created_at, created_at + self.ttl, created_at))
+                    added += cur.rowcount
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                self._evict(conn)
+        return added
+
+    def _evict(self, conn):
+        conn.execute("DELETE FROM unrestricted WHERE expires_at <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM unrestricted WHERE link IN ("
+            "SELECT link FROM unrestricted ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,))
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,182 @@
+import time
+import tkinter as tk
+import tkinter.font as tkfont
+from tkinter import ttk
+
+# Longest stretch a batched job may hold the Tk event loop
+BATCH_BUDGET_MS = 8
+
+
+def run_in_batches(widget, items, func, on_done=None, budget_ms=BATCH_BUDGET_MS):
+    """Call func(item) for every item across after() ticks, yielding to Tk every `budget_ms`.
+
+    Returns a callable that cancels the remaining work.
+    """
+    iterator = iter(items)
+    state = {"after_id": None, "cancelled": False}
+
+    def step():
+        state["after_id"] = None
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        for item in iterator:
+            func(item)
+            if time.perf_counter() >= deadline:
+                if not state["cancelled"]:
+                    state["after_id"] = widget.after(1, step)
+                return
+        if on_done and not state["cancelled"]:
+            on_done()
+
+    def cancel():
+        state["cancelled"] = True
+        if state["after_id"] is not None:
+            widget.after_cancel(state["after_id"])
+            state["after_id"] = None
+
+    step()
+    return cancel
+
+
+class VirtualListbox(ttk.Frame):
+    """A Listbox look-alike that only materializes the rows currently in view.
+
+    Items are any objects; `formatter(index, item)` turns the visible ones into
+    text when they scroll into view, so setting 100k items costs the same as
+    setting 30. Indices in curselection()/selection_set() refer to items.
+    """
+
+    def __init__(self, parent, formatter=None, on_select=None, **listbox_options):
+        super().__init__(parent)
+        self.formatter = formatter or (lambda index, item: str(item))
+        self.on_select = on_select
+        self.items = []
+        self.top = 0
+        self.selected = None
+        listbox_options.setdefault("selectmode", tk.SINGLE)
+        listbox_options.setdefault("exportselection", False)
+        self.listbox = tk.Listbox(self, **listbox_options)
+        self.scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        self.listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.listbox.bind("<<ListboxSelect>>", self._on_listbox_select)
+        self.listbox.bind("<Configure>", lambda e: self.render())
+        self.listbox.bind("<MouseWheel>", self._on_wheel)
+        self.listbox.bind("<Button-4>", lambda e: self.scroll(-3))
+        self.listbox.bind("<Button-5>", lambda e: self.scroll(3))
+        self.listbox.bind("<Up>", lambda e: self._move_selection(-1))
+        self.listbox.bind("<Down>", lambda e: self._move_selection(1))
+        self.listbox.bind("<Prior>", lambda e: self._move_selection(-self.visible_rows()))
+        self.listbox.bind("<Next>", lambda e: self._move_selection(self.visible_rows()))
+
+    # Data
+
+    def set_items(self, items):
+        self.items = list(items)
+        self.top = 0
+        self.selected = None
+        self.render()
+
+    def append_items(self, items):
+        self.items.extend(items)
+        self.render()
+
+    def clear(self):
+        self.set_items([])
+
+    def size(self):
+        return len(self.items)
+
+    # Listbox-compatible selection API
+
+    def curselection(self):
+        return (self.selected,) if self.selected is not None else ()
+
+    def selection_set(self, index):
+        if 0 <= index < len(self.items):
+            self.selected = index
+            self.see(index)
+            self.render()
+
+    def selection_clear(self):
+        self.selected = None
+        self.render()
+
+    def see(self, index):
+        rows = self.visible_rows()
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + rows:
+            self.top = index - rows + 1
+        self.render()
+
+    # Rendering
+
+    def visible_rows(self):
+        height = self.listbox.winfo_height()
+        row_height = self._row_height()
+        if height <= 1 or not row_height:
+            return int(self.listbox.cget("height") or 10)
+        return max(1, height // row_height)
+
+    def _row_height(self):
+        if not hasattr(self, "_cached_row_height"):
+            font = self.listbox.cget("font")
+            try:
+                self._cached_row_height = tkfont.Font(root=self, font=font).metrics("linespace") + 1
+            except Exception:
+                self._cached_row_height = 18
+        return self._cached_row_height
+
+    def render(self):
+        rows = self.visible_rows()
+        self.top = max(0, min(self.top, len(self.items) - rows))
+        end = min(len(self.items), self.top + rows)
+        self.listbox.delete(0, tk.END)
+        if end > self.top:
+            self.listbox.insert(tk.END, *[self.formatter(i, self.items[i]) for i in range(self.top, end)])
+        if self.selected is not None and self.top <= self.selected < end:
+            self.listbox.selection_set(self.selected - self.top)
+        if self.items:
+            self.scrollbar.set(self.top / len(self.items), end / len(self.items))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def scroll(self, delta):
+        self.top += delta
+        self.render()
+        return "break"
+
+    def _on_wheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def _on_scrollbar(self, *args):
+        rows = self.visible_rows()
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.items))
+        elif args[0] == "scroll":
+            amount = int(args[1])
+            self.top += amount * rows if args[2] == "pages" else amount
+        self.render()
+
+    def _move_selection(self, delta):
+        if not self.items:
+            return "break"
+        index = 0 if self.selected is None else max(0, min(len(self.items) - 1, self.selected + delta))
+        self.selection_set(index)
+        self._fire_select()
+        return "break"
+
+    def _on_listbox_select(self, event):
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        index = self.top + selection[0]
+        if index < len(self.items) and index != self.selected:
+            self.selected = index
+            self._fire_select()
+
+    def _fire_select(self):
+        if self.on_select:
+            self.on_select(self.selected)
+        self.event_generate("<<ListboxSelect>>")